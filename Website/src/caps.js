@@ -9,6 +9,7 @@
     // État du module
     let allSongs = [];
     let allAlbums = [];
+    let capsItems = null; // Vue précalculée data/caps.json (null = repli sur songs/albums)
     let spotifyDataDate = null;
     let currentWindow = 30; // Fenêtre par défaut : 30 jours
     let showSongs = true;
@@ -33,10 +34,20 @@
     }
 
     /**
-     * Charge toutes les données nécessaires (songs, albums, meta)
+     * Charge la vue précalculée data/caps.json (un seul petit fichier, via DataLoader),
+     * sinon songs, albums et meta (vue pas encore publiée)
      */
     async function loadAllData() {
         try {
+            const caps = await window.dataLoader.loadCapsView().catch(() => null);
+            if (caps) {
+                capsItems = caps.items;
+                spotifyDataDate = caps.spotify_data_date;
+                renderCapsTable();
+                return;
+            }
+
+            capsItems = null;
             const [songsResponse, albumsResponse, metaResponse] = await Promise.all([
                 fetch('/data/songs.json?t=' + Date.now()),
                 fetch('/data/albums.json?t=' + Date.now()),
@@ -132,6 +143,14 @@
      * Filtre les données selon la fenêtre et les toggles
      */
     function filterData() {
+        // Vue précalculée : items déjà typés, triés par ETA et limités à la plus grande fenêtre
+        if (capsItems) {
+            return capsItems.filter(item =>
+                item.days_to_next_cap <= currentWindow &&
+                (item.type === 'song' ? showSongs : showAlbums)
+            );
+        }
+
         const filteredData = [];
 
         // Filtrer les songs
@@ -188,8 +207,8 @@
                 bVal = (typeof bVal === 'string' && bVal === 'N.D.') ? -Infinity : parseFloat(bVal);
             } else if (currentSortKey === 'eta') {
                 // Calculer ETA pour tri
-                aVal = calculateETA(a.days_to_next_cap).getTime();
-                bVal = calculateETA(b.days_to_next_cap).getTime();
+                aVal = calculateETA(a.days_to_next_cap, a.eta).getTime();
+                bVal = calculateETA(b.days_to_next_cap, b.eta).getTime();
             }
 
             // Comparaison
@@ -202,9 +221,15 @@
     /**
      * Calcule la date ETA
      * @param {number} days - Nombre de jours (avec décimales)
+     * @param {string} [eta] - Date ETA précalculée (YYYY-MM-DD, data/caps.json)
      * @returns {Date} - Date ETA
      */
-    function calculateETA(days) {
+    function calculateETA(days, eta) {
+        if (eta) {
+            const [year, month, day] = eta.split('-').map(Number);
+            return new Date(year, month - 1, day);
+        }
+
         if (!spotifyDataDate || typeof days !== 'number') {
             return new Date();
         }
@@ -281,7 +306,7 @@
         row.style.cursor = 'pointer';
 
         // Calculer ETA
-        const etaDate = calculateETA(item.days_to_next_cap);
+        const etaDate = calculateETA(item.days_to_next_cap, item.eta);
         const etaFormatted = formatETA(etaDate);
 
         // Rang (#) - avec couleur selon type
@@ -20,6 +20,13 @@ class DataLoader {
             albums: false,
             meta: false
         };
+        // Bundle songs + albums + meta (/api/bundle, dashboard_server.py)
+        // Indisponible en hébergement statique : repli sur les fichiers data/*.json
+        this.bundlePromise = null;
+        this.bundleUnavailable = false;
+        // Pointeur data/current.json (publish.py) : versions immuables des fichiers
+        this.pointerPromise = null;
+        this.pointerUnavailable = false;
         this.CACHE_DURATION = 5000; // 5 secondes
         this.MAX_RETRIES = 3;
         this.RETRY_DELAY = 1000; // 1 seconde
@@ -42,7 +49,7 @@ class DataLoader {
         this.isLoading.songs = true;
 
         try {
-            const data = await this._fetchWithRetry('/data/songs.json');
+            const data = await this._loadFromBundle('songs') ?? await this._fetchWithRetry(await this.resolveDataUrl('songs'));
             this.cache.songs = data;
             this.cache.lastFetch.songs = Date.now();
             this._emitDataLoaded('songs', data);
@@ -61,6 +68,41 @@ class DataLoader {
         }
     }
 
+    /**
+     * Charge l'index de recherche précalculé (data/search_index.json)
+     * Pas de cache ici : StickySearch le conserve jusqu'à la prochaine synchro
+     */
+    async loadSearchIndex() {
+        return this._fetchWithRetry(await this.resolveDataUrl('search_index'));
+    }
+
+    /**
+     * Charge le manifeste d'images (data/images.json : id → variantes 64/300/640 px)
+     * Pas de cache ici : DataRenderer le conserve jusqu'à la prochaine synchro
+     * Une seule tentative : fichier optionnel, les tables ne doivent pas l'attendre
+     */
+    async loadImageManifest() {
+        return this._fetchWithRetry(await this.resolveDataUrl('images'), 1);
+    }
+
+    /**
+     * Charge la vue des caps imminents (data/caps.json), une seule tentative :
+     * caps.js calcule la vue depuis songs/albums si elle manque
+     */
+    async loadCapsView() {
+        return this._fetchWithRetry(await this.resolveDataUrl('caps'), 1);
+    }
+
+    /**
+     * URL d'un fichier de données : version immuable désignée par data/current.json
+     * (gardée en cache par le navigateur), sinon le fichier data/<name>.json
+     */
+    async resolveDataUrl(name) {
+        const pointer = await this._loadPointer();
+        const file = pointer?.files?.[name];
+        return file ? `/data/${file}` : `/data/${name}.json`;
+    }
+
     /**
      * Charge les données albums.json avec cache et retry
      */
@@ -78,7 +120,7 @@ class DataLoader {
         this.isLoading.albums = true;
 
         try {
-            const data = await this._fetchWithRetry('/data/albums.json');
+            const data = await this._loadFromBundle('albums') ?? await this._fetchWithRetry(await this.resolveDataUrl('albums'));
             this.cache.albums = data;
             this.cache.lastFetch.albums = Date.now();
             this._emitDataLoaded('albums', data);
@@ -152,6 +194,82 @@ class DataLoader {
         console.log(`🔄 Cache invalidé: ${type}`);
     }
 
+    /**
+     * Données d'un type depuis le bundle (null si le bundle n'est pas servi)
+     * Le bundle remplit aussi les caches des deux autres types : même révision
+     */
+    async _loadFromBundle(type) {
+        const bundle = await this._loadBundle();
+        if (!bundle) return null;
+
+        const now = Date.now();
+        for (const part of ['meta', 'songs', 'albums']) {
+            this.cache[part] = bundle[part];
+            this.cache.lastFetch[part] = now;
+        }
+        return bundle[type];
+    }
+
+    /**
+     * Charge /api/bundle (une seule requête partagée entre les appels simultanés)
+     * cache 'no-cache' : revalidation par ETag, 304 tant que la révision ne change pas
+     */
+    async _loadBundle() {
+        if (this.bundleUnavailable) return null;
+        if (this.bundlePromise) return this.bundlePromise;
+
+        this.bundlePromise = (async () => {
+            try {
+                const response = await fetch('/api/bundle', { cache: 'no-cache' });
+                if (response.status === 404) {
+                    // Serveur statique ou bundle pas encore publié : fichiers séparés
+                    this.bundleUnavailable = true;
+                    return null;
+                }
+                if (!response.ok) {
+                    throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+                }
+                return await response.json();
+            } catch (error) {
+                console.warn('⚠️ Bundle indisponible, chargement des fichiers séparés:', error);
+                return null;
+            } finally {
+                this.bundlePromise = null;
+            }
+        })();
+        return this.bundlePromise;
+    }
+
+    /**
+     * Charge data/current.json, seul fichier relu à chaque synchro
+     * (une seule requête partagée entre les appels simultanés)
+     */
+    async _loadPointer() {
+        if (this.pointerUnavailable) return null;
+        if (this.pointerPromise) return this.pointerPromise;
+
+        this.pointerPromise = (async () => {
+            try {
+                const response = await fetch(`/data/current.json?t=${Date.now()}`);
+                if (response.status === 404) {
+                    // Publication sans versions : fichiers data/*.json
+                    this.pointerUnavailable = true;
+                    return null;
+                }
+                if (!response.ok) {
+                    throw new Error(`HTTP ${response.status}: ${response.statusText}`);
+                }
+                return await response.json();
+            } catch (error) {
+                console.warn('⚠️ Pointeur current.json indisponible, fichiers non versionnés:', error);
+                return null;
+            } finally {
+                this.pointerPromise = null;
+            }
+        })();
+        return this.pointerPromise;
+    }
+
     /**
      * Fetch avec retry et backoff exponentiel
      * Prompt 8.8: Cache-busting basé sur meta.generated_at pour songs/albums
@@ -160,8 +278,11 @@ class DataLoader {
         for (let attempt = 1; attempt <= retries; attempt++) {
             try {
                 // Cache-busting: utiliser meta.generated_at si disponible, sinon timestamp
+                // Versions immuables (current.json) : URL inchangée, cache navigateur
                 let cacheBuster;
-                if ((url.includes('songs.json') || url.includes('albums.json')) && this.cache.meta?.generated_at) {
+                if (url.includes('/versions/')) {
+                    cacheBuster = '';
+                } else if ((url.includes('songs.json') || url.includes('albums.json')) && this.cache.meta?.generated_at) {
                     // Prompt 8.8: Version basée sur generated_at pour forcer refetch quand données changent
                     cacheBuster = `?v=${this.cache.meta.generated_at}`;
                 } else {
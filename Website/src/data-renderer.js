@@ -11,6 +11,10 @@ class DataRenderer {
             albums: null
         };
         
+        // Manifeste d'images (miniatures 64 px + srcset), rechargé à chaque synchro
+        this.imageManifest = null;
+        this.imageManifestPromise = null;
+        
         // Écouter l'événement de synchronisation pour rafraîchir les badges
         // Prompt 8.8: Invalider cache + rebuild rail si spotify_data_date change
         window.addEventListener('data-sync-updated', async (event) => {
@@ -20,6 +24,7 @@ class DataRenderer {
             if (window.dataLoader) {
                 window.dataLoader.invalidateCache('songs');
                 window.dataLoader.invalidateCache('albums');
+                this.imageManifestPromise = null;
                 console.log('[DataRenderer] 🗑️ Cache songs/albums invalidé');
             }
             
@@ -358,15 +363,17 @@ class DataRenderer {
         
         // Mettre à jour le cover (colonne 2) avec préchargement
         const tdCover = row.querySelector('td:nth-child(2)');
-        if (tdCover && song.cover_url) {
+        const songSources = this.getCoverSources(song);
+        if (tdCover && songSources) {
             const img = tdCover.querySelector('img');
             const currentSrc = img ? img.src : null;
-            const newSrc = song.cover_url;
+            const newSrc = songSources.src;
             
             // Précharger nouvelle image avant swap (évite flash blanc)
             if (img && currentSrc !== newSrc) {
                 const preloadImg = new Image();
                 preloadImg.onload = () => {
+                    img.srcset = songSources.srcset;
                     img.src = newSrc;
                     img.alt = `Cover ${song.title}`;
                 };
@@ -438,12 +445,62 @@ class DataRenderer {
         }
     }
 
+    /**
+     * Charge le manifeste d'images une fois par synchro (absent : cover_url plein format)
+     */
+    async loadImageManifest() {
+        if (!this.imageManifestPromise) {
+            this.imageManifestPromise = window.dataLoader.loadImageManifest()
+                .then(manifest => {
+                    this.imageManifest = manifest;
+                })
+                .catch(() => {
+                    console.warn('⚠️ Manifeste d\'images indisponible, covers plein format');
+                    this.imageManifest = null;
+                });
+        }
+        return this.imageManifestPromise;
+    }
+
+    /**
+     * Sources d'une cover : miniature 64 px + srcset 300/640 px si le manifeste les connaît
+     * @returns {{src: string, srcset: string}|null}
+     */
+    getCoverSources(item) {
+        if (!item.cover_url) return null;
+        
+        const entry = this.imageManifest && this.imageManifest.items[item.id];
+        if (!entry) return { src: item.cover_url, srcset: '' };
+        
+        const { base, sizes } = this.imageManifest;
+        // Chemins locaux (/images/..., cache_images.py) et URLs complètes gardés tels quels
+        const urls = entry.map(url => url && (url.startsWith('/') || url.includes('://') ? url : base + url));
+        const candidates = urls
+            .map((url, index) => url ? `${url} ${sizes[index]}w` : null)
+            .filter(Boolean);
+        
+        return {
+            src: urls.find(Boolean) || item.cover_url,
+            srcset: candidates.length > 1 ? candidates.join(', ') : ''
+        };
+    }
+
+    /**
+     * HTML de l'image de cover (miniature + srcset, taille affichée 58 px)
+     */
+    coverImageHtml(item, sources) {
+        const srcset = sources.srcset
+            ? ` srcset="${this.escapeHtml(sources.srcset)}" sizes="58px"`
+            : '';
+        return `<img src="${this.escapeHtml(sources.src)}"${srcset} alt="Cover ${this.escapeHtml(item.title)}" class="data-table__cover-image" loading="lazy" decoding="async">`;
+    }
+
     /**
      * Rend la table Songs
      */
     async renderSongsTable() {
         try {
-            const songs = await window.dataLoader.loadSongs();
+            const [songs] = await Promise.all([window.dataLoader.loadSongs(), this.loadImageManifest()]);
             
             if (!songs || songs.length === 0) {
                 console.warn('⚠️ Aucune chanson à afficher');
@@ -545,9 +602,10 @@ class DataRenderer {
         tdTitle.setAttribute('data-sort-value', 'title');
         tdTitle.setAttribute('data-sort-raw', song.title); // Garde * pour tri intelligent
         
-        // Cover : utiliser cover_url si disponible, sinon placeholder
-        const coverHtml = song.cover_url
-            ? `<img src="${this.escapeHtml(song.cover_url)}" alt="Cover ${this.escapeHtml(song.title)}" class="data-table__cover-image">`
+        // Cover : miniature du manifeste (ou cover_url) si disponible, sinon placeholder
+        const coverSources = this.getCoverSources(song);
+        const coverHtml = coverSources
+            ? this.coverImageHtml(song, coverSources)
             : `<div class="cover-placeholder">🎵</div>`;
         
         // Album name : utiliser album_name si disponible, sinon "Inconnu"
@@ -681,15 +739,17 @@ class DataRenderer {
         
         // Mettre à jour le cover (colonne 2) avec préchargement
         const tdCover = row.querySelector('td:nth-child(2)');
-        if (tdCover && album.cover_url) {
+        const albumSources = this.getCoverSources(album);
+        if (tdCover && albumSources) {
             const img = tdCover.querySelector('img');
             const currentSrc = img ? img.src : null;
-            const newSrc = album.cover_url;
+            const newSrc = albumSources.src;
             
             // Précharger nouvelle image avant swap (évite flash blanc)
             if (img && currentSrc !== newSrc) {
                 const preloadImg = new Image();
                 preloadImg.onload = () => {
+                    img.srcset = albumSources.srcset;
                     img.src = newSrc;
                     img.alt = `Cover ${album.album_name}`;
                 };
@@ -764,7 +824,7 @@ class DataRenderer {
      */
     async renderAlbumsTable() {
         try {
-            const albums = await window.dataLoader.loadAlbums();
+            const [albums] = await Promise.all([window.dataLoader.loadAlbums(), this.loadImageManifest()]);
             
             if (!albums || albums.length === 0) {
                 console.warn('⚠️ Aucun album à afficher');
@@ -866,9 +926,10 @@ class DataRenderer {
         tdTitle.setAttribute('data-sort-value', 'title');
         tdTitle.setAttribute('data-sort-raw', album.title);
         
-        // Cover : utiliser cover_url si disponible, sinon placeholder
-        const coverHtml = album.cover_url
-            ? `<img src="${this.escapeHtml(album.cover_url)}" alt="Cover ${this.escapeHtml(album.title)}" class="data-table__cover-image">`
+        // Cover : miniature du manifeste (ou cover_url) si disponible, sinon placeholder
+        const coverSources = this.getCoverSources(album);
+        const coverHtml = coverSources
+            ? this.coverImageHtml(album, coverSources)
             : `<div class="cover-placeholder">💿</div>`;
         
         tdTitle.innerHTML = `
@@ -8,7 +8,9 @@ class StickySearch {
         this.input = null;
         this.suggestionsContainer = null;
         this.songs = null;
+        this.index = null; // Index précalculé (data/search_index.json, generate_current_views.py)
         this.MIN_CHARS = 2;
+        this.GRAM_LENGTH = 3;
         this.MAX_RESULTS = 10;
         this.HIGHLIGHT_DURATION = 3000; // 3 secondes
         this.selectedIndex = -1;
@@ -138,20 +140,19 @@ class StickySearch {
      */
     async search(query) {
         try {
-            // Charger les chansons (avec cache)
-            if (!this.songs) {
-                this.songs = await window.dataLoader.loadSongs();
+            // Index précalculé si publié, sinon filtrage linéaire de songs.json
+            if (this.index === null) {
+                try {
+                    this.index = await window.dataLoader.loadSearchIndex();
+                } catch (error) {
+                    console.warn('⚠️ Index de recherche indisponible, filtrage linéaire');
+                    this.index = false;
+                }
             }
 
-            // Normaliser la requête
-            const normalizedQuery = this.normalizeString(query);
-
-            // Filtrer les chansons
-            const results = this.songs.filter(song => {
-                const normalizedTitle = this.normalizeString(song.title);
-                const normalizedAlbum = this.normalizeString(song.album);
-                return normalizedTitle.includes(normalizedQuery) || normalizedAlbum.includes(normalizedQuery);
-            }).slice(0, this.MAX_RESULTS);
+            const results = this.index
+                ? this.searchIndex(query)
+                : await this.searchLinear(query);
 
             this.displayResults(results, query);
         } catch (error) {
@@ -159,6 +160,89 @@ class StickySearch {
         }
     }
 
+    /**
+     * Recherche dans l'index : sous-chaîne des clés (requête plus courte qu'un trigramme)
+     * ou trigrammes + vérification (même algorithme que query_search_index côté Python)
+     */
+    searchIndex(query) {
+        const key = this.searchKey(query);
+        if (key.length < this.MIN_CHARS) {
+            return [];
+        }
+
+        let candidates;
+        if (key.length < this.GRAM_LENGTH) {
+            candidates = [];
+            this.index.keys.forEach((itemKey, position) => {
+                if (itemKey.includes(key)) candidates.push(position);
+            });
+        } else {
+            const grams = new Set();
+            for (let start = 0; start <= key.length - this.GRAM_LENGTH; start++) {
+                grams.add(key.substring(start, start + this.GRAM_LENGTH));
+            }
+
+            const postings = [...grams].map(gram => this.index.trigrams[gram]);
+            if (postings.some(list => !list)) {
+                return [];
+            }
+
+            // Liste la plus courte d'abord
+            postings.sort((a, b) => a.length - b.length);
+            candidates = this.decodePostings(postings[0]);
+            for (const deltas of postings.slice(1)) {
+                const positions = new Set(this.decodePostings(deltas));
+                candidates = candidates.filter(position => positions.has(position));
+            }
+            candidates = candidates.filter(position => this.index.keys[position].includes(key));
+        }
+
+        return candidates.slice(0, this.MAX_RESULTS).map(position => {
+            const [id, title, album] = this.index.items[position];
+            return { id, title, album };
+        });
+    }
+
+    /**
+     * Filtrage linéaire de songs.json (index absent)
+     */
+    async searchLinear(query) {
+        // Charger les chansons (avec cache)
+        if (!this.songs) {
+            this.songs = await window.dataLoader.loadSongs();
+        }
+
+        // Normaliser la requête
+        const normalizedQuery = this.normalizeString(query);
+
+        // Filtrer les chansons
+        return this.songs.filter(song => {
+            const normalizedTitle = this.normalizeString(song.title);
+            const normalizedAlbum = this.normalizeString(song.album);
+            return normalizedTitle.includes(normalizedQuery) || normalizedAlbum.includes(normalizedQuery);
+        }).slice(0, this.MAX_RESULTS);
+    }
+
+    /**
+     * Positions d'une liste encodée en écarts
+     */
+    decodePostings(deltas) {
+        let total = 0;
+        return deltas.map(delta => (total += delta));
+    }
+
+    /**
+     * Clé de recherche identique à search_key (generate_current_views.py) :
+     * texte complet, accents retirés, ponctuation retirée, espaces fusionnés
+     */
+    searchKey(str) {
+        return this.normalizeString(str.normalize('NFKD'))
+            .replace(/[^\p{L}\p{N}_\s]/gu, '')
+            .split(/\s+/)
+            .filter(Boolean)
+            .join(' ');
+    }
+
     /**
      * Normalise une chaîne pour la recherche
      */
@@ -330,6 +414,7 @@ class StickySearch {
      */
     invalidateCache() {
         this.songs = null;
+        this.index = null;
     }
 
     /**
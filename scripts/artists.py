@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Registre des artistes suivis et arborescence multi-artistes de data/.
+
+Registre : data/artists.json ({"artists": [{"id", "name", "enabled"}]}),
+à défaut The Weeknd seul.
+
+Arborescence :
+- artiste par défaut (The Weeknd) : data/ (inchangé, lu par le Website)
+- autres artistes                 : data/<artist_id>/ (songs.json, albums.json, meta.json, history/, cache/)
+- caches partagés (API Spotify, token, disjoncteurs) : data/cache/
+
+L'artiste courant d'un script est transmis par l'orchestrateur via ARTIST_ID.
+"""
+
+import os
+from pathlib import Path
+from typing import List, NamedTuple, Optional
+
+from json_io import load_json
+
+
+DEFAULT_ARTIST_ID = "1Xyo4u8uXC1ZmMpatF05PJ"
+DEFAULT_ARTIST_NAME = "The Weeknd"
+KWORB_ARTIST_URL = "https://kworb.net/spotify/artist/{artist_id}_{data_type}.html"
+
+
+class Artist(NamedTuple):
+    """Entrée du registre (id = ID Spotify de l'artiste, aussi utilisé par Kworb)."""
+    id: str
+    name: str
+    enabled: bool = True
+
+
+DEFAULT_ARTIST = Artist(DEFAULT_ARTIST_ID, DEFAULT_ARTIST_NAME)
+
+
+def registry_path(base_path: Path) -> Path:
+    """Chemin du registre : data/artists.json"""
+    return base_path / "data" / "artists.json"
+
+
+def load_artists(base_path: Path, include_disabled: bool = False) -> List[Artist]:
+    """
+    Charge le registre (artistes actifs par défaut).
+    Registre absent ou illisible : The Weeknd seul.
+    """
+    try:
+        entries = load_json(registry_path(base_path)).get("artists", [])
+    except FileNotFoundError:
+        return [DEFAULT_ARTIST]
+    except Exception as e:
+        print(f"⚠️  Registre artistes illisible ({e}), artiste par défaut utilisé")
+        return [DEFAULT_ARTIST]
+    
+    artists = [
+        Artist(entry["id"], entry.get("name", entry["id"]), entry.get("enabled", True))
+        for entry in entries
+        if entry.get("id")
+    ]
+    if not include_disabled:
+        artists = [artist for artist in artists if artist.enabled]
+    return artists
+
+
+def current_artist_id() -> str:
+    """Artiste du processus courant (ARTIST_ID, The Weeknd par défaut)."""
+    return os.getenv("ARTIST_ID") or DEFAULT_ARTIST_ID
+
+
+def current_artist(base_path: Path) -> Artist:
+    """Entrée du registre pour l'artiste courant (nom = ID si absent du registre)."""
+    artist_id = current_artist_id()
+    for artist in load_artists(base_path, include_disabled=True):
+        if artist.id == artist_id:
+            return artist
+    if artist_id == DEFAULT_ARTIST_ID:
+        return DEFAULT_ARTIST
+    return Artist(artist_id, artist_id)
+
+
+def data_dir(base_path: Path, artist_id: Optional[str] = None) -> Path:
+    """
+    Dossier de données d'un artiste (artiste courant si artist_id est None).
+    L'artiste par défaut garde data/ pour ne pas casser le Website.
+    """
+    artist_id = artist_id or current_artist_id()
+    if artist_id == DEFAULT_ARTIST_ID:
+        return base_path / "data"
+    return base_path / "data" / artist_id
+
+
+def kworb_url(data_type: str, artist_id: Optional[str] = None) -> str:
+    """URL de la page Kworb songs/albums d'un artiste."""
+    return KWORB_ARTIST_URL.format(artist_id=artist_id or current_artist_id(), data_type=data_type)
@@ -0,0 +1,173 @@
+"""
+Client Spotify API asynchrone (asyncio)
+Même surface que SpotifyClient (search_track / get_album / search_album) :
+- Rafraîchissement du token en single-flight (un seul POST même si N appels concurrents)
+- Nombre de requêtes simultanées borné (max_concurrency)
+- Requêtes identiques en vol fusionnées par clé de cache
+- Cache positif et négatif partagés avec le client synchrone
+Partage le cache et le token du SpotifyClient synchrone qu'il enveloppe.
+"""
+
+import asyncio
+import time
+from typing import Optional, Dict, List
+
+import requests
+
+from spotify_client import CACHED_FAILURE, CachedFailureError, SpotifyClient
+from resilience import CircuitOpenError
+
+
+class AsyncSpotifyClient:
+    """Client Spotify asynchrone adossé à un SpotifyClient (cache + credentials)"""
+    
+    DEFAULT_MAX_CONCURRENCY = 5
+    
+    def __init__(self, client: SpotifyClient, max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
+        self.client = client
+        self.max_concurrency = max(1, max_concurrency)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._token_lock = asyncio.Lock()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._cache_dirty = False
+    
+    async def _get_access_token(self) -> str:
+        """Obtient un access token, un seul rafraîchissement à la fois"""
+        if self.client.access_token and time.time() < self.client.token_expires_at:
+            return self.client.access_token
+        
+        async with self._token_lock:
+            # Le client synchrone revérifie la validité : les appelants mis en
+            # attente pendant le rafraîchissement réutilisent le nouveau token
+            return await asyncio.to_thread(self.client.get_access_token)
+    
+    async def _request(self, endpoint: str, params: Optional[Dict] = None, use_cache: bool = True) -> Dict:
+        """Requête API avec cache partagé et fusion des requêtes identiques en vol"""
+        params = dict(params or {})
+        params["market"] = self.client.market
+        
+        cache_key = self.client.cache_key(endpoint, params)
+        if use_cache:
+            cached = self.client.cached_response(cache_key)
+            if cached is CACHED_FAILURE:
+                raise CachedFailureError(endpoint)
+            if cached is not None:
+                return cached
+        
+        task = self._inflight.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(endpoint, params, cache_key, use_cache))
+            self._inflight[cache_key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(cache_key, None))
+        
+        # shield : l'annulation d'un appelant n'annule pas la requête partagée
+        return await asyncio.shield(task)
+    
+    async def _fetch(self, endpoint: str, params: Dict, cache_key: str, use_cache: bool) -> Dict:
+        """Requête HTTP + mise en cache (positive ou négative, sauvegarde groupée)"""
+        try:
+            data = await self._fetch_http(endpoint, params)
+        except Exception as e:
+            if use_cache and not isinstance(e, CircuitOpenError):
+                self.client.store_failure(cache_key, e, save=False)
+                self._cache_dirty = True
+            raise
+        
+        if use_cache:
+            self.client.store_response(endpoint, cache_key, data, save=False)
+            self._cache_dirty = True
+        
+        return data
+    
+    async def _fetch_http(self, endpoint: str, params: Dict) -> Dict:
+        """Effectue la requête HTTP (bornée par le sémaphore) avec la RetryPolicy du client synchrone"""
+        policy = self.client.retry_policy
+        async with self._semaphore:
+            for attempt in policy.attempts():
+                policy.before_attempt()
+                try:
+                    token = await self._get_access_token()
+                    response = await asyncio.to_thread(
+                        requests.get, **self.client.request_kwargs(endpoint, params, token)
+                    )
+                    delay = policy.on_response(response)
+                except requests.exceptions.RequestException as e:
+                    delay = policy.on_error(e, attempt)
+                
+                if delay is None:
+                    return response.json()
+                await asyncio.sleep(delay)
+        
+        raise policy.exhausted()
+    
+    def flush_cache(self):
+        """Sauvegarde le cache partagé une seule fois pour tout le lot de requêtes"""
+        if self._cache_dirty:
+            self.client.flush_cache()
+            self._cache_dirty = False
+    
+    async def search_track(self, query: str, artist: str = "The Weeknd", limit: int = 10) -> List[Dict]:
+        """Recherche une piste sur Spotify (voir SpotifyClient.search_track)"""
+        params = {
+            "q": f'track:"{query}" artist:"{artist}"',
+            "type": "track",
+            "limit": limit
+        }
+        
+        try:
+            response = await self._request("search", params)
+            return response.get("tracks", {}).get("items", [])
+        except Exception as e:
+            print(f"ERREUR recherche track '{query}': {e}")
+            return []
+    
+    async def get_album(self, album_id: str) -> Optional[Dict]:
+        """Récupère les détails d'un album par son ID (voir SpotifyClient.get_album)"""
+        try:
+            return await self._request(f"albums/{album_id}")
+        except Exception as e:
+            print(f"ERREUR recuperation album '{album_id}': {e}")
+            return None
+    
+    async def search_album(self, query: str, artist: str = "The Weeknd", limit: int = 10) -> List[Dict]:
+        """Recherche un album sur Spotify (voir SpotifyClient.search_album)"""
+        params = {
+            "q": f'album:"{query}" artist:"{artist}"',
+            "type": "album",
+            "limit": limit
+        }
+        
+        try:
+            response = await self._request("search", params)
+            return response.get("albums", {}).get("items", [])
+        except Exception as e:
+            print(f"ERREUR recherche album '{query}': {e}")
+            return []
+    
+    async def warm_track_searches(
+        self,
+        queries: List[str],
+        artist: str = "The Weeknd",
+        timeout: Optional[float] = None
+    ) -> int:
+        """
+        Exécute en parallèle les recherches de pistes pour remplir le cache partagé
+        Le résolveur synchrone est ensuite servi entièrement par le cache.
+        Au-delà de timeout (secondes), les recherches restantes sont abandonnées
+        (le cache conserve celles déjà terminées).
+        
+        Returns:
+            Nombre de recherches ayant retourné au moins un résultat
+        """
+        if not queries:
+            return 0
+        
+        tasks = [asyncio.ensure_future(self.search_track(q, artist)) for q in queries]
+        done, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            print(f"WARNING Budget de temps atteint, {len(pending)} recherches non prechargees")
+        
+        self.flush_cache()
+        return sum(1 for task in done if task.result())
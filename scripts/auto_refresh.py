@@ -3,24 +3,39 @@
 Orchestrateur auto-refresh pour The Weeknd Dashboard.
 Exécute périodiquement le pipeline : scrape Songs/Albums, régénère vues, met à jour meta.json.
 Intervalle par défaut : 5 minutes (300 secondes) - Prompt 8.9.
+Plusieurs artistes actifs dans data/artists.json : pipelines exécutés en parallèle (run_roster).
 """
 
-import json
 import os
 import random
 import subprocess
 import sys
+import threading
 import time
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Tuple
+
+from json_io import dump_json, load_json
+from resilience import resilience_summary
+from publish import publish_data
+from artists import Artist, data_dir, load_artists
+from cover_index import views_outdated
 
 # Configuration
 DEFAULT_REFRESH_INTERVAL = 300  # Prompt 8.9: 5 minutes (changé de 600)
 JITTER_SECONDS = 15  # ±15 secondes
 LOCK_FILE = ".sync.lock"
 
+# Multi-artistes : parallélisme global et politesse envers Kworb / Spotify
+DEFAULT_ROSTER_MAX_PARALLEL = 4       # Pipelines d'artistes simultanés
+DEFAULT_KWORB_MAX_PARALLEL = 2        # Scrapes Kworb simultanés (tous artistes)
+DEFAULT_KWORB_MIN_INTERVAL = 1.0      # Secondes minimum entre deux scrapes Kworb
+DEFAULT_ENRICH_MAX_PARALLEL = 2       # Enrichissements Spotify simultanés
+
 
 class OrchestrationLock:
     """Gestion du verrou anti-chevauchement."""
@@ -82,9 +97,16 @@ def get_python_executable() -> str:
     return current_python
 
 
-def run_script(script_path: Path, python_exe: str, base_path: Path, timeout: int = 120) -> Tuple[bool, Optional[str]]:
+def run_script(
+    script_path: Path,
+    python_exe: str,
+    base_path: Path,
+    timeout: int = 120,
+    env_overrides: Optional[Dict[str, str]] = None
+) -> Tuple[bool, Optional[str]]:
     """
     Exécute un script Python.
+    env_overrides : variables ajoutées à l'environnement du script (ex: ARTIST_ID).
     Retourne (succès, message_erreur).
     """
     try:
@@ -92,6 +114,7 @@ def run_script(script_path: Path, python_exe: str, base_path: Path, timeout: int
         env = os.environ.copy()
         env['PYTHONIOENCODING'] = 'utf-8'
         env['PYTHONLEGACYWINDOWSSTDIO'] = '0'  # Désactive le mode legacy sur Windows
+        env.update(env_overrides or {})
         
         # Sur Windows, utiliser creationflags pour éviter les erreurs de threads
         kwargs = {
@@ -124,16 +147,16 @@ def run_script(script_path: Path, python_exe: str, base_path: Path, timeout: int
         return False, str(e)[:200]
 
 
-def update_meta_status(base_path: Path, status: str, error: Optional[str] = None):
+def update_meta_status(base_path: Path, status: str, error: Optional[str] = None, artist_id: Optional[str] = None):
     """
-    Met à jour meta.json avec le statut de synchronisation.
+    Met à jour meta.json (de l'artiste, défaut : The Weeknd) avec le statut de synchronisation,
+    puis publie la génération du cycle (publish.py) : c'est la dernière écriture de meta.json.
     """
-    meta_path = base_path / "data" / "meta.json"
+    meta_path = data_dir(base_path, artist_id) / "meta.json"
     
     try:
         if meta_path.exists():
-            with open(meta_path, "r", encoding="utf-8") as f:
-                meta = json.load(f)
+            meta = load_json(meta_path)
         else:
             meta = {}
         
@@ -145,20 +168,101 @@ def update_meta_status(base_path: Path, status: str, error: Optional[str] = None
         elif "last_error" in meta:
             del meta["last_error"]
         
-        with open(meta_path, "w", encoding="utf-8") as f:
-            json.dump(meta, f, indent=2, ensure_ascii=False)
+        dump_json(meta_path, meta)
+        if publish_data(meta_path.parent, cycle_end=True) is None:
+            print("⚠️  Génération non publiée : la précédente reste servie")
     
     except Exception as e:
         print(f"⚠️  Erreur mise à jour meta.json: {e}")
 
 
-def rotate_snapshots(base_path: Path, keep_count: int = 3):
+def read_meta(base_path: Path, artist_id: Optional[str] = None) -> dict:
+    """Lit meta.json (dict vide si absent ou illisible)."""
+    meta_path = data_dir(base_path, artist_id) / "meta.json"
+    try:
+        return load_json(meta_path)
+    except Exception:
+        return {}
+
+
+def update_meta_fields(base_path: Path, fields: dict, artist_id: Optional[str] = None):
+    """Met à jour quelques champs de meta.json sans toucher au reste."""
+    meta_path = data_dir(base_path, artist_id) / "meta.json"
+    meta = read_meta(base_path, artist_id)
+    meta.update(fields)
+    try:
+        dump_json(meta_path, meta)
+    except Exception as e:
+        print(f"⚠️  Erreur mise à jour meta.json: {e}")
+
+
+def enrichment_pending(base_path: Path, artist_id: Optional[str] = None) -> bool:
+    """
+    True si le dernier enrichissement s'est arrêté sur son budget de temps
+    (checkpoint incomplet écrit par enrich_covers.py) : il reste des items à reprendre.
+    """
+    checkpoint_path = data_dir(base_path, artist_id) / "cache" / "enrich_checkpoint.json"
+    try:
+        return not load_json(checkpoint_path).get("complete", True)
+    except Exception:
+        return False
+
+
+def snapshots_unchanged(base_path: Path, artist_id: Optional[str] = None) -> bool:
+    """
+    True si les scrapers de ce cycle ont signalé des snapshots songs ET albums
+    identiques au cycle précédent (meta.snapshot_status, cf. date_manager).
+    """
+    status = read_meta(base_path, artist_id).get("snapshot_status", {})
+    return status.get("songs") == "unchanged" and status.get("albums") == "unchanged"
+
+
+def can_skip_enrichment(base_path: Path, artist_id: Optional[str] = None) -> bool:
+    """
+    Snapshots inchangés, dernier enrichissement réussi et complet
+    → songs.json/albums.json déjà enrichis, rien à résoudre.
+    """
+    return (snapshots_unchanged(base_path, artist_id)
+            and read_meta(base_path, artist_id).get("last_enrich_status") == "ok"
+            and not enrichment_pending(base_path, artist_id))
+
+
+def refresh_outdated_views(
+    base_path: Path,
+    python_exe: str,
+    artist_id: Optional[str] = None,
+    env_overrides: Optional[Dict[str, str]] = None
+) -> Optional[Tuple[bool, Optional[str]]]:
+    """
+    Régénère les vues (generate_current_views.py) si l'index de covers a changé depuis
+    leur dernière publication : les scrapers ne les régénèrent que si les snapshots
+    changent, avant l'enrichissement qui résout les nouvelles covers.
+    
+    Returns:
+        None si les vues sont à jour, sinon (succès, message_erreur)
+    """
+    if not views_outdated(base_path, artist_id):
+        return None
+    return run_script(
+        base_path / "scripts" / "generate_current_views.py",
+        python_exe,
+        base_path,
+        env_overrides=env_overrides
+    )
+
+
+def image_cache_enabled() -> bool:
+    """Étape optionnelle cache_images.py (covers servies localement) : IMAGE_CACHE=1"""
+    return os.getenv("IMAGE_CACHE", "0") == "1"
+
+
+def rotate_snapshots(base_path: Path, keep_count: int = 3, artist_id: Optional[str] = None):
     """
     Maintient un minimum de snapshots et purge les plus anciens.
     Garde au minimum keep_count dates (par défaut 3 pour J, J-1, J-2).
     """
     for snapshot_type in ["songs", "albums"]:
-        history_path = base_path / "data" / "history" / snapshot_type
+        history_path = data_dir(base_path, artist_id) / "history" / snapshot_type
         
         if not history_path.exists():
             continue
@@ -184,6 +288,7 @@ def run_pipeline(base_path: Path, python_exe: str, cycle_number: int = 1) -> boo
     1. Scrape Songs     : Récupère données Kworb → Crée snapshot J → Régénère songs.json
     2. Scrape Albums    : Récupère données Kworb → Crée snapshot J → Régénère albums.json
     3. Enrichissement   : Ajoute cover_url Spotify dans songs.json et albums.json
+    Puis, si l'index de covers a changé, régénération des vues (caps, images, covers_revision...).
     
     Note: La rotation des snapshots (J, J-1, J-2) est gérée automatiquement 
           par les scrapers via date_manager.py (basée sur kworb_day).
@@ -204,6 +309,9 @@ def run_pipeline(base_path: Path, python_exe: str, cycle_number: int = 1) -> boo
     all_success = True
     error_messages = []
     
+    # Identifiant du cycle transmis aux étapes : budget de retries partagé (resilience.py)
+    os.environ["PIPELINE_CYCLE_ID"] = f"{datetime.now().strftime('%Y%m%dT%H%M%S')}-{cycle_number}"
+    
     # Étape 1 : Scrape Songs
     print("\n┌────────────────────────────────────────────────────────────────────┐")
     print("│ [1/3] 📊 SCRAPING SONGS                                            │")
@@ -253,17 +361,39 @@ def run_pipeline(base_path: Path, python_exe: str, cycle_number: int = 1) -> boo
     print("│ • Ajoute cover_url + album_name dans les fichiers JSON             │")
     print("│ • Incrémente covers_revision dans meta.json                        │")
     print("└────────────────────────────────────────────────────────────────────┘")
-    success, error = run_script(
-        base_path / "scripts" / "enrich_covers.py",
-        python_exe,
-        base_path,
-        timeout=300  # 5 minutes pour l'enrichissement Spotify
-    )
-    if success:
-        print("│ ✅ Covers enrichies avec succès")
+    # Court-circuit : songs.json/albums.json déjà enrichis, rien à résoudre
+    if all_success and can_skip_enrichment(base_path):
+        print("│ ⏭️  Snapshots inchangés, enrichissement ignoré")
     else:
-        print(f"│ ⚠️  Avertissement: {error} (non-bloquant)")
-        # Ne pas bloquer le pipeline si l'enrichissement échoue
+        success, error = run_script(
+            base_path / "scripts" / "enrich_covers.py",
+            python_exe,
+            base_path,
+            timeout=300  # 5 minutes pour l'enrichissement Spotify
+        )
+        update_meta_fields(base_path, {"last_enrich_status": "ok" if success else "error"})
+        if success:
+            print("│ ✅ Covers enrichies avec succès")
+        else:
+            print(f"│ ⚠️  Avertissement: {error} (non-bloquant)")
+            # Ne pas bloquer le pipeline si l'enrichissement échoue
+    
+    # Étape optionnelle : cache local des covers (non-bloquante)
+    if image_cache_enabled():
+        success, error = run_script(base_path / "scripts" / "cache_images.py", python_exe, base_path, timeout=300)
+        if success:
+            print("│ ✅ Covers en cache local (/images/)")
+        else:
+            print(f"│ ⚠️  Cache images: {error} (non-bloquant)")
+    
+    # Covers résolues ce cycle (ou lors d'un cycle précédent) : vues dérivées à republier
+    refreshed = refresh_outdated_views(base_path, python_exe)
+    if refreshed:
+        success, error = refreshed
+        if success:
+            print("│ ✅ Vues régénérées avec les nouvelles covers")
+        else:
+            print(f"│ ⚠️  Régénération des vues: {error} (non-bloquant)")
     
     # Footer avec info rotation
     print("\n┌────────────────────────────────────────────────────────────────────┐")
@@ -275,6 +405,9 @@ def run_pipeline(base_path: Path, python_exe: str, cycle_number: int = 1) -> boo
     print("└────────────────────────────────────────────────────────────────────┘")
     print("│ ✅ Rotation automatique active")
     
+    # État des disjoncteurs / budget de retries visible dans meta.json
+    update_meta_fields(base_path, {"resilience": resilience_summary()})
+    
     # Mise à jour du statut dans meta.json
     if all_success:
         update_meta_status(base_path, "ok")
@@ -291,6 +424,171 @@ def run_pipeline(base_path: Path, python_exe: str, cycle_number: int = 1) -> boo
     return all_success
 
 
+class PolitenessGate:
+    """
+    Limite partagée par tous les artistes du cycle pour un service externe :
+    au plus max_parallel étapes simultanées, démarrages espacés d'au moins min_interval secondes.
+    """
+    
+    def __init__(self, max_parallel: int, min_interval: float = 0.0):
+        self._semaphore = threading.BoundedSemaphore(max(1, max_parallel))
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+        self.min_interval = min_interval
+    
+    @contextmanager
+    def slot(self):
+        with self._semaphore:
+            with self._lock:
+                wait = self._next_start - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+                self._next_start = time.monotonic() + self.min_interval
+            yield
+
+
+def run_artist_pipeline(
+    base_path: Path,
+    python_exe: str,
+    artist: Artist,
+    kworb_gate: PolitenessGate,
+    enrich_gate: PolitenessGate
+) -> Dict:
+    """
+    Pipeline d'un artiste (scrape songs → scrape albums → enrichissement → vues si nouvelles covers), étapes en séquence :
+    elles partagent le meta.json de l'artiste. Les artistes se chevauchent entre eux.
+    
+    Returns:
+        Dict {artist, success, errors, duration}
+    """
+    start = time.monotonic()
+    env = {"ARTIST_ID": artist.id}
+    errors = []
+    data_dir(base_path, artist.id).mkdir(parents=True, exist_ok=True)
+    
+    for label, script in (("Songs", "scrape_kworb_songs.py"), ("Albums", "scrape_kworb_albums.py")):
+        with kworb_gate.slot():
+            success, error = run_script(base_path / "scripts" / script, python_exe, base_path, env_overrides=env)
+        if success:
+            print(f"│ [{artist.name}] ✅ {label} scraped")
+        else:
+            print(f"│ [{artist.name}] ❌ {label}: {error}")
+            errors.append(f"{label}: {error}")
+    
+    if not errors and can_skip_enrichment(base_path, artist.id):
+        print(f"│ [{artist.name}] ⏭️  Snapshots inchangés, enrichissement ignoré")
+    else:
+        with enrich_gate.slot():
+            success, error = run_script(
+                base_path / "scripts" / "enrich_covers.py",
+                python_exe,
+                base_path,
+                timeout=300,
+                env_overrides=env
+            )
+        update_meta_fields(base_path, {"last_enrich_status": "ok" if success else "error"}, artist.id)
+        if success:
+            print(f"│ [{artist.name}] ✅ Covers enrichies")
+        else:
+            print(f"│ [{artist.name}] ⚠️  Enrichissement: {error} (non-bloquant)")
+    
+    if image_cache_enabled():
+        with enrich_gate.slot():
+            success, error = run_script(
+                base_path / "scripts" / "cache_images.py",
+                python_exe,
+                base_path,
+                timeout=300,
+                env_overrides=env
+            )
+        if success:
+            print(f"│ [{artist.name}] ✅ Covers en cache local")
+        else:
+            print(f"│ [{artist.name}] ⚠️  Cache images: {error} (non-bloquant)")
+    
+    refreshed = refresh_outdated_views(base_path, python_exe, artist.id, env)
+    if refreshed:
+        success, error = refreshed
+        if success:
+            print(f"│ [{artist.name}] ✅ Vues régénérées avec les nouvelles covers")
+        else:
+            print(f"│ [{artist.name}] ⚠️  Vues: {error} (non-bloquant)")
+    
+    update_meta_fields(base_path, {"resilience": resilience_summary()}, artist.id)
+    if errors:
+        update_meta_status(base_path, "error", "; ".join(errors[:2]), artist.id)
+    else:
+        update_meta_status(base_path, "ok", artist_id=artist.id)
+    
+    return {
+        "artist": artist.id,
+        "success": not errors,
+        "errors": errors,
+        "duration": round(time.monotonic() - start, 1)
+    }
+
+
+def run_roster(base_path: Path, python_exe: str, artists: List[Artist], cycle_number: int = 1) -> bool:
+    """
+    Exécute le pipeline de plusieurs artistes en parallèle (threads → sous-processus).
+    
+    Politesse globale (variables d'environnement) :
+    - ROSTER_MAX_PARALLEL        : pipelines d'artistes simultanés
+    - KWORB_MAX_PARALLEL         : scrapes Kworb simultanés, tous artistes confondus
+    - KWORB_MIN_INTERVAL_SECONDS : écart minimum entre deux scrapes Kworb
+    - ENRICH_MAX_PARALLEL        : enrichissements Spotify simultanés
+    Le scrape d'un artiste recouvre l'enrichissement d'un autre : la durée du cycle
+    croît moins vite que le nombre d'artistes.
+    
+    Retourne True si tous les artistes ont réussi.
+    """
+    max_parallel = int(os.getenv("ROSTER_MAX_PARALLEL", DEFAULT_ROSTER_MAX_PARALLEL))
+    kworb_gate = PolitenessGate(
+        int(os.getenv("KWORB_MAX_PARALLEL", DEFAULT_KWORB_MAX_PARALLEL)),
+        float(os.getenv("KWORB_MIN_INTERVAL_SECONDS", DEFAULT_KWORB_MIN_INTERVAL))
+    )
+    enrich_gate = PolitenessGate(int(os.getenv("ENRICH_MAX_PARALLEL", DEFAULT_ENRICH_MAX_PARALLEL)))
+    
+    print("\n" + "═" * 70)
+    print(f"🔄 CYCLE #{cycle_number} — {len(artists)} artistes — {datetime.now().strftime('%H:%M:%S')}".center(70))
+    print("═" * 70)
+    
+    # Même cycle pour tous les artistes : budget de retries partagé (resilience.py)
+    os.environ["PIPELINE_CYCLE_ID"] = f"{datetime.now().strftime('%Y%m%dT%H%M%S')}-{cycle_number}"
+    
+    start = time.monotonic()
+    with ThreadPoolExecutor(max_workers=max(1, max_parallel)) as executor:
+        results = list(executor.map(
+            lambda artist: run_artist_pipeline(base_path, python_exe, artist, kworb_gate, enrich_gate),
+            artists
+        ))
+    elapsed = time.monotonic() - start
+    
+    failed = [result for result in results if not result["success"]]
+    sequential = sum(result["duration"] for result in results)
+    
+    print("\n" + "═" * 70)
+    if failed:
+        print(f"{'⚠️  CYCLE #' + str(cycle_number) + f' TERMINÉ — {len(failed)}/{len(results)} artistes en erreur':^70}")
+    else:
+        print(f"{'✅ CYCLE #' + str(cycle_number) + ' TERMINÉ — Succès complet':^70}")
+    print(f"{f'⏱️  {elapsed:.0f}s (somme des pipelines : {sequential:.0f}s)':^70}")
+    print("═" * 70)
+    
+    return not failed
+
+
+def run_cycle(base_path: Path, python_exe: str, cycle_number: int = 1) -> bool:
+    """Un cycle : pipeline historique pour The Weeknd seul, run_roster dès que le registre liste d'autres artistes."""
+    artists = load_artists(base_path)
+    if not artists:
+        print("⚠️  Aucun artiste actif dans data/artists.json")
+        return False
+    if len(artists) == 1 and data_dir(base_path, artists[0].id) == base_path / "data":
+        return run_pipeline(base_path, python_exe, cycle_number=cycle_number)
+    return run_roster(base_path, python_exe, artists, cycle_number=cycle_number)
+
+
 def main():
     """Point d'entrée principal de l'orchestrateur."""
     parser = argparse.ArgumentParser(description="Orchestrateur auto-refresh Dashboard")
@@ -350,8 +648,8 @@ def main():
                     time.sleep(jitter)
                 
                 # Exécuter le pipeline
-                run_pipeline(base_path, python_exe, cycle_number=iteration)
-                
+                run_cycle(base_path, python_exe, cycle_number=iteration)
+            
             finally:
                 # Toujours libérer le verrou
                 lock.release()
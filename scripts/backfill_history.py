@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Import en masse d'historique Kworb (backfill).
+Ingère un dossier de pages Kworb HTML archivées et/ou d'anciens snapshots JSON,
+les parse en parallèle (pool de processus) avec le même parsing que les scrapers,
+puis écrit l'archive data[/<artist_id>]/archive/{songs,albums}/YYYY-MM-DD.json en une passe
+(artiste courant : ARTIST_ID).
+
+L'archive est distincte de data/history/ : la rotation J/J-1/J-2 n'y touche pas.
+Lecture : load_archive_index / archive_snapshot_path, servis par dashboard_server.py
+(/api/archive et /api/archive/<type>/<date>).
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from json_io import dump_json, dumps_records, load_json, write_atomic
+from date_manager import calculate_spotify_data_date
+from artists import data_dir
+
+
+DATA_TYPES = ("songs", "albums")
+DATE_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}")
+ARCHIVE_EXTENSIONS = (".html", ".htm", ".json")
+
+
+def archive_dir(base_path: Path, artist_id: Optional[str] = None) -> Path:
+    """Dossier de l'archive d'un artiste : data[/<artist_id>]/archive"""
+    return data_dir(base_path, artist_id) / "archive"
+
+
+def load_archive_index(base_path: Path, artist_id: Optional[str] = None) -> Dict[str, List[str]]:
+    """Dates archivées par type ({songs: [...], albums: [...]}, ordre décroissant)."""
+    index = {data_type: [] for data_type in DATA_TYPES}
+    index_path = archive_dir(base_path, artist_id) / "index.json"
+    if index_path.exists():
+        index.update(load_json(index_path))
+    return index
+
+
+def archive_snapshot_path(base_path: Path, data_type: str, date: str, artist_id: Optional[str] = None) -> Optional[Path]:
+    """Fichier d'un snapshot archivé, None si le type, la date ou le fichier sont inconnus."""
+    if data_type not in DATA_TYPES or not DATE_PATTERN.fullmatch(date):
+        return None
+    path = archive_dir(base_path, artist_id) / data_type / f"{date}.json"
+    return path if path.is_file() else None
+
+
+def detect_html_type(path: Path, forced_type: Optional[str] = None) -> str:
+    """Type d'une page HTML archivée : forcé, sinon déduit du nom de fichier (ex: ..._albums.html)."""
+    if forced_type:
+        return forced_type
+    return "albums" if "album" in path.name.lower() else "songs"
+
+
+def parse_html_archive(path: Path, forced_type: Optional[str] = None) -> Dict:
+    """Parse une page Kworb archivée avec le parsing des scrapers."""
+    data_type = detect_html_type(path, forced_type)
+    html = path.read_text(encoding="utf-8", errors="replace")
+    
+    # Imports locaux : seuls les workers HTML ont besoin de bs4
+    if data_type == "songs":
+        from scrape_kworb_songs import parse_kworb_songs_html
+        items, last_update_kworb, _ = parse_kworb_songs_html(html)
+    else:
+        from scrape_kworb_albums import parse_kworb_albums_html
+        items, last_update_kworb = parse_kworb_albums_html(html)
+    
+    # Pas de fallback sur datetime.now() : une archive sans date serait mal placée
+    if last_update_kworb is None:
+        raise ValueError("timestamp Kworb introuvable")
+    
+    spotify_data_date = calculate_spotify_data_date(last_update_kworb)
+    last_update_iso = last_update_kworb.isoformat()
+    
+    return {
+        "data_type": data_type,
+        "date": spotify_data_date,
+        "last_update_kworb": last_update_iso,
+        "items": [
+            item._replace(last_update_kworb=last_update_iso, spotify_data_date=spotify_data_date)
+            for item in items
+        ]
+    }
+
+
+def parse_json_archive(path: Path, forced_type: Optional[str] = None) -> Dict:
+    """Lit un ancien snapshot JSON (format data/history/*/YYYY-MM-DD.json)."""
+    items = load_json(path)
+    
+    if not isinstance(items, list) or not items:
+        raise ValueError("snapshot vide ou invalide")
+    
+    first = items[0]
+    data_type = forced_type or ("albums" if str(first.get("id", "")).startswith("kworb:album:") else "songs")
+    last_update_iso = first.get("last_update_kworb")
+    
+    # Date : champ du snapshot, sinon recalculée depuis Kworb, sinon nom du fichier
+    spotify_data_date = first.get("spotify_data_date")
+    if not spotify_data_date and last_update_iso:
+        spotify_data_date = calculate_spotify_data_date(datetime.fromisoformat(last_update_iso))
+    if not spotify_data_date and DATE_PATTERN.fullmatch(path.stem):
+        spotify_data_date = path.stem
+    if not spotify_data_date:
+        raise ValueError("date du snapshot introuvable")
+    
+    return {
+        "data_type": data_type,
+        "date": spotify_data_date,
+        "last_update_kworb": last_update_iso or "",
+        "items": items
+    }
+
+
+def parse_archive_file(args) -> Dict:
+    """
+    Worker du pool : parse un fichier archivé (HTML ou JSON).
+    Ne lève jamais : l'erreur est renvoyée pour ne pas interrompre le lot.
+    """
+    path_str, forced_type = args
+    path = Path(path_str)
+    
+    try:
+        # Les parsers des scrapers affichent des logs : inutiles × des milliers de fichiers
+        with contextlib.redirect_stdout(io.StringIO()):
+            if path.suffix.lower() == ".json":
+                result = parse_json_archive(path, forced_type)
+            else:
+                result = parse_html_archive(path, forced_type)
+        result["path"] = path_str
+        return result
+    except SystemExit:
+        return {"path": path_str, "error": "dépendances manquantes (pip install requests beautifulsoup4)"}
+    except Exception as e:
+        return {"path": path_str, "error": str(e)}
+
+
+def collect_archive_files(source_dir: Path) -> List[Path]:
+    """Liste récursive des fichiers HTML/JSON à importer."""
+    return sorted(
+        path for path in source_dir.rglob("*")
+        if path.is_file() and path.suffix.lower() in ARCHIVE_EXTENSIONS
+    )
+
+
+def select_latest_per_date(results: List[Dict]) -> Dict[str, Dict[str, Dict]]:
+    """
+    Regroupe les résultats par (type, date).
+    Plusieurs captures du même jour : la plus récente (last_update_kworb) l'emporte.
+    """
+    selected = {data_type: {} for data_type in DATA_TYPES}
+    
+    for result in results:
+        current = selected[result["data_type"]].get(result["date"])
+        if current is None or result["last_update_kworb"] > current["last_update_kworb"]:
+            selected[result["data_type"]][result["date"]] = result
+    
+    return selected
+
+
+def write_archive(archive_path: Path, selected: Dict[str, Dict[str, Dict]]) -> Dict[str, List[str]]:
+    """
+    Écrit l'archive en une passe et met à jour son index.json.
+    
+    Returns:
+        Dict {songs: [dates], albums: [dates]} (ordre décroissant, archive complète)
+    """
+    index_path = archive_path / "index.json"
+    index = {data_type: [] for data_type in DATA_TYPES}
+    if index_path.exists():
+        index.update(load_json(index_path))
+    
+    for data_type in DATA_TYPES:
+        type_path = archive_path / data_type
+        type_path.mkdir(parents=True, exist_ok=True)
+        
+        # Écriture atomique : le serveur peut lire l'archive pendant un import
+        for date, result in selected[data_type].items():
+            write_atomic(type_path / f"{date}.json", dumps_records(result["items"]))
+        
+        index[data_type] = sorted(set(index.get(data_type, [])) | set(selected[data_type]), reverse=True)
+    
+    dump_json(index_path, index)
+    
+    return index
+
+
+def backfill(
+    source_dir: Path,
+    base_path: Path,
+    forced_type: Optional[str] = None,
+    workers: Optional[int] = None,
+    artist_id: Optional[str] = None
+) -> Dict:
+    """
+    Importe un dossier d'archives dans l'archive de l'artiste (défaut : ARTIST_ID).
+    
+    Returns:
+        Dict {files, imported, errors, dates}
+    """
+    files = collect_archive_files(source_dir)
+    if not files:
+        print(f"[WARN] Aucun fichier HTML/JSON dans {source_dir}")
+        return {"files": 0, "imported": 0, "errors": [], "dates": {}}
+    
+    print(f"[BACKFILL] {len(files)} fichiers à parser ({workers or os.cpu_count()} processus)")
+    
+    tasks = [(str(path), forced_type) for path in files]
+    # chunksize : limite l'aller-retour IPC par fichier sur les gros lots
+    chunksize = max(1, len(tasks) // ((workers or os.cpu_count() or 1) * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(parse_archive_file, tasks, chunksize=chunksize))
+    
+    errors = [result for result in results if "error" in result]
+    parsed = [result for result in results if "error" not in result]
+    
+    for error in errors:
+        print(f"[WARN] {error['path']} ignoré : {error['error']}")
+    
+    selected = select_latest_per_date(parsed)
+    dates = write_archive(archive_dir(base_path, artist_id), selected)
+    
+    imported = sum(len(by_date) for by_date in selected.values())
+    print(f"[OK] {imported} snapshots importés "
+          f"(songs: {len(selected['songs'])}, albums: {len(selected['albums'])}), {len(errors)} erreurs")
+    
+    return {"files": len(files), "imported": imported, "errors": errors, "dates": dates}
+
+
+def main():
+    """Point d'entrée CLI."""
+    parser = argparse.ArgumentParser(description="Import en masse d'archives Kworb (HTML ou snapshots JSON)")
+    parser.add_argument("source", type=Path, help="Dossier contenant les archives")
+    parser.add_argument(
+        "--type",
+        choices=DATA_TYPES,
+        help="Forcer le type des fichiers (sinon déduit du nom de fichier / des IDs)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Nombre de processus (défaut : nombre de CPU)"
+    )
+    args = parser.parse_args()
+    
+    if not args.source.is_dir():
+        print(f"[ERROR] Dossier introuvable : {args.source}")
+        sys.exit(1)
+    
+    base_path = Path(__file__).parent.parent
+    result = backfill(args.source, base_path, args.type, args.workers)
+    sys.exit(1 if result["files"] and not result["imported"] else 0)
+
+
+if __name__ == "__main__":
+    main()
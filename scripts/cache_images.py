@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Étape optionnelle du pipeline (IMAGE_CACHE=1) : cache local des covers.
+- Télécharge une seule fois chaque cover distincte de l'index de covers (cover_url, 640 px)
+- Stocke les fichiers adressés par contenu dans data/cache/images/ (cf. image_store.py)
+- Génère des miniatures carrées 64/300 px avec Pillow ; sans Pillow, les variantes
+  64/300 px fournies par Spotify (cover_url_small / cover_url_medium) sont mises en cache
+- Republie data/images.json avec les chemins locaux /images/..., servis par
+  dashboard_server.py avec Cache-Control immutable (publication : cf. publish.py)
+"""
+
+import io
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+try:
+    import requests
+except ImportError:
+    requests = None
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+
+from json_io import dumps, load_json, write_atomic
+from cover_index import load_or_bootstrap
+from image_store import (
+    THUMBNAIL_SIZES, image_map_path, load_image_map, local_entry,
+    save_image_map, store_dir, store_image
+)
+from records import CoverRecord
+from publish import publish_data
+from resilience import get_resilience, is_host_failure
+from artists import current_artist_id, data_dir
+
+
+DEFAULT_WORKERS = 4            # Téléchargements simultanés (IMAGE_CACHE_WORKERS)
+TIMEOUT = (5, 15)              # (connexion, lecture) en secondes
+THUMBNAIL_QUALITY = 85
+EXTENSIONS = {"image/jpeg": "jpg", "image/png": "png", "image/webp": "webp"}
+
+
+def download_image(url: str) -> Tuple[bytes, str]:
+    """
+    Télécharge une image (disjoncteur par hôte, cf. resilience.py).
+    
+    Returns:
+        (contenu, extension)
+    """
+    if requests is None:
+        raise RuntimeError("requests requis pour telecharger les covers (pip install requests)")
+    
+    resilience = get_resilience()
+    host = urlparse(url).hostname
+    resilience.check(host)
+    try:
+        response = requests.get(url, timeout=TIMEOUT)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        if is_host_failure(e):
+            resilience.record_failure(host, e)
+        raise
+    resilience.record_success(host)
+    
+    content_type = response.headers.get("Content-Type", "").split(";")[0].strip()
+    return response.content, EXTENSIONS.get(content_type, "jpg")
+
+
+def make_thumbnails(payload: bytes, directory: Path, digest: str) -> List[str]:
+    """Miniatures carrées THUMBNAIL_SIZES (JPEG) nommées d'après l'empreinte de l'origine."""
+    names = []
+    with Image.open(io.BytesIO(payload)) as source:
+        source = source.convert("RGB")
+        for size in THUMBNAIL_SIZES:
+            if (directory / f"{digest}-{size}.jpg").exists():
+                names.append(f"{digest}-{size}.jpg")
+                continue
+            buffer = io.BytesIO()
+            ImageOps.fit(source, (size, size), Image.LANCZOS).save(buffer, "JPEG", quality=THUMBNAIL_QUALITY)
+            names.append(store_image(directory, buffer.getvalue(), "jpg", digest=digest, size=size))
+    return names
+
+
+def cache_cover(cover: CoverRecord, directory: Path) -> List[Optional[str]]:
+    """
+    Met en cache une cover et ses miniatures.
+    
+    Returns:
+        Noms [64 px, 300 px, origine] (None si une miniature n'a pas pu être produite)
+    """
+    payload, ext = download_image(cover.cover_url)
+    original = store_image(directory, payload, ext)
+    digest = original.split(".")[0]
+    
+    if Image is not None:
+        return [*make_thumbnails(payload, directory, digest), original]
+    
+    # Sans Pillow : miniatures fournies par Spotify
+    variants = []
+    for url in (cover.cover_url_small, cover.cover_url_medium):
+        if not url:
+            variants.append(None)
+            continue
+        try:
+            variant, variant_ext = download_image(url)
+            variants.append(store_image(directory, variant, variant_ext))
+        except Exception as e:
+            print(f"  WARNING Variante {url} non mise en cache: {e}")
+            variants.append(None)
+    return [*variants, original]
+
+
+def localize_manifest(manifest_path: Path, covers_by_id: Dict[str, CoverRecord], image_map: Dict) -> int:
+    """
+    Remplace dans data/images.json les URLs Spotify par les chemins locaux en cache.
+    
+    Returns:
+        Nombre d'items servis localement
+    """
+    try:
+        manifest = load_json(manifest_path)
+    except FileNotFoundError:
+        return 0
+    
+    localized = 0
+    for item_id in manifest.get("items", {}):
+        cover = covers_by_id.get(item_id)
+        entry = local_entry(image_map, cover.cover_url) if cover else None
+        if entry:
+            manifest["items"][item_id] = entry
+            localized += 1
+    
+    write_atomic(manifest_path, dumps(manifest))
+    return localized
+
+
+def cache_images(base_path: Path, artist_id: Optional[str] = None, workers: int = DEFAULT_WORKERS) -> Dict[str, int]:
+    """
+    Met en cache les covers d'un artiste puis republie son manifeste d'images.
+    
+    Returns:
+        Dict {covers, downloaded, failed, localized}
+    """
+    index = load_or_bootstrap(base_path, artist_id=artist_id)
+    covers_by_id = {**index["songs"], **index["albums"]}
+    
+    # Une seule entrée par cover distincte (plusieurs titres partagent la cover de leur album)
+    distinct: Dict[str, CoverRecord] = {}
+    for cover in covers_by_id.values():
+        if cover.cover_url:
+            distinct.setdefault(cover.cover_url, cover)
+    
+    map_path = image_map_path(base_path, artist_id)
+    image_map = load_image_map(map_path)
+    directory = store_dir(base_path)
+    
+    # À télécharger : covers absentes de la table ou dont un fichier a disparu
+    pending = [
+        cover for url, cover in distinct.items()
+        if not image_map.get(url) or not all((directory / name).exists() for name in image_map[url] if name)
+    ]
+    print(f"Cache images : {len(distinct)} covers distinctes, {len(pending)} a telecharger")
+    
+    def fetch(cover: CoverRecord) -> Tuple[str, Optional[List[Optional[str]]]]:
+        try:
+            return cover.cover_url, cache_cover(cover, directory)
+        except Exception as e:
+            print(f"  WARNING {cover.cover_url}: {e}")
+            return cover.cover_url, None
+    
+    failed = 0
+    if pending:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            for url, names in executor.map(fetch, pending):
+                if names:
+                    image_map[url] = names
+                else:
+                    failed += 1
+    
+    # Covers qui ne sont plus référencées : retirées de la table (fichiers conservés, partagés)
+    image_map = {url: names for url, names in image_map.items() if url in distinct}
+    save_image_map(map_path, image_map)
+    
+    artist_dir = data_dir(base_path, artist_id)
+    localized = localize_manifest(artist_dir / "images.json", covers_by_id, image_map)
+    publish_data(artist_dir)  # Nouvelle génération avec images.json (différée sous l'orchestrateur)
+    
+    return {
+        "covers": len(distinct),
+        "downloaded": len(pending) - failed,
+        "failed": failed,
+        "localized": localized
+    }
+
+
+def main():
+    """Point d'entrée principal (artiste courant, ARTIST_ID)."""
+    print("=" * 60)
+    print("Cache local des covers")
+    print("=" * 60)
+    
+    if requests is None:
+        print("WARNING requests absent : cache images ignore (pip install requests)")
+        return
+    if Image is None:
+        print("INFO Pillow absent : miniatures Spotify 64/300 px utilisees (pip install Pillow)")
+    
+    base_path = Path(__file__).parent.parent
+    stats = cache_images(
+        base_path,
+        current_artist_id(),
+        workers=int(os.getenv("IMAGE_CACHE_WORKERS", DEFAULT_WORKERS))
+    )
+    
+    print(f"OK {stats['downloaded']} covers mises en cache, {stats['failed']} echecs")
+    print(f"OK {stats['localized']} items servis localement (/images/)")
+    
+    if stats["failed"] and not stats["downloaded"] and not stats["localized"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
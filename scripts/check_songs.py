@@ -2,14 +2,14 @@
 Vérification des chansons après pipeline
 """
 
-import json
 from pathlib import Path
 
+from json_io import load_json
+
 data_dir = Path(__file__).parent.parent / "data"
 songs_file = data_dir / "songs.json"
 
-with open(songs_file, 'r', encoding='utf-8') as f:
-    songs = json.load(f)
+songs = load_json(songs_file)
 
 print(f"Nombre total de chansons: {len(songs)}")
 
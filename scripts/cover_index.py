@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Index persistant des covers (id → cover), indépendant des vues publiées.
+Écrit par enrich_covers.py, joint par generate_current_views.py :
+les covers ne transitent plus par data/songs.json / data/albums.json.
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from json_io import dump_json, load_json
+from records import CoverRecord, record_from_dict
+from artists import data_dir
+
+
+# Champs conservés pour chaque item (songs et albums)
+COVER_FIELDS = CoverRecord._fields
+
+DATA_TYPES = ("songs", "albums")
+
+
+def default_index_path(base_path: Path, artist_id: Optional[str] = None) -> Path:
+    """Chemin de l'index de covers d'un artiste (courant par défaut) : data[/<artist_id>]/cache/covers_index.json"""
+    return data_dir(base_path, artist_id) / "cache" / "covers_index.json"
+
+
+def views_state_path(base_path: Path, artist_id: Optional[str] = None) -> Path:
+    """État des dernières vues publiées (empreinte de l'index joint) : data[/<artist_id>]/cache/views_state.json"""
+    return data_dir(base_path, artist_id) / "cache" / "views_state.json"
+
+
+def index_fingerprint(index_path: Path) -> Optional[str]:
+    """Empreinte du contenu de l'index (écrit trié, donc stable), None s'il n'existe pas."""
+    try:
+        return hashlib.sha256(index_path.read_bytes()).hexdigest()[:16]
+    except FileNotFoundError:
+        return None
+
+
+def save_views_fingerprint(base_path: Path, artist_id: Optional[str], fingerprint: Optional[str]) -> None:
+    """Mémorise l'empreinte de l'index joint par les vues qui viennent d'être publiées."""
+    state_path = views_state_path(base_path, artist_id)
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    dump_json(state_path, {"cover_index": fingerprint})
+
+
+def views_outdated(base_path: Path, artist_id: Optional[str] = None) -> bool:
+    """
+    True si l'index de covers a changé depuis la dernière publication des vues
+    (covers résolues par enrich_covers.py) : vues, caps, images, index de recherche
+    et covers_revision sont à régénérer même si les snapshots sont inchangés.
+    """
+    current = index_fingerprint(default_index_path(base_path, artist_id))
+    if current is None:
+        return False
+    try:
+        published = load_json(views_state_path(base_path, artist_id)).get("cover_index")
+    except Exception:
+        published = None
+    return current != published
+
+
+def empty_index() -> Dict[str, Dict[str, CoverRecord]]:
+    """Index vide {songs: {}, albums: {}}."""
+    return {data_type: {} for data_type in DATA_TYPES}
+
+
+def load_cover_index(index_path: Path) -> Optional[Dict[str, Dict[str, CoverRecord]]]:
+    """
+    Charge l'index de covers.
+    Retourne None si le fichier n'existe pas encore (migration à prévoir).
+    """
+    if not index_path.exists():
+        return None
+    
+    try:
+        data = load_json(index_path)
+    except Exception as e:
+        print(f"WARNING Impossible de charger l'index de covers {index_path}: {e}")
+        return None
+    
+    index = empty_index()
+    for data_type in DATA_TYPES:
+        index[data_type].update(
+            (item_id, record_from_dict(CoverRecord, entry))
+            for item_id, entry in data.get(data_type, {}).items()
+        )
+    return index
+
+
+def save_cover_index(index_path: Path, index: Dict[str, Dict[str, CoverRecord]]) -> None:
+    """Sauvegarde atomique au format compact (toujours minifié, quel que soit JSON_PROFILE)."""
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    dump_json(
+        index_path,
+        {data_type: {item_id: entry._asdict() for item_id, entry in entries.items()}
+         for data_type, entries in index.items()},
+        profile="publish",
+        sort_keys=True
+    )
+
+
+def extract_cover(item: Dict) -> Optional[CoverRecord]:
+    """Extrait les champs cover d'un item enrichi (None si pas de cover)."""
+    if not item.get("cover_url"):
+        return None
+    return CoverRecord._make(item.get(field) for field in COVER_FIELDS)
+
+
+def update_cover_index(index: Dict[str, Dict[str, CoverRecord]], data_type: str, items: List[Dict]) -> int:
+    """
+    Reporte dans l'index les covers des items enrichis.
+    Les items sans cover conservent leur entrée précédente (échec API temporaire).
+    
+    Returns:
+        Nombre d'entrées ajoutées ou modifiées
+    """
+    entries = index.setdefault(data_type, {})
+    changed = 0
+    
+    for item in items:
+        item_id = item.get("id")
+        cover = extract_cover(item)
+        if not item_id or cover is None:
+            continue
+        if entries.get(item_id) != cover:
+            entries[item_id] = cover
+            changed += 1
+    
+    return changed
+
+
+def bootstrap_from_views(base_path: Path, artist_id: Optional[str] = None) -> Dict[str, Dict[str, CoverRecord]]:
+    """
+    Migration : construit l'index depuis les vues publiées existantes
+    (anciennes versions qui stockaient les covers uniquement dans songs.json/albums.json).
+    """
+    index = empty_index()
+    
+    for data_type in DATA_TYPES:
+        view_path = data_dir(base_path, artist_id) / f"{data_type}.json"
+        if not view_path.exists():
+            continue
+        try:
+            items = load_json(view_path)
+        except Exception as e:
+            print(f"WARNING Migration index covers impossible depuis {view_path.name}: {e}")
+            continue
+        update_cover_index(index, data_type, items)
+    
+    return index
+
+
+def load_or_bootstrap(
+    base_path: Path,
+    index_path: Optional[Path] = None,
+    artist_id: Optional[str] = None
+) -> Dict[str, Dict[str, CoverRecord]]:
+    """Charge l'index, ou le crée une fois depuis les vues existantes s'il est absent."""
+    index_path = index_path or default_index_path(base_path, artist_id)
+    index = load_cover_index(index_path)
+    
+    if index is None:
+        index = bootstrap_from_views(base_path, artist_id)
+        save_cover_index(index_path, index)
+        print(f"[Covers] Index créé depuis les vues existantes : "
+              f"{len(index['songs'])} songs, {len(index['albums'])} albums")
+    
+    return index
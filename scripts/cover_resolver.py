@@ -3,34 +3,83 @@ Résolveur de covers Spotify avec règles métier strictes
 Gère : Original vs Deluxe, Trilogy, Mixtapes, BO, Singles, Live, Feat
 """
 
+import hashlib
+import json
 import re
-from typing import Optional, Dict, List, Tuple
+import unicodedata
+from pathlib import Path
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Optional, Dict, List, Mapping, NamedTuple, Tuple
+from artists import DEFAULT_ARTIST_ID
+from json_io import dump_json, load_json
 from spotify_client import SpotifyClient
 
+if TYPE_CHECKING:
+    # Import réel circulaire : spotify_catalog importe title_index_key d'ici
+    from spotify_catalog import SpotifyCatalog
 
-class CoverResolver:
-    """Résout la cover appropriée selon les règles métier"""
-    
+
+def title_index_key(title: str) -> str:
+    """
+    Clé normalisée pour l'index des titres/albums
+    - Conserve le marqueur * ou ^ en tête (feat/compilation ≠ lead)
+    - Minuscules, accents retirés
+    - "Part N" ≡ "Pt. N"
+    - Ponctuation ignorée, espaces compactés
+    """
+    marker = title[:1] if title[:1] in "*^" else ""
+    text = unicodedata.normalize("NFKD", title[len(marker):])
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    text = re.sub(r'\bpart\b', 'pt', text)
+    text = re.sub(r'[^\w\s]', ' ', text)
+    return marker + " ".join(text.split())
+
+
+def pick_image(images: List[Dict], width: int) -> Optional[str]:
+    """URL de la plus petite image d'au moins `width` px (à défaut, la plus grande)."""
+    if not images:
+        return None
+    large_enough = [image for image in images if (image.get("width") or 0) >= width]
+    if large_enough:
+        return min(large_enough, key=lambda image: image["width"])["url"]
+    return max(images, key=lambda image: image.get("width") or 0)["url"]
+
+
+class CoverRules(NamedTuple):
+    """
+    Règles métier de résolution propres à un artiste
+    Vides par défaut : covers résolues par la seule recherche Spotify
+    """
+    album_blacklist: Tuple[str, ...] = ()                          # Jamais utilisés pour les chansons
+    albums_to_remove: Tuple[str, ...] = ()                         # Supprimés de l'affichage
+    trilogy_songs: Tuple[str, ...] = ()                            # Seuls titres à cover Trilogy
+    explicit_mappings: Mapping[str, str] = MappingProxyType({})    # Titre → album exact
+    artist_overrides: Mapping[str, str] = MappingProxyType({})     # Album → artiste à rechercher
+    direct_album_ids: Mapping[str, str] = MappingProxyType({})     # Album → ID Spotify direct
+
+
+# Règles de The Weeknd (artiste par défaut)
+THE_WEEKND_RULES = CoverRules(
     # Blacklist : ne jamais utiliser ces albums pour les chansons
-    ALBUM_BLACKLIST = ["the highlights"]
+    album_blacklist=("the highlights",),
     
     # Albums à supprimer complètement de l'affichage
-    ALBUMS_TO_REMOVE = ["Avatar", "Music"]
+    albums_to_remove=("Avatar", "Music"),
     
     # Trilogy allowlist : seules ces 3 chansons prennent la cover Trilogy
-    TRILOGY_SONGS = [
+    trilogy_songs=(
         "Twenty Eight",
         "Valerie", 
         "Till Dawn (Here Comes the Sun)"
-    ]
+    ),
     
     # Mapping explicite : titre → album exact
-    EXPLICIT_MAPPINGS = {
+    # Les variantes de casse/ponctuation sont couvertes par title_index_key
+    explicit_mappings={
         # Trilogy mixtapes originales
         "High For This": "House Of Balloons (Original)",
         "What You Need": "House Of Balloons (Original)",
         "House of Balloons / Glass Table Girls": "House Of Balloons (Original)",
-        "House Of Balloons / Glass Table Girls": "House Of Balloons (Original)",  # Variante majuscules
         "The Morning": "House Of Balloons (Original)",
         "Wicked Games": "House Of Balloons (Original)",
         "The Party & The After Party": "House Of Balloons (Original)",
@@ -40,13 +89,10 @@ class CoverResolver:
         
         "Lonely Star": "Thursday (Original)",
         "Life of the Party": "Thursday (Original)",
-        "Life Of The Party": "Thursday (Original)",  # Variante majuscules
         "Thursday": "Thursday (Original)",
         "The Zone": "Thursday (Original)",
         "The Birds Part 1": "Thursday (Original)",
-        "The Birds Pt. 1": "Thursday (Original)",  # Variante ponctuation
         "The Birds Part 2": "Thursday (Original)",
-        "The Birds Pt. 2": "Thursday (Original)",
         "Gone": "Thursday (Original)",
         "Rolling Stone": "Thursday (Original)",
         "Heaven or Las Vegas": "Thursday (Original)",
@@ -95,10 +141,10 @@ class CoverResolver:
         # Singles récents
         "Dancing In The Flames": "Dancing In The Flames",
         "Timeless": "Timeless",
-    }
+    },
     
     # Mappings nécessitant un artiste spécifique (pas The Weeknd)
-    ARTIST_OVERRIDES = {
+    artist_overrides={
         "My Everything (Deluxe)": "Ariana Grande",
         "Paradise Again": "Swedish House Mafia",
         "Moth To A Flame": "Swedish House Mafia",
@@ -107,17 +153,169 @@ class CoverResolver:
         "The Hunger Games: Catching Fire (Original Motion Picture Soundtrack)": "Various Artists",
         "Fifty Shades of Grey (Original Motion Picture Soundtrack)": "Various Artists",
         "Avatar: The Way of Water (Original Motion Picture Soundtrack)": "Various Artists",
-    }
+    },
     
     # IDs Spotify directs pour albums difficiles à trouver (OST, etc.)
-    DIRECT_ALBUM_IDS = {
+    direct_album_ids={
         "Avatar: The Way of Water (Original Motion Picture Soundtrack)": "4M2Mf4pmARKGVT9MLCe3HA",
         "The Hunger Games: Catching Fire (Original Motion Picture Soundtrack)": "38qFiy7n8yWm2Qm91vyx0j",
         "Fifty Shades of Grey (Original Motion Picture Soundtrack)": "4gnEi23PFBwHXT9rMqTsN5",
-    }
+    },
+)
+
+# Règles par artiste (ID Spotify du registre data/artists.json) ; autres artistes : CoverRules()
+COVER_RULES: Dict[str, CoverRules] = {
+    DEFAULT_ARTIST_ID: THE_WEEKND_RULES,
+}
+
+
+def rules_for_artist(artist_id: str) -> CoverRules:
+    """Règles de l'artiste, vides s'il n'en a pas"""
+    return COVER_RULES.get(artist_id, CoverRules())
+
+
+class CoverResolver:
+    """Résout la cover appropriée selon les règles métier"""
+    
+    # À incrémenter si la logique de résolution change (invalide le memo persistant)
+    RULES_VERSION = 2
+    
+    # Variantes de cover conservées : champ → largeur cible (px) parmi 640/300/64 de Spotify
+    COVER_SIZES = {"cover_url_medium": 300, "cover_url_small": 64}
     
-    def __init__(self, spotify_client: SpotifyClient):
+    def __init__(
+        self,
+        spotify_client: SpotifyClient,
+        memo_path: Optional[Path] = None,
+        catalog: Optional["SpotifyCatalog"] = None,
+        artist_name: str = "The Weeknd",
+        artist_id: str = DEFAULT_ARTIST_ID
+    ):
         self.client = spotify_client
+        
+        # Artiste des recherches Spotify et règles métier propres à cet artiste
+        self.artist_name = artist_name
+        self.rules = rules_for_artist(artist_id)
+        
+        # Mode catalogue : pistes résolues depuis la discographie locale
+        # (search_track seulement si le titre en est absent)
+        self.catalog = catalog
+        
+        # Index normalisés construits une seule fois (lookup O(1))
+        self._explicit_index: Dict[str, str] = {
+            title_index_key(title): album
+            for title, album in self.rules.explicit_mappings.items()
+        }
+        self._trilogy_index = frozenset(title_index_key(t) for t in self.rules.trilogy_songs)
+        self._remove_index = frozenset(title_index_key(a) for a in self.rules.albums_to_remove)
+        self._blacklist = tuple(title_index_key(a) for a in self.rules.album_blacklist)
+        
+        # Albums préchargés par lots (album_id → détails Spotify)
+        self._albums_by_id: Dict[str, Dict] = {}
+        
+        # Memo album → cover : chaque album cible n'est résolu qu'une fois par run
+        # Optionnellement persistant (memo_path), invalidé si les règles changent
+        self.rules_version = self._compute_rules_version()
+        self.memo_path = memo_path
+        self._album_memo: Dict[str, Optional[Dict]] = self._load_memo()
+    
+    def _compute_rules_version(self) -> str:
+        """Empreinte des tables de règles + RULES_VERSION"""
+        rules = {
+            "version": self.RULES_VERSION,
+            "explicit": dict(self.rules.explicit_mappings),
+            "overrides": dict(self.rules.artist_overrides),
+            "direct_ids": dict(self.rules.direct_album_ids),
+            "blacklist": list(self.rules.album_blacklist),
+            "trilogy": list(self.rules.trilogy_songs),
+        }
+        rules_str = json.dumps(rules, sort_keys=True)
+        return hashlib.sha256(rules_str.encode("utf-8")).hexdigest()[:12]
+    
+    def _load_memo(self) -> Dict[str, Optional[Dict]]:
+        """Charge le memo persistant s'il correspond à la version des règles"""
+        if not self.memo_path or not self.memo_path.exists():
+            return {}
+        
+        try:
+            data = load_json(self.memo_path)
+        except Exception as e:
+            print(f"WARNING Erreur chargement memo covers: {e}")
+            return {}
+        
+        if data.get("rules_version") != self.rules_version:
+            print("INFO Regles de resolution modifiees, memo covers invalide")
+            return {}
+        
+        # Memo antérieur : ignorer les entrées sans image qui auraient été persistées
+        return {name: cover for name, cover in data.get("albums", {}).items() if self._is_persistable(cover)}
+    
+    @staticmethod
+    def _is_persistable(cover: Optional[Dict]) -> bool:
+        """
+        Seules les covers complètes sont persistées : un album introuvable (None) ou
+        sans image peut n'être qu'un échec passager (quota, disjoncteur, catalogue
+        incomplet) et reste limité au run pour être retenté au suivant.
+        """
+        return bool(cover and cover.get("cover_url"))
+    
+    def save_memo(self):
+        """Sauvegarde le memo (résolutions réussies uniquement) si persistant"""
+        if not self.memo_path:
+            return
+        
+        albums = {name: cover for name, cover in self._album_memo.items() if self._is_persistable(cover)}
+        try:
+            self.memo_path.parent.mkdir(parents=True, exist_ok=True)
+            dump_json(self.memo_path, {"rules_version": self.rules_version, "albums": albums})
+        except Exception as e:
+            print(f"WARNING Erreur sauvegarde memo covers: {e}")
+    
+    def collect_album_ids(self, songs: List[Dict], albums: List[Dict]) -> List[str]:
+        """
+        Collecte les IDs d'albums nécessaires à un run d'enrichissement
+        - IDs directs (direct_album_ids) atteints via les mappings explicites
+        - spotify_album_id déjà connus des albums
+        """
+        album_ids = []
+        
+        for song in songs:
+            target_album = self._explicit_index.get(title_index_key(song.get("title", "")))
+            if target_album in self.rules.direct_album_ids:
+                album_ids.append(self.rules.direct_album_ids[target_album])
+        
+        for album in albums:
+            if album.get("spotify_album_id"):
+                album_ids.append(album["spotify_album_id"])
+        
+        return list(dict.fromkeys(album_ids))
+    
+    def pending_track_queries(self, songs: List[Dict]) -> List[str]:
+        """
+        Requêtes search_track qu'exigera get_best_cover_for_track
+        (titres hors mappings explicites et allowlist Trilogy)
+        """
+        queries = []
+        for song in songs:
+            title = song.get("title", "")
+            title_key = title_index_key(title)
+            if title_key in self._explicit_index or title_key in self._trilogy_index:
+                continue
+            queries.append(self.normalize_title(title))
+        return list(dict.fromkeys(queries))
+    
+    def prefetch_albums(self, album_ids: List[str]) -> int:
+        """
+        Précharge des albums par lots (albums?ids=) pour tout le run
+        Les résolutions suivantes sont servies depuis _albums_by_id
+        
+        Returns:
+            Nombre d'albums disponibles après préchargement
+        """
+        missing = [album_id for album_id in album_ids if album_id not in self._albums_by_id]
+        if missing:
+            self._albums_by_id.update(self.client.get_albums(missing))
+        return len(self._albums_by_id)
     
     def normalize_title(self, title: str) -> str:
         """
@@ -137,19 +335,19 @@ class CoverResolver:
     
     def is_blacklisted_album(self, album_name: str) -> bool:
         """Vérifie si l'album est dans la blacklist"""
-        album_lower = album_name.lower()
-        return any(blacklisted in album_lower for blacklisted in self.ALBUM_BLACKLIST)
+        album_key = title_index_key(album_name)
+        return any(blacklisted in album_key for blacklisted in self._blacklist)
     
     def should_remove_album(self, album_name: str) -> bool:
         """Vérifie si l'album doit être supprimé de l'affichage"""
-        return album_name in self.ALBUMS_TO_REMOVE
+        return title_index_key(album_name) in self._remove_index
     
-    def is_the_weeknd_lead(self, track: Dict) -> bool:
-        """Vérifie si The Weeknd est l'artiste principal (premier dans la liste)"""
+    def is_artist_lead(self, track: Dict) -> bool:
+        """Vérifie si l'artiste suivi est l'artiste principal (premier dans la liste)"""
         artists = track.get("artists", [])
         if not artists:
             return False
-        return "the weeknd" in artists[0].get("name", "").lower()
+        return self.artist_name.lower() in artists[0].get("name", "").lower()
     
     def get_best_cover_for_track(self, title: str, is_lead: bool = True) -> Optional[Dict]:
         """
@@ -161,23 +359,47 @@ class CoverResolver:
         # Normaliser le titre
         normalized_title = self.normalize_title(title)
         
+        title_key = title_index_key(title)
+        
         # Vérifier les mappings explicites d'abord
-        if title in self.EXPLICIT_MAPPINGS:
-            target_album = self.EXPLICIT_MAPPINGS[title]
+        target_album = self._explicit_index.get(title_key)
+        if target_album:
             return self._find_album_cover(target_album)
         
         # Cas spécial Trilogy : allowlist
-        if title in self.TRILOGY_SONGS:
+        if title_key in self._trilogy_index:
             return self._find_album_cover("Trilogy")
         
+        # Mode catalogue : lookup local, sans appel API
+        if self.catalog is not None:
+            catalog_tracks = self.catalog.find_tracks(normalized_title)
+            best_album = self._select_best_album(catalog_tracks, normalized_title, title, is_lead)
+            if best_album:
+                return self._extract_cover(best_album)
+        
         # Rechercher la piste sur Spotify
-        tracks = self.client.search_track(normalized_title)
+        tracks = self.client.search_track(normalized_title, self.artist_name)
         
         if not tracks:
             print(f"WARNING Aucun resultat pour '{title}'")
             return None
         
-        # Filtrer et scorer les résultats
+        best_album = self._select_best_album(tracks, normalized_title, title, is_lead)
+        
+        if not best_album:
+            print(f"WARNING Aucun candidat valide pour '{title}'")
+            return None
+        
+        return self._extract_cover(best_album)
+    
+    def _select_best_album(
+        self,
+        tracks: List[Dict],
+        normalized_title: str,
+        title: str,
+        is_lead: bool
+    ) -> Optional[Dict]:
+        """Filtre les pistes (titre, lead/feat, blacklist) et retourne l'album le mieux scoré"""
         candidates = []
         for track in tracks:
             # Vérifier correspondance titre
@@ -186,9 +408,9 @@ class CoverResolver:
                 continue
             
             # Vérifier rôle lead/feat
-            if is_lead and not self.is_the_weeknd_lead(track):
+            if is_lead and not self.is_artist_lead(track):
                 continue
-            if not is_lead and self.is_the_weeknd_lead(track):
+            if not is_lead and self.is_artist_lead(track):
                 continue
             
             album = track.get("album", {})
@@ -200,17 +422,14 @@ class CoverResolver:
             
             # Scorer
             score = self._score_album(album, title)
-            candidates.append((score, track, album))
+            candidates.append((score, album))
         
         if not candidates:
-            print(f"WARNING Aucun candidat valide pour '{title}'")
             return None
         
         # Trier par score décroissant
         candidates.sort(key=lambda x: x[0], reverse=True)
-        best_track, best_album = candidates[0][1], candidates[0][2]
-        
-        return self._extract_cover(best_album)
+        return candidates[0][1]
     
     def _titles_match(self, title1: str, title2: str) -> bool:
         """Compare deux titres (case-insensitive, accents ignorés)"""
@@ -273,16 +492,24 @@ class CoverResolver:
         return score
     
     def _find_album_cover(self, album_name: str) -> Optional[Dict]:
+        """Retourne la cover d'un album cible, résolue une seule fois par run (memo)"""
+        if album_name not in self._album_memo:
+            self._album_memo[album_name] = self._resolve_album_cover(album_name)
+        
+        cover = self._album_memo[album_name]
+        return dict(cover) if cover else None
+    
+    def _resolve_album_cover(self, album_name: str) -> Optional[Dict]:
         """Recherche un album spécifique par nom et retourne sa cover"""
         # Si un ID direct existe, l'utiliser directement
-        if album_name in self.DIRECT_ALBUM_IDS:
-            album_id = self.DIRECT_ALBUM_IDS[album_name]
-            album_data = self.client.get_album(album_id)
+        if album_name in self.rules.direct_album_ids:
+            album_id = self.rules.direct_album_ids[album_name]
+            album_data = self._albums_by_id.get(album_id) or self.client.get_album(album_id)
             if album_data:
                 return self._extract_cover(album_data)
         
         # Sinon, chercher par nom
-        artist = self.ARTIST_OVERRIDES.get(album_name, "The Weeknd")
+        artist = self.rules.artist_overrides.get(album_name, self.artist_name)
         albums = self.client.search_album(album_name, artist)
         
         # Si on cherche un album sans "Live" dans le nom, filtrer les lives
@@ -303,20 +530,26 @@ class CoverResolver:
         return None
     
     def _extract_cover(self, album: Dict) -> Dict:
-        """Extrait les infos cover d'un album"""
+        """Extrait les infos cover d'un album (plein format + variantes 300/64 px)"""
         images = album.get("images", [])
         cover_url = images[0]["url"] if images else None
         
-        return {
+        cover = {
             "cover_url": cover_url,
             "album_id": album.get("id"),
             "album_name": album.get("name")
         }
+        for field, width in self.COVER_SIZES.items():
+            cover[field] = pick_image(images, width)
+        return cover
     
-    def get_cover_for_album(self, album_name: str) -> Optional[Dict]:
+    def get_cover_for_album(self, album_name: str, album_id: Optional[str] = None) -> Optional[Dict]:
         """
         Résout la cover pour un album (page Albums)
         Différencie After Hours vs After Hours (Deluxe)
+        
+        Si album_id (résolution précédente) a été préchargé et que son nom
+        correspond toujours, la recherche Spotify est évitée.
         """
         # Vérifier si l'album doit être supprimé
         if self.should_remove_album(album_name):
@@ -325,8 +558,12 @@ class CoverResolver:
         # Normaliser le nom (retirer ^)
         normalized_name = self.normalize_title(album_name)
         
+        known_album = self._albums_by_id.get(album_id) if album_id else None
+        if known_album and known_album.get("name", "").lower() == normalized_name.lower():
+            return self._extract_cover(known_album)
+        
         # Rechercher l'album exact
-        albums = self.client.search_album(normalized_name)
+        albums = self.client.search_album(normalized_name, self.artist_name)
         
         # Chercher correspondance exacte
         for album in albums:
@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+Serveur HTTP du dashboard : fichiers statiques (comme python -m http.server)
++ API JSON paginée et triée côté serveur.
+
+Endpoints :
+- GET /api/songs  ?sort=<clé>&order=asc|desc&offset=0&limit=50&q=&role=lead|feat&max_days=&artist=
+- GET /api/albums ?sort=<clé>&order=asc|desc&offset=0&limit=50&q=&max_days=&artist=
+- GET /api/bundle ?artist= : songs + albums + meta en une réponse (publish.py),
+  ETag fort = révision du bundle, 304 si If-None-Match correspond
+- GET /images/<sha256>[-<taille>].<ext> : covers en cache local (cache_images.py), cache immuable
+- GET /data[/<artist_id>]/versions/<nom>.<empreinte>.json : versions publiées (publish.py), cache immuable
+- GET /api/archive ?artist= : dates archivées par type (backfill_history.py)
+- GET /api/archive/<songs|albums>/<YYYY-MM-DD> ?artist= : snapshot archivé
+
+Clés de tri = colonnes de table-sort.js : rank, title, streams_total, streams_daily,
+variation, days_to_next_cap, next_cap (valeurs manquantes toujours en dernier).
+
+Les ordres de tri sont précalculés une fois par vue publiée (rechargés quand
+songs.json / albums.json changent, soit une fois par cycle du pipeline).
+
+Données servies depuis la génération courante (lien data[/<artist_id>]/current,
+cf. publish.py) : /data/songs.json, /api/* et /api/bundle ne montrent jamais
+une génération non validée ni un mélange de deux cycles.
+"""
+
+import argparse
+import re
+import threading
+import unicodedata
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from json_io import dumps, load_json
+from artists import current_artist_id, data_dir, load_artists
+from backfill_history import archive_snapshot_path, load_archive_index
+from generate_current_views import search_key
+from image_store import CONTENT_TYPES, IMAGE_NAME_PATTERN, IMAGES_URL_PREFIX, store_dir
+from publish import (
+    BUNDLE_NAME, PUBLISHED_FILES, VERSIONS_DIR, VERSIONED_NAME_PATTERN, published_dir, read_bundle
+)
+
+
+DEFAULT_PORT = 8000
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"  # Fichiers adressés par contenu
+VERSIONED_PATH_PATTERN = re.compile(rf"^/data/(?:[A-Za-z0-9]+/)?{VERSIONS_DIR}/([^/]+)$")
+PUBLISHED_PATH_PATTERN = re.compile(rf"^/data/(?:([A-Za-z0-9]+)/)?({'|'.join((*PUBLISHED_FILES, 'bundle'))})\.json$")
+DATA_TYPES = ("songs", "albums")
+
+
+def title_sort_key(title: str) -> Tuple:
+    """
+    Tri des titres comme table-sort.js (Intl.Collator fr, sensitivity base, numeric) :
+    marqueur * / ^ ignoré, casse et accents ignorés, nombres comparés numériquement.
+    """
+    text = re.sub(r"^[\*\^]\s*", "", title or "").strip()
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c)).casefold()
+    return tuple(int(part) if part.isdigit() else part for part in re.split(r"(\d+)", text))
+
+
+def _number(value) -> Optional[float]:
+    """Valeur numérique ou None ("N.D.", null)."""
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+# Clé de tri → extraction de la valeur (None = manquante, triée en dernier)
+SORT_KEYS: Dict[str, Callable[[Dict], object]] = {
+    "rank": lambda item: _number(item.get("rank")),
+    "title": lambda item: title_sort_key(item.get("title", "")),
+    "streams_total": lambda item: _number(item.get("streams_total")),
+    "streams_daily": lambda item: _number(item.get("streams_daily")),
+    "variation": lambda item: _number(item.get("variation_pct")),
+    "days_to_next_cap": lambda item: _number(item.get("days_to_next_cap")),
+    "next_cap": lambda item: _number(item.get("next_cap_value"))
+}
+DEFAULT_SORT = ("streams_total", "desc")  # Tri par défaut de table-sort.js
+
+
+class ViewIndex:
+    """
+    Vue publiée en mémoire + ordres de tri précalculés.
+    Pour chaque clé : positions triées (asc) des valeurs présentes, puis positions manquantes.
+    """
+    
+    def __init__(self, items: List[Dict], revision: Optional[str] = None):
+        self.items = items
+        self.revision = revision
+        # Titre et album complets (featuring, parenthèses) : même clé que search_index.json
+        self.search_keys = [
+            f"{search_key(item.get('title', ''))} {search_key(item.get('album_name') or item.get('album') or '')}"
+            for item in items
+        ]
+        self.orders: Dict[str, Tuple[List[int], List[int]]] = {}
+        
+        for sort_key, extract in SORT_KEYS.items():
+            present, missing = [], []
+            values = [extract(item) for item in items]
+            for position, value in enumerate(values):
+                (missing if value is None else present).append(position)
+            # sort stable : à valeur égale, ordre de publication (rang)
+            present.sort(key=values.__getitem__)
+            self.orders[sort_key] = (present, missing)
+    
+    def ordered_positions(self, sort_key: str, order: str):
+        present, missing = self.orders[sort_key]
+        yield from (reversed(present) if order == "desc" else present)
+        yield from missing
+    
+    def query(
+        self,
+        sort_key: str = DEFAULT_SORT[0],
+        order: str = DEFAULT_SORT[1],
+        offset: int = 0,
+        limit: int = DEFAULT_PAGE_SIZE,
+        q: Optional[str] = None,
+        role: Optional[str] = None,
+        max_days: Optional[float] = None
+    ) -> Dict:
+        """Fenêtre [offset, offset+limit) des items filtrés, dans l'ordre demandé."""
+        needle = search_key(q) if q else ""
+        
+        def keep(position: int) -> bool:
+            item = self.items[position]
+            if needle and needle not in self.search_keys[position]:
+                return False
+            if role and item.get("role") != role:
+                return False
+            if max_days is not None:
+                days = _number(item.get("days_to_next_cap"))
+                if days is None or days > max_days:
+                    return False
+            return True
+        
+        positions = self.ordered_positions(sort_key, order)
+        if needle or role or max_days is not None:
+            matched = [position for position in positions if keep(position)]
+        else:
+            matched = list(positions)
+        
+        return {
+            "items": [self.items[position] for position in matched[offset:offset + limit]],
+            "total": len(matched),
+            "offset": offset,
+            "limit": limit,
+            "sort": sort_key,
+            "order": order,
+            "revision": self.revision
+        }
+
+
+class ViewStore:
+    """Index des vues par (artiste, type), reconstruits quand le fichier publié change."""
+    
+    def __init__(self, base_path: Path):
+        self.base_path = base_path
+        self._indexes: Dict[Tuple[str, str], Tuple[Tuple[str, int, int], ViewIndex]] = {}
+        self._bundles: Dict[str, Tuple[Tuple[str, int, int], Tuple[str, bytes]]] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, artist_id: str, data_type: str) -> ViewIndex:
+        artist_dir = published_dir(data_dir(self.base_path, artist_id))
+        view_path = artist_dir / f"{data_type}.json"
+        stat = view_path.stat()  # FileNotFoundError → 404
+        signature = (str(view_path), stat.st_mtime_ns, stat.st_size)
+        
+        with self._lock:
+            cached = self._indexes.get((artist_id, data_type))
+            if cached and cached[0] == signature:
+                return cached[1]
+        
+        # Construction hors verrou : les autres vues restent servies pendant ce temps
+        try:
+            revision = load_json(artist_dir / "meta.json").get("generated_at")
+        except Exception:
+            revision = None
+        index = ViewIndex(load_json(view_path), revision)
+        
+        with self._lock:
+            self._indexes[(artist_id, data_type)] = (signature, index)
+        return index
+    
+    def get_bundle(self, artist_id: str) -> Tuple[str, bytes]:
+        """(révision, contenu) du bundle publié, relu seulement quand bundle.json change."""
+        artist_dir = published_dir(data_dir(self.base_path, artist_id))
+        stat = (artist_dir / BUNDLE_NAME).stat()  # FileNotFoundError → 404
+        signature = (str(artist_dir), stat.st_mtime_ns, stat.st_size)
+        
+        with self._lock:
+            cached = self._bundles.get(artist_id)
+            if cached and cached[0] == signature:
+                return cached[1]
+        
+        bundle = read_bundle(artist_dir)
+        with self._lock:
+            self._bundles[artist_id] = (signature, bundle)
+        return bundle
+
+
+class QueryError(ValueError):
+    """Paramètre de requête invalide (réponse 400)."""
+
+
+def parse_query_params(params: Dict[str, List[str]], data_type: str) -> Dict:
+    """Valide les paramètres de /api/<type> et les convertit pour ViewIndex.query."""
+    def single(name: str, default: Optional[str] = None) -> Optional[str]:
+        values = params.get(name)
+        return values[0] if values else default
+    
+    sort_key = single("sort", DEFAULT_SORT[0])
+    if sort_key not in SORT_KEYS:
+        raise QueryError(f"sort inconnu : {sort_key} (valeurs : {', '.join(SORT_KEYS)})")
+    
+    order = single("order", DEFAULT_SORT[1])
+    if order not in ("asc", "desc"):
+        raise QueryError("order doit valoir asc ou desc")
+    
+    try:
+        offset = max(0, int(single("offset", "0")))
+        limit = min(MAX_PAGE_SIZE, max(1, int(single("limit", str(DEFAULT_PAGE_SIZE)))))
+        max_days = float(single("max_days")) if single("max_days") else None
+    except ValueError:
+        raise QueryError("offset, limit et max_days doivent être numériques")
+    
+    role = single("role")
+    if role and (data_type != "songs" or role not in ("lead", "feat")):
+        raise QueryError("role (lead|feat) n'existe que pour songs")
+    
+    return {
+        "sort_key": sort_key,
+        "order": order,
+        "offset": offset,
+        "limit": limit,
+        "q": single("q"),
+        "role": role,
+        "max_days": max_days
+    }
+
+
+class DashboardHandler(SimpleHTTPRequestHandler):
+    """Fichiers statiques + /api/songs, /api/albums, /api/bundle et /api/archive."""
+    
+    store: ViewStore = None
+    
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path.startswith("/api/"):
+            self.handle_api(url)
+        elif url.path.startswith(IMAGES_URL_PREFIX):
+            self.handle_image(url.path[len(IMAGES_URL_PREFIX):])
+        elif VERSIONED_PATH_PATTERN.match(url.path):
+            self.handle_version(url.path)
+        else:
+            super().do_GET()
+    
+    def translate_path(self, path: str) -> str:
+        """Fichiers publiés de data/ : lus dans la génération courante."""
+        match = PUBLISHED_PATH_PATTERN.match(urlparse(path).path)
+        if match:
+            artist_dir = self.store.base_path / "data" / (match.group(1) or "")
+            return str(published_dir(artist_dir) / f"{match.group(2)}.json")
+        return super().translate_path(path)
+    
+    def handle_api(self, url):
+        data_type, _, archive_path = url.path[len("/api/"):].strip("/").partition("/")
+        if data_type not in (*DATA_TYPES, "bundle", "archive") or (archive_path and data_type != "archive"):
+            return self.send_json(404, {"error": f"endpoint inconnu : {url.path}"})
+        
+        params = parse_qs(url.query)
+        artist_id = params.get("artist", [current_artist_id()])[0]
+        known = {artist.id for artist in load_artists(self.store.base_path, include_disabled=True)}
+        if artist_id not in known and artist_id != current_artist_id():
+            return self.send_json(404, {"error": f"artiste inconnu : {artist_id}"})
+        
+        if data_type == "bundle":
+            return self.handle_bundle(artist_id)
+        if data_type == "archive":
+            return self.handle_archive(artist_id, archive_path)
+        
+        try:
+            query = parse_query_params(params, data_type)
+            index = self.store.get(artist_id, data_type)
+        except QueryError as e:
+            return self.send_json(400, {"error": str(e)})
+        except FileNotFoundError:
+            return self.send_json(404, {"error": f"{data_type}.json pas encore publié"})
+        
+        self.send_json(200, index.query(**query))
+    
+    def handle_bundle(self, artist_id: str):
+        """Bundle publié : revalidation par ETag (304 sans corps tant que la révision ne change pas)."""
+        try:
+            revision, payload = self.store.get_bundle(artist_id)
+        except FileNotFoundError:
+            return self.send_json(404, {"error": "bundle.json pas encore publié"})
+        
+        etag = f'"{revision}"'
+        if etag in [tag.strip() for tag in (self.headers.get("If-None-Match") or "").split(",")]:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            return
+        
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(payload)
+    
+    def handle_archive(self, artist_id: str, archive_path: str):
+        """Index de l'archive, ou snapshot <type>/<date> tel qu'écrit par backfill_history.py."""
+        if not archive_path:
+            return self.send_json(200, load_archive_index(self.store.base_path, artist_id))
+        
+        archive_type, _, date = archive_path.partition("/")
+        path = archive_snapshot_path(self.store.base_path, archive_type, date, artist_id)
+        if path is None:
+            return self.send_json(404, {"error": f"snapshot archivé inconnu : {archive_path}"})
+        
+        payload = path.read_bytes()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(payload)
+    
+    def handle_image(self, name: str):
+        """Image du stockage local : le nom est l'empreinte du contenu, il ne change jamais."""
+        path = store_dir(self.store.base_path) / name
+        if not IMAGE_NAME_PATTERN.match(name) or not path.is_file():
+            return self.send_error(404, "Image inconnue")
+        
+        self.send_immutable(path, CONTENT_TYPES[name.rsplit(".", 1)[1]], name.split(".")[0])
+    
+    def handle_version(self, url_path: str):
+        """Version publiée (current.json) : nom dérivé du contenu, jamais réécrite."""
+        name = VERSIONED_PATH_PATTERN.match(url_path).group(1)
+        path = self.store.base_path / url_path.lstrip("/")
+        if not VERSIONED_NAME_PATTERN.match(name) or not path.is_file():
+            return self.send_error(404, "Version inconnue ou expirée")
+        
+        self.send_immutable(path, "application/json; charset=utf-8", name.split(".")[1])
+    
+    def send_immutable(self, path: Path, content_type: str, etag: str):
+        payload = path.read_bytes()
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("Cache-Control", IMMUTABLE_CACHE_CONTROL)
+        self.send_header("ETag", f'"{etag}"')
+        self.end_headers()
+        self.wfile.write(payload)
+    
+    def send_json(self, status: int, payload: Dict):
+        body = dumps(payload)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def make_server(base_path: Path, port: int = DEFAULT_PORT, host: str = "") -> ThreadingHTTPServer:
+    """Serveur prêt à l'emploi (racine statique = racine du projet, comme http.server)."""
+    handler = partial(DashboardHandler, directory=str(base_path))
+    DashboardHandler.store = ViewStore(base_path)
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    """Point d'entrée CLI."""
+    parser = argparse.ArgumentParser(description="Serveur HTTP du dashboard (statique + API)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port d'écoute (défaut : 8000)")
+    parser.add_argument("--bind", default="", help="Adresse d'écoute (défaut : toutes)")
+    args = parser.parse_args()
+    
+    base_path = Path(__file__).parent.parent
+    server = make_server(base_path, args.port, args.bind)
+    print(f"Serving HTTP on port {args.port} (API : /api/songs, /api/albums, /api/bundle, /api/archive) ...")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
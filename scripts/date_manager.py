@@ -10,13 +10,16 @@ Règle métier critique :
 Source de vérité unique : meta.json.kworb_last_update_utc (UTC)
 """
 
-import json
+import hashlib
 import shutil
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from typing import Optional, Tuple, Dict
 import re
 
+from json_io import dump_json, dumps_records, load_json, write_atomic
+from artists import data_dir
+
 
 def parse_kworb_timestamp(timestamp_str: str) -> Optional[datetime]:
     """
@@ -172,121 +175,167 @@ def should_rotate(meta: Dict, new_spotify_data_date: str) -> bool:
     return new_spotify_data_date > current_latest
 
 
+def list_snapshot_dates(history_path: Path, cached_dates: Optional[list] = None) -> list:
+    """
+    Liste les dates de snapshots disponibles (ordre décroissant).
+    
+    Utilise le listing mis en cache dans meta.json s'il est toujours valide
+    (chaque fichier existe encore), sinon rescanne le dossier.
+    """
+    if cached_dates and all((history_path / f"{date}.json").exists() for date in cached_dates):
+        return sorted(cached_dates, reverse=True)
+    
+    dates = []
+    if history_path.exists():
+        for file in history_path.glob("*.json"):
+            if re.match(r'^\d{4}-\d{2}-\d{2}$', file.stem):
+                dates.append(file.stem)
+    return sorted(dates, reverse=True)
+
+
+def snapshot_state_path(artist_dir: Path) -> Path:
+    """État des snapshots d'un artiste (hash + listing) : data[/<artist_id>]/cache/snapshot_state.json"""
+    return artist_dir / "cache" / "snapshot_state.json"
+
+
+def load_snapshot_state(artist_dir: Path) -> Dict:
+    """Hash et listing des snapshots par type ({hashes: {type: {date: sha256}}, files: {type: [dates]}})."""
+    state = {"hashes": {}, "files": {}}
+    try:
+        state.update(load_json(snapshot_state_path(artist_dir)))
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"   [WARN] État des snapshots illisible ({e}), rescan")
+    return state
+
+
 def rotate_snapshots_atomic(
     base_path: Path,
     data_type: str,
     new_date: str,
     current_data: list
-) -> bool:
+) -> Dict:
     """
     Effectue une rotation atomique et idempotente J→J-1→J-2 pour songs ou albums.
     
     Étapes :
     1. Vérifier si rotation nécessaire (nouveau jour)
     2. Si oui :
-       - Renommer ancien J-1 → J-2 (supprime J-2 si existe)
-       - Renommer ancien J → J-1
+       - Conserver J et J-1 existants (ils deviennent J-1 et J-2)
        - Créer nouveau J avec current_data
     3. Sinon :
-       - Réécrire seulement le fichier J actuel (idempotence)
+       - Réécrire le fichier J actuel seulement si son contenu a changé
+         (hash SHA-256 comparé à l'état des snapshots)
+    4. Purger au-delà de 3 snapshots
+    
+    Le hash et le listing des snapshots sont mis en cache dans cache/snapshot_state.json
+    (pas dans meta.json, publié au Website) pour éviter les re-scans.
     
     Args:
-        base_path: Racine du projet
+        base_path: Racine du projet (snapshots de l'artiste courant, cf. artists.data_dir)
         data_type: "songs" ou "albums"
         new_date: Date du nouveau snapshot (YYYY-MM-DD)
-        current_data: Données à écrire dans le snapshot J
+        current_data: Données à écrire dans le snapshot J (dicts ou enregistrements records.py)
     
     Returns:
-        bool: True si succès
+        Dict: {success, changed, rotated, available_dates}
     """
-    history_path = base_path / "data" / "history" / data_type
+    artist_dir = data_dir(base_path)
+    history_path = artist_dir / "history" / data_type
     history_path.mkdir(parents=True, exist_ok=True)
     
     # Charger meta.json pour connaître la latest_date actuelle
-    meta_path = base_path / "data" / "meta.json"
+    meta_path = artist_dir / "meta.json"
     if meta_path.exists():
-        with open(meta_path, "r", encoding="utf-8") as f:
-            meta = json.load(f)
+        meta = load_json(meta_path)
     else:
         meta = {"history": {}}
     
+    history_meta = meta.setdefault("history", {})
+    state = load_snapshot_state(artist_dir)
+    snapshot_hashes = state["hashes"]
+    snapshot_files = state["files"]
+    
+    snapshot_dates = list_snapshot_dates(history_path, snapshot_files.get(data_type))
+    
+    payload = dumps_records(current_data)
+    payload_hash = hashlib.sha256(payload).hexdigest()
+    new_j_path = history_path / f"{new_date}.json"
+    
     # Déterminer si rotation nécessaire
     needs_rotation = should_rotate(meta, new_date)
+    changed = True
     
     if needs_rotation:
         print(f"[ROTATE] {data_type.upper()} : Nouveau jour détecté → {new_date}")
         
         # Récupérer l'ancienne latest_date
-        old_latest = meta.get("history", {}).get("latest_date")
+        old_latest = history_meta.get("latest_date")
         
         if old_latest and old_latest != new_date:
-            # Étape 1 : Chercher J-1 actuel (s'il existe)
-            # On liste tous les fichiers et on prend le 2ème plus récent
-            snapshots = sorted(history_path.glob("*.json"), reverse=True)
-            
-            if len(snapshots) >= 2:
-                # snapshots[0] = J actuel
-                # snapshots[1] = J-1 actuel → doit devenir J-2
-                j_minus_1 = snapshots[1]
-                
-                # Supprimer l'ancien J-2 s'il existe (3ème fichier)
-                if len(snapshots) >= 3:
-                    old_j_minus_2 = snapshots[2]
-                    try:
-                        old_j_minus_2.unlink()
-                        print(f"   [DEL] J-2 purgé : {old_j_minus_2.name}")
-                    except Exception as e:
-                        print(f"   [WARN] Impossible de supprimer J-2: {e}")
-                
-                # Renommer J-1 → J-2
-                # Calculer le nouveau nom (date de J-1 - 1 jour)
-                try:
-                    j_minus_1_date = datetime.strptime(j_minus_1.stem, "%Y-%m-%d").date()
-                    # J-2 n'est pas forcément J-1 - 1 jour, on garde juste l'ancien J-1
-                    # On ne le renomme pas, on le garde avec son nom actuel
-                    # En fait, on veut juste garder les 3 plus récents
-                    # Donc on ne fait rien pour J-1, il reste tel quel
-                except ValueError:
-                    pass
-            
-            # Étape 2 : Renommer J actuel → J-1
-            old_j_path = history_path / f"{old_latest}.json"
-            if old_j_path.exists():
-                # On le laisse en place avec son nom (il deviendra automatiquement J-1)
+            # L'ancien J reste en place avec son nom et devient J-1 ;
+            # l'ancien J-1 devient J-2, le reste est purgé plus bas
+            if old_latest in snapshot_dates:
                 print(f"   [KEEP] {old_latest}.json devient J-1")
         
-        # Étape 3 : Créer nouveau J
-        new_j_path = history_path / f"{new_date}.json"
-        with open(new_j_path, "w", encoding="utf-8") as f:
-            json.dump(current_data, f, indent=2, ensure_ascii=False)
+        # Créer nouveau J
+        write_atomic(new_j_path, payload)
         print(f"   [CREATE] Nouveau J : {new_date}.json")
-        
+    
+    elif snapshot_hashes.get(data_type, {}).get(new_date) == payload_hash and new_j_path.exists():
+        changed = False
+        print(f"[SKIP] {data_type.upper()} : Même jour, données inchangées ({new_date}.json)")
+    
     else:
         print(f"[UPDATE] {data_type.upper()} : Même jour, réécriture J = {new_date}.json")
         
         # Réécrire le fichier J actuel (idempotence)
-        current_j_path = history_path / f"{new_date}.json"
-        with open(current_j_path, "w", encoding="utf-8") as f:
-            json.dump(current_data, f, indent=2, ensure_ascii=False)
+        write_atomic(new_j_path, payload)
+    
+    if new_date not in snapshot_dates:
+        snapshot_dates = sorted(snapshot_dates + [new_date], reverse=True)
     
     # Maintenir uniquement les 3 fichiers les plus récents (J, J-1, J-2)
-    snapshots = sorted(history_path.glob("*.json"), reverse=True)
-    if len(snapshots) > 3:
-        for old_snapshot in snapshots[3:]:
+    if len(snapshot_dates) > 3:
+        for old_date in snapshot_dates[3:]:
             try:
-                old_snapshot.unlink()
-                print(f"   [PURGE] {old_snapshot.name}")
+                (history_path / f"{old_date}.json").unlink()
+                print(f"   [PURGE] {old_date}.json")
+            except FileNotFoundError:
+                pass
             except Exception as e:
-                print(f"   [WARN] Impossible de purger {old_snapshot.name}: {e}")
-    
-    return True
+                print(f"   [WARN] Impossible de purger {old_date}.json: {e}")
+        snapshot_dates = snapshot_dates[:3]
+    
+    # Mettre en cache hash + listing (cache/, hors meta.json)
+    if changed or data_type not in snapshot_files:
+        snapshot_hashes[data_type] = {
+            date: snapshot_hashes.get(data_type, {}).get(date)
+            for date in snapshot_dates
+            if date != new_date
+        }
+        snapshot_hashes[data_type][new_date] = payload_hash
+        snapshot_files[data_type] = snapshot_dates
+        
+        state_path = snapshot_state_path(artist_dir)
+        state_path.parent.mkdir(parents=True, exist_ok=True)
+        dump_json(state_path, state)
+    
+    return {
+        "success": True,
+        "changed": changed,
+        "rotated": needs_rotation,
+        "available_dates": snapshot_dates
+    }
 
 
 def update_meta_with_rotation(
     meta_path: Path,
     kworb_last_update_utc: datetime,
     spotify_data_date: str,
-    data_type: str = "songs"
+    data_type: str = "songs",
+    snapshot_changed: Optional[bool] = None
 ) -> Dict:
     """
     Met à jour meta.json avec les nouvelles dates et history.
@@ -296,30 +345,23 @@ def update_meta_with_rotation(
         kworb_last_update_utc: Timestamp Kworb en UTC
         spotify_data_date: Date Spotify calculée (YYYY-MM-DD)
         data_type: "songs" ou "albums"
+        snapshot_changed: Résultat de rotate_snapshots_atomic, publié dans
+            meta.snapshot_status pour que l'orchestrateur court-circuite les étapes suivantes
     
     Returns:
         Dict: meta.json mis à jour
     """
     # Charger meta.json existant
     if meta_path.exists():
-        with open(meta_path, "r", encoding="utf-8") as f:
-            meta = json.load(f)
+        meta = load_json(meta_path)
     else:
         meta = {"history": {}}
     
-    # Scanner les snapshots disponibles
+    # Snapshots disponibles (listing mis en cache par rotate_snapshots_atomic)
     base_path = meta_path.parent  # data/
     history_path = base_path / "history" / data_type
-    
-    available_dates = []
-    if history_path.exists():
-        for file in history_path.glob("*.json"):
-            date = file.stem
-            if re.match(r'^\d{4}-\d{2}-\d{2}$', date):
-                available_dates.append(date)
-    
-    # Trier par ordre décroissant
-    available_dates.sort(reverse=True)
+    cached_dates = load_snapshot_state(base_path)["files"].get(data_type)
+    available_dates = list_snapshot_dates(history_path, cached_dates)
     
     # Mettre à jour meta
     meta["kworb_last_update_utc"] = kworb_last_update_utc.isoformat()
@@ -330,6 +372,10 @@ def update_meta_with_rotation(
     if "history" not in meta:
         meta["history"] = {}
     
+    # Anciennes clés de cache : désormais dans cache/snapshot_state.json
+    meta["history"].pop("snapshot_hashes", None)
+    meta["history"].pop("snapshot_files", None)
+    
     if data_type == "songs":
         meta["history"]["available_dates"] = available_dates
         meta["history"]["latest_date"] = available_dates[0] if available_dates else spotify_data_date
@@ -337,9 +383,11 @@ def update_meta_with_rotation(
         meta["history"]["available_dates_albums"] = available_dates
         # Ne pas écraser latest_date qui est géré par songs
     
+    if snapshot_changed is not None:
+        meta.setdefault("snapshot_status", {})[data_type] = "changed" if snapshot_changed else "unchanged"
+    
     # Sauvegarder
-    with open(meta_path, "w", encoding="utf-8") as f:
-        json.dump(meta, f, indent=2, ensure_ascii=False)
+    dump_json(meta_path, meta)
     
     return meta
 
@@ -4,16 +4,30 @@ Lit songs.json et albums.json, enrichit avec cover_url via API Spotify
 """
 
 import os
-import json
 import sys
+import time
+import asyncio
 from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
 from dotenv import load_dotenv
 
 # Ajouter le dossier scripts au path
 sys.path.insert(0, str(Path(__file__).parent))
 
+from json_io import dump_json, load_json
 from spotify_client import SpotifyClient
+from async_spotify_client import AsyncSpotifyClient
 from cover_resolver import CoverResolver
+from spotify_catalog import SpotifyCatalog
+from cover_index import default_index_path, load_or_bootstrap, save_cover_index, update_cover_index
+from artists import DEFAULT_ARTIST_ID, current_artist, data_dir as artist_data_dir
+
+# Budget de temps : auto_refresh tue le script à 300 s, on s'arrête proprement avant
+DEFAULT_DEADLINE_SECONDS = 240
+# Fréquence des checkpoints (index covers + memo + progression)
+CHECKPOINT_EVERY = 25
+# Part max du budget restant pour les albums : les titres les plus écoutés passent même si les albums sont partiels
+ALBUMS_BUDGET_SHARE = 0.5
 
 
 def load_env():
@@ -39,8 +53,7 @@ def load_env():
 def load_json_data(file_path: Path):
     """Charge un fichier JSON"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        return load_json(file_path)
     except Exception as e:
         print(f"❌ Erreur lecture {file_path.name}: {e}")
         return None
@@ -49,21 +62,80 @@ def load_json_data(file_path: Path):
 def save_json_data(file_path: Path, data):
     """Sauvegarde un fichier JSON"""
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        dump_json(file_path, data)
         print(f"OK {file_path.name} sauvegarde")
     except Exception as e:
         print(f"ERREUR sauvegarde {file_path.name}: {e}")
 
 
-def enrich_songs(songs_data, resolver: CoverResolver):
-    """Enrichit songs.json avec les covers"""
+def load_checkpoint(checkpoint_path: Path) -> Dict[str, Set[str]]:
+    """
+    Charge la progression d'une passe interrompue : ids déjà traités par type.
+    Vide si la passe précédente est allée au bout.
+    """
+    done = {"songs": set(), "albums": set()}
+    if not checkpoint_path.exists():
+        return done
+    
+    try:
+        data = load_json(checkpoint_path)
+    except Exception as e:
+        print(f"WARNING Checkpoint illisible, passe complete: {e}")
+        return done
+    
+    if data.get("complete", True):
+        return done
+    
+    for data_type in done:
+        done[data_type].update(data.get(data_type, []))
+    print(f"OK Reprise: {len(done['songs'])} titres et {len(done['albums'])} albums deja traites")
+    return done
+
+
+def save_checkpoint(checkpoint_path: Path, done: Dict[str, Set[str]], complete: bool):
+    """Persiste la progression (complete=True : prochaine passe repart de zéro)"""
+    try:
+        checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        dump_json(checkpoint_path, {
+            "complete": complete,
+            "songs": [] if complete else sorted(done["songs"]),
+            "albums": [] if complete else sorted(done["albums"])
+        })
+    except Exception as e:
+        print(f"WARNING Erreur sauvegarde checkpoint: {e}")
+
+
+def visibility_priority(item: Dict) -> Tuple[int, int]:
+    """Clé de tri : les plus écoutés (streams_daily) puis les mieux classés d'abord"""
+    return (-(item.get("streams_daily") or 0), item.get("rank") or 0)
+
+
+def enrich_songs(
+    songs_data,
+    resolver: CoverResolver,
+    done: Optional[Set[str]] = None,
+    deadline: Optional[float] = None,
+    on_checkpoint: Optional[Callable[[], None]] = None
+) -> Tuple[List[Dict], bool]:
+    """
+    Enrichit songs.json avec les covers, par ordre de visibilité
+    Les titres déjà traités (done) sont ignorés ; arrêt propre à l'échéance (deadline, time.monotonic)
+    
+    Returns:
+        (songs_data, passe complète ?)
+    """
     enriched_count = 0
     failed_count = 0
+    done = done if done is not None else set()
+    pending = sorted((song for song in songs_data if song.get("id") not in done), key=visibility_priority)
     
-    print(f"\nEnrichissement de {len(songs_data)} titres...")
+    print(f"\nEnrichissement de {len(pending)}/{len(songs_data)} titres...")
     
-    for song in songs_data:
+    for position, song in enumerate(pending):
+        if deadline is not None and time.monotonic() >= deadline:
+            print(f"WARNING Budget de temps atteint, {len(pending) - position} titres reportes au prochain cycle")
+            return songs_data, False
+        
         title = song.get("title", "")
         
         # Déterminer si lead ou feat (basé sur la présence de * au début)
@@ -77,20 +149,38 @@ def enrich_songs(songs_data, resolver: CoverResolver):
             song["cover_url"] = cover_info.get("cover_url")
             song["album_name"] = cover_info.get("album_name")
             song["album_type"] = cover_info.get("album_type")
+            song["cover_url_medium"] = cover_info.get("cover_url_medium")
+            song["cover_url_small"] = cover_info.get("cover_url_small")
             enriched_count += 1
             print(f"  OK {title} -> {cover_info.get('album_name')}")
         else:
             failed_count += 1
             print(f"  WARNING {title} -> Aucune cover trouvee")
+        
+        done.add(song.get("id"))
+        if on_checkpoint and (position + 1) % CHECKPOINT_EVERY == 0:
+            on_checkpoint()
     
-    print(f"\nTitres enrichis: {enriched_count}/{len(songs_data)}")
+    print(f"\nTitres enrichis: {enriched_count}/{len(pending)}")
     print(f"Echecs: {failed_count}")
     
-    return songs_data
+    return songs_data, True
 
 
-def enrich_albums(albums_data, resolver: CoverResolver):
-    """Enrichit albums.json avec les covers (filtre Avatar/Music)"""
+def enrich_albums(
+    albums_data,
+    resolver: CoverResolver,
+    done: Optional[Set[str]] = None,
+    deadline: Optional[float] = None
+) -> Tuple[List[Dict], bool]:
+    """
+    Enrichit albums.json avec les covers (filtre Avatar/Music)
+    Même reprise / échéance que enrich_songs ; le filtrage s'applique toujours à tous les albums
+    
+    Returns:
+        (albums filtrés, passe complète ?)
+    """
+    done = done if done is not None else set()
     enriched_count = 0
     failed_count = 0
     removed_count = 0
@@ -107,7 +197,7 @@ def enrich_albums(albums_data, resolver: CoverResolver):
         
         # Tester si le nom commence par un des patterns à supprimer (insensible à la casse)
         should_remove = False
-        for pattern in resolver.ALBUMS_TO_REMOVE:
+        for pattern in resolver.rules.albums_to_remove:
             # Vérifier si le nom nettoyé commence par le pattern (ou contient uniquement le pattern)
             if clean_name.lower().startswith(pattern.lower()):
                 should_remove = True
@@ -118,30 +208,42 @@ def enrich_albums(albums_data, resolver: CoverResolver):
         if not should_remove:
             filtered_albums.append(album)
     
-    # Enrichir les albums restants
-    for album in filtered_albums:
+    # Enrichir les albums restants (par ordre de visibilité)
+    pending = sorted((album for album in filtered_albums if album.get("id") not in done), key=visibility_priority)
+    complete = True
+    
+    for position, album in enumerate(pending):
+        if deadline is not None and time.monotonic() >= deadline:
+            print(f"WARNING Budget de temps atteint, {len(pending) - position} albums reportes au prochain cycle")
+            complete = False
+            break
+        
         album_name = album.get("title", "")
         
-        # Résoudre la cover
-        cover_info = resolver.get_cover_for_album(album_name)
+        # Résoudre la cover (album_id connu → album préchargé par lot)
+        cover_info = resolver.get_cover_for_album(album_name, album.get("spotify_album_id"))
         
         if cover_info and cover_info.get("cover_url"):
             album["spotify_album_id"] = cover_info.get("album_id")
             album["cover_url"] = cover_info.get("cover_url")
             album["album_name"] = cover_info.get("album_name")
             album["album_type"] = cover_info.get("album_type")
+            album["cover_url_medium"] = cover_info.get("cover_url_medium")
+            album["cover_url_small"] = cover_info.get("cover_url_small")
             enriched_count += 1
             print(f"  OK {album_name}")
         else:
             failed_count += 1
             print(f"  WARNING {album_name} -> Aucune cover trouvee")
+        
+        done.add(album.get("id"))
     
-    print(f"\nAlbums enrichis: {enriched_count}/{len(filtered_albums)}")
+    print(f"\nAlbums enrichis: {enriched_count}/{len(pending)}")
     print(f"Albums supprimes: {removed_count}")
     print(f"Echecs: {failed_count}")
     print(f"Total final: {len(filtered_albums)} albums")
     
-    return filtered_albums
+    return filtered_albums, complete
 
 
 def main():
@@ -150,19 +252,41 @@ def main():
     print("Enrichissement covers Spotify")
     print("=" * 60)
     
+    # Échéance (chargement du catalogue et préchargement compris) :
+    # le travail restant est reporté au cycle suivant
+    budget = float(os.getenv("ENRICH_DEADLINE_SECONDS", DEFAULT_DEADLINE_SECONDS))
+    deadline = time.monotonic() + budget
+    
     # Charger les credentials
     client_id, client_secret, market = load_env()
     print(f"OK Credentials charges (market: {market})")
     
-    # Initialiser le client et le resolver
-    client = SpotifyClient(client_id, client_secret, market)
-    resolver = CoverResolver(client)
-    
-    # Chemins des fichiers
-    data_dir = Path(__file__).parent.parent / "data"
+    # Chemins des fichiers (artiste courant : data/ ou data/<artist_id>/)
+    base_path = Path(__file__).parent.parent
+    artist = current_artist(base_path)
+    data_dir = artist_data_dir(base_path)
+    print(f"OK Artiste : {artist.name}")
+    memo_file = data_dir / "cache" / "cover_memo.json"
+    checkpoint_file = data_dir / "cache" / "enrich_checkpoint.json"
     songs_file = data_dir / "songs.json"
     albums_file = data_dir / "albums.json"
     
+    # Initialiser le client et le resolver (memo album → cover persistant)
+    client = SpotifyClient(client_id, client_secret, market)
+    
+    # Mode catalogue (SPOTIFY_CATALOG_MODE=1) : discographie chargée une fois,
+    # les titres sont résolus localement au lieu d'une recherche par titre
+    catalog = None
+    if os.getenv("SPOTIFY_CATALOG_MODE", "0") == "1":
+        # SPOTIFY_ARTIST_ID ne surcharge que l'artiste par défaut (le registre fait foi pour les autres)
+        catalog_artist_id = os.getenv("SPOTIFY_ARTIST_ID", DEFAULT_ARTIST_ID) if artist.id == DEFAULT_ARTIST_ID else artist.id
+        catalog = SpotifyCatalog(client, catalog_artist_id)
+        catalog.load()
+    
+    resolver = CoverResolver(
+        client, memo_path=memo_file, catalog=catalog, artist_name=artist.name, artist_id=artist.id
+    )
+    
     # Charger les données
     songs_data = load_json_data(songs_file)
     albums_data = load_json_data(albums_file)
@@ -171,16 +295,61 @@ def main():
         print("ERREUR: Impossible de charger les donnees")
         return
     
-    # Enrichir songs
-    enriched_songs = enrich_songs(songs_data, resolver)
-    save_json_data(songs_file, enriched_songs)
+    # Précharger par lots les albums connus (albums?ids=, 20 IDs par requête)
+    album_ids = resolver.collect_album_ids(songs_data, albums_data)
+    if album_ids:
+        available = resolver.prefetch_albums(album_ids)
+        print(f"OK {available}/{len(album_ids)} albums precharges par lots")
+    
+    # Recherches de pistes en parallèle (SPOTIFY_MAX_CONCURRENCY > 1) :
+    # le cache partagé est rempli avant la résolution séquentielle
+    concurrency = int(os.getenv("SPOTIFY_MAX_CONCURRENCY", "1"))
+    if concurrency > 1:
+        queries = resolver.pending_track_queries(songs_data)
+        if catalog is not None:
+            queries = [q for q in queries if not catalog.find_tracks(q)]
+        async_client = AsyncSpotifyClient(client, max_concurrency=concurrency)
+        found = asyncio.run(async_client.warm_track_searches(
+            queries, artist.name, timeout=max(0.0, deadline - time.monotonic())
+        ))
+        print(f"OK {found}/{len(queries)} recherches prechargees ({concurrency} en parallele)")
+    
+    # Index de covers (source de vérité pour generate_current_views.py)
+    index_path = default_index_path(base_path)
+    cover_index = load_or_bootstrap(base_path, index_path)
+    done = load_checkpoint(checkpoint_file)
+    changed_total = 0
+    
+    def checkpoint(complete: bool = False):
+        """Index covers + memo + cache API + progression : un run tué conserve ce qu'il a résolu"""
+        nonlocal changed_total
+        changed_total += update_cover_index(cover_index, "songs", songs_data)
+        changed_total += update_cover_index(cover_index, "albums", albums_data)
+        save_cover_index(index_path, cover_index)
+        resolver.save_memo()
+        client.flush_cache()
+        save_checkpoint(checkpoint_file, done, complete)
+    
+    # Enrichir albums (peu nombreux, très visibles) dans leur part du budget restant,
+    # puis songs par ordre de visibilité jusqu'à l'échéance
+    albums_deadline = time.monotonic() + max(0.0, deadline - time.monotonic()) * ALBUMS_BUDGET_SHARE
+    albums_data, albums_complete = enrich_albums(albums_data, resolver, done["albums"], albums_deadline)
+    checkpoint()
+    
+    songs_data, songs_complete = enrich_songs(songs_data, resolver, done["songs"], deadline, checkpoint)
+    
+    save_json_data(songs_file, songs_data)
+    save_json_data(albums_file, albums_data)
     
-    # Enrichir albums
-    enriched_albums = enrich_albums(albums_data, resolver)
-    save_json_data(albums_file, enriched_albums)
+    complete = albums_complete and songs_complete
+    checkpoint(complete)
+    print(f"OK Index covers mis a jour ({changed_total} entrees modifiees)")
     
     print("\n" + "=" * 60)
-    print("OK Enrichissement termine !")
+    if complete:
+        print("OK Enrichissement termine !")
+    else:
+        print("OK Enrichissement partiel, reprise au prochain cycle")
     print("=" * 60)
 
 
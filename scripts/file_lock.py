@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Verrou inter-processus par création exclusive d'un fichier (portable Windows/Unix).
+Utilisé pour les fichiers partagés par les étapes lancées en parallèle
+(token Spotify, état de résilience, cache API Spotify).
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+
+DEFAULT_TIMEOUT_SECONDS = 10   # Attente max du verrou
+DEFAULT_STALE_SECONDS = 60     # Verrou plus vieux = processus mort
+
+
+@contextmanager
+def file_lock(
+    lock_path: Path,
+    timeout: float = DEFAULT_TIMEOUT_SECONDS,
+    stale_after: float = DEFAULT_STALE_SECONDS,
+    label: str = "fichier"
+):
+    """
+    Section critique entre processus.
+    Après timeout, on poursuit sans verrou plutôt que bloquer le cycle.
+    
+    Yields:
+        True si le verrou est détenu
+    """
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    deadline = time.time() + timeout
+    acquired = False
+    
+    while not acquired:
+        try:
+            os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600))
+            acquired = True
+        except FileExistsError:
+            try:
+                if time.time() - lock_path.stat().st_mtime > stale_after:
+                    print(f"WARNING Verrou {label} ancien detecte, nettoyage...")
+                    lock_path.unlink()
+                    continue
+            except FileNotFoundError:
+                continue
+            
+            if time.time() >= deadline:
+                print(f"WARNING Verrou {label} indisponible, poursuite sans verrou")
+                break
+            time.sleep(0.02)
+    
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            try:
+                lock_path.unlink()
+            except FileNotFoundError:
+                pass
@@ -2,18 +2,36 @@
 """
 Générateur de vues courantes avec règles de calcul (variation, paliers, jours restants).
 Lit les snapshots historiques et produit data/songs.json et data/albums.json.
+
+Mode parallèle (--workers N / --all-artists) : les vues (artiste × songs/albums)
+sont calculées dans un pool de processus, meta.json est mis à jour une fois par artiste à la fin.
 """
 
+import argparse
 import hashlib
-import json
 import math
+import os
+import re
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
 
+from json_io import dump_json, dumps, load_json, loads, write_atomic
+from cover_index import (
+    default_index_path, empty_index, index_fingerprint, load_cover_index, load_or_bootstrap,
+    save_views_fingerprint
+)
+from image_store import image_map_path, load_image_map, local_entry
+from publish import publish_data
+from records import AlbumRecord, CoverRecord, Record, SongRecord, load_records
+from artists import current_artist_id, data_dir, load_artists
 
-def normalize_key(title: str, album: str) -> str:
+
+def normalize_text(text: str) -> str:
     """
-    Normalise une clé d'alignement inter-jours.
+    Normalise un titre ou un nom d'album (composant de normalize_key).
     
     Règles :
     - lowercasing
@@ -21,32 +39,36 @@ def normalize_key(title: str, album: str) -> str:
     - suppression ponctuation
     - "feat./with/x/& (...)" retirés
     """
-    def clean(text: str) -> str:
-        # Lowercase et trim
-        text = text.lower().strip()
-        
-        # Retirer les patterns de featuring
-        patterns = [
-            " feat.", " feat ", " featuring ", " ft.", " ft ",
-            " with ", " x ", " & ", " and "
-        ]
-        for pattern in patterns:
-            if pattern in text:
-                text = text.split(pattern)[0]
-        
-        # Retirer parenthèses et leur contenu
-        if "(" in text:
-            text = text.split("(")[0].strip()
-        
-        # Retirer ponctuation
-        punctuation = ".,;:!?'\"-"
-        for char in punctuation:
-            text = text.replace(char, "")
-        
-        return text.strip()
-    
-    norm_title = clean(title)
-    norm_album = clean(album)
+    # Lowercase et trim
+    text = text.lower().strip()
+    
+    # Retirer les patterns de featuring
+    patterns = [
+        " feat.", " feat ", " featuring ", " ft.", " ft ",
+        " with ", " x ", " & ", " and "
+    ]
+    for pattern in patterns:
+        if pattern in text:
+            text = text.split(pattern)[0]
+    
+    # Retirer parenthèses et leur contenu
+    if "(" in text:
+        text = text.split("(")[0].strip()
+    
+    # Retirer ponctuation
+    punctuation = ".,;:!?'\"-"
+    for char in punctuation:
+        text = text.replace(char, "")
+    
+    return text.strip()
+
+
+def normalize_key(title: str, album: str) -> str:
+    """
+    Normalise une clé d'alignement inter-jours (cf. normalize_text).
+    """
+    norm_title = normalize_text(title)
+    norm_album = normalize_text(album)
     
     return f"kworb:{norm_title}@{norm_album}"
 
@@ -97,22 +119,18 @@ def calculate_days_to_cap(next_cap_value: int, streams_total: float, streams_dai
     return round(days, 2)
 
 
-def load_snapshot(filepath: Path) -> List[Dict]:
-    """Charge un snapshot JSON."""
-    if not filepath.exists():
-        return []
-    
-    with open(filepath, "r", encoding="utf-8") as f:
-        return json.load(f)
+def load_snapshot(filepath: Path, record_type=SongRecord) -> List[Record]:
+    """Charge un snapshot JSON en enregistrements compacts (SongRecord / AlbumRecord)."""
+    return load_records(filepath, record_type)
 
 
 def generate_current_view(
-    current_snapshot: List[Dict],
-    previous_snapshot: List[Dict],
+    current_snapshot: List[Record],
+    previous_snapshot: List[Record],
     cap_step: int,
     date_j: str,
     date_j1: Optional[str],
-    covers_cache: Optional[Dict[str, Dict]] = None
+    covers_cache: Optional[Dict[str, CoverRecord]] = None
 ) -> List[Dict]:
     """
     Génère la vue courante avec calculs à partir de J et J-1.
@@ -124,52 +142,50 @@ def generate_current_view(
         cap_step: Pas du palier (100M pour songs, 1B pour albums)
         date_j: Date du snapshot J (YYYY-MM-DD) - pour delta_for_date
         date_j1: Date du snapshot J-1 (YYYY-MM-DD) - pour delta_base_date
-        covers_cache: Dict {id: {cover_url, album_name, ...}} pour injection
+        covers_cache: Dict {id: CoverRecord} pour injection
     """
     # Index par id pour lookup rapide
-    prev_by_id = {item["id"]: item for item in previous_snapshot}
+    prev_by_id = {item.id: item for item in previous_snapshot}
     covers_cache = covers_cache or {}
     
     result = []
     
     for current in current_snapshot:
-        item_id = current["id"]
+        item_id = current.id
         
         # Récupérer streams_daily_prev, rank_prev ET streams_total_prev depuis J-1
         prev_item = prev_by_id.get(item_id)
-        streams_daily_prev = prev_item["streams_daily"] if prev_item else None
-        streams_total_prev = prev_item["streams_total"] if prev_item else None
-        rank_prev = prev_item["rank"] if prev_item else None
+        streams_daily_prev = prev_item.streams_daily if prev_item else None
+        streams_total_prev = prev_item.streams_total if prev_item else None
+        rank_prev = prev_item.rank if prev_item else None
         
         # Calcul du delta de rang (positif = gain de places, négatif = perte)
         # Prompt 8.8 : Toujours recalculé à neuf chaque jour, strictement J vs J-1
         rank_delta = None
         if rank_prev is not None:
-            rank_delta = rank_prev - current["rank"]
+            rank_delta = rank_prev - current.rank
         
         # Calculs (avec détection "Non mis-à-jour" si streams_total inchangé)
         variation_pct = calculate_variation_pct(
-            current["streams_daily"], 
+            current.streams_daily, 
             streams_daily_prev,
-            current["streams_total"],
+            current.streams_total,
             streams_total_prev
         )
-        next_cap_value = calculate_next_cap(current["streams_total"], cap_step)
+        next_cap_value = calculate_next_cap(current.streams_total, cap_step)
         days_to_next_cap = calculate_days_to_cap(
             next_cap_value,
-            current["streams_total"],
-            current["streams_daily"]
+            current.streams_total,
+            current.streams_daily
         )
         
         # Prompt 8.9: Enrichir avec cover_url et album_name depuis covers_cache
-        cover_data = covers_cache.get(item_id, {})
-        cover_url = cover_data.get("cover_url")
-        album_name = cover_data.get("album_name")
+        cover_data = covers_cache.get(item_id) or CoverRecord()
         
-        # Construire l'objet enrichi
+        # Construire l'objet enrichi (un seul dict par ligne, champs du snapshot en tête)
         # Prompt 8.8 : Ajouter delta_base_date et delta_for_date pour traçabilité
-        enriched = {
-            **current,
+        enriched = current._asdict()
+        enriched.update({
             "streams_daily_prev": streams_daily_prev,
             "rank_prev": rank_prev,
             "rank_delta": rank_delta,
@@ -178,82 +194,155 @@ def generate_current_view(
             "variation_pct": variation_pct,
             "next_cap_value": next_cap_value,
             "days_to_next_cap": days_to_next_cap,
-            "spotify_track_id": current.get("spotify_track_id"),
-            "spotify_album_id": current.get("spotify_album_id"),
+            "spotify_track_id": getattr(current, "spotify_track_id", None),
+            "spotify_album_id": getattr(current, "spotify_album_id", None) or cover_data.spotify_album_id,
             # Prompt 8.9: Dataset unifié
-            "cover_url": cover_url,
-            "album_name": album_name
-        }
+            "cover_url": cover_data.cover_url,
+            "album_name": cover_data.album_name
+        })
         
         result.append(enriched)
     
     return result
 
 
-def load_covers_cache(filepath: Path) -> Dict[str, Dict]:
+# Nombre de révisions de covers conservées dans data/covers_changes.json
+COVERS_HISTORY_LIMIT = 20
+
+
+def cover_item_digest(item: Dict) -> Optional[str]:
     """
-    Charge le cache de covers depuis songs.json/albums.json existants.
-    Prompt 8.9: Extrait cover_url et album_name pour réinjection dans dataset unifié.
-    Retourne un dict indexé par id avec {cover_url, album_name}.
+    Empreinte (64 bits hex) de la cover d'un item : id:cover_url:album_name.
+    Retourne None si l'item n'a ni cover ni album.
     """
-    if not filepath.exists():
-        return {}
-    
-    try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            items_list = json.load(f)
-        
-        # Extraire uniquement id, cover_url, album_name
-        covers_dict = {}
-        for item in items_list:
-            item_id = item.get("id")
-            if item_id:
-                covers_dict[item_id] = {
-                    "cover_url": item.get("cover_url"),
-                    "album_name": item.get("album_name")
-                }
-        
-        return covers_dict
-    except Exception as e:
-        print(f"WARNING Impossible de charger covers depuis {filepath}: {e}")
-        return {}
+    cover = item.get("cover_url") or ""
+    album = item.get("album_name") or ""
+    if not cover and not album:
+        return None
+    item_string = f"{item.get('id')}:{cover}:{album}"
+    return hashlib.sha256(item_string.encode("utf-8")).hexdigest()[:16]
+
+
+def collect_cover_digests(songs_data: List[Dict], albums_data: List[Dict]) -> Dict[str, str]:
+    """Empreintes par id pour toutes les covers (songs + albums)."""
+    digests = {}
+    for item in [*songs_data, *albums_data]:
+        digest = cover_item_digest(item)
+        if digest:
+            digests[item.get("id")] = digest
+    return digests
+
+
+def _format_revision(root: int) -> str:
+    """Révision publiée : 12 premiers caractères hex de la racine 64 bits."""
+    return f"{root:016x}"[:12]
 
 
 def calculate_covers_revision(songs_data: List[Dict], albums_data: List[Dict]) -> str:
     """
     Prompt 8.9: Calcule un hash des covers pour tracking des changements.
     
-    Combine tous les cover_url et album_name pour détecter les modifications
-    de covers ou d'albums, permettant au frontend de savoir si un refresh
-    des images est nécessaire.
+    Racine = XOR des empreintes par item : indépendante de l'ordre et
+    mise à jour incrémentalement par update_covers_revision (O(items modifiés)).
     
     Returns:
-        Hash SHA-256 (premiers 12 caractères) représentant l'état actuel des covers
+        Révision (12 caractères hex) représentant l'état actuel des covers
     """
-    # Extraire toutes les covers (songs + albums)
-    all_covers = []
-    
-    for song in songs_data:
-        cover = song.get("cover_url", "")
-        album = song.get("album_name", "")
-        if cover or album:
-            all_covers.append(f"{song.get('id')}:{cover}:{album}")
-    
-    for album in albums_data:
-        cover = album.get("cover_url", "")
-        album_name = album.get("album_name", "")
-        if cover or album_name:
-            all_covers.append(f"{album.get('id')}:{cover}:{album_name}")
+    root = 0
+    for digest in collect_cover_digests(songs_data, albums_data).values():
+        root ^= int(digest, 16)
+    return _format_revision(root)
+
+
+def update_covers_revision(state_path: Path, songs_data: List[Dict], albums_data: List[Dict]) -> Dict:
+    """
+    Met à jour la révision des covers de façon incrémentale.
     
-    # Trier pour consistance
-    all_covers.sort()
+    L'état (empreinte par id + racine + compteur) est persisté dans state_path ;
+    seuls les items dont l'empreinte change modifient la racine. Chaque nouvelle
+    révision incrémente le compteur seq (monotone, contrairement à la racine XOR
+    qui peut revenir à une valeur déjà publiée) et est ajoutée à l'historique avec
+    la liste des ids modifiés. Premier calcul : full_refresh, sans liste d'ids.
     
-    # Calculer hash
-    covers_string = "|".join(all_covers)
-    hash_full = hashlib.sha256(covers_string.encode("utf-8")).hexdigest()
+    Returns:
+        Dict {revision, seq, base_revision, changed_ids, full_refresh, history}
+    """
+    return update_covers_revision_digests(state_path, collect_cover_digests(songs_data, albums_data))
+
+
+def update_covers_revision_digests(state_path: Path, new_items: Dict[str, str]) -> Dict:
+    """update_covers_revision à partir des empreintes déjà calculées (id → empreinte)."""
+    state = {"root": None, "seq": 0, "items": {}, "history": []}
+    if state_path.exists():
+        try:
+            state.update(load_json(state_path))
+        except Exception as e:
+            print(f"WARNING État covers_revision illisible, reconstruction complète: {e}")
+    
+    old_items: Dict[str, str] = state["items"]
+    
+    full_refresh = state["root"] is None
+    if full_refresh:
+        # Premier calcul : pas de révision de base, le client recharge tout
+        root = 0
+        for digest in new_items.values():
+            root ^= int(digest, 16)
+        changed_ids = []
+        base_revision = None
+    else:
+        root = int(state["root"], 16)
+        changed_ids = []
+        for item_id in new_items.keys() | old_items.keys():
+            old_digest = old_items.get(item_id)
+            new_digest = new_items.get(item_id)
+            if old_digest == new_digest:
+                continue
+            if old_digest:
+                root ^= int(old_digest, 16)
+            if new_digest:
+                root ^= int(new_digest, 16)
+            changed_ids.append(item_id)
+        changed_ids.sort()
+        base_revision = _format_revision(int(state["root"], 16))
+    
+    revision = _format_revision(root)
+    history = state["history"]
+    seq = state["seq"]
+    changed = full_refresh or bool(changed_ids)
+    
+    if changed:
+        seq += 1
+        history.append({
+            "revision": revision,
+            "seq": seq,
+            "base_revision": base_revision,
+            "changed_ids": changed_ids,
+            "full_refresh": full_refresh
+        })
+        history = history[-COVERS_HISTORY_LIMIT:]
+    
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    dump_json(state_path, {"root": f"{root:016x}", "seq": seq, "items": new_items, "history": history})
+    
+    return {
+        "revision": revision,
+        "seq": seq,
+        "base_revision": base_revision if changed else None,
+        "changed_ids": changed_ids,
+        "full_refresh": full_refresh,
+        "history": history
+    }
+
+
+def save_covers_changes(changes_path: Path, history: List[Dict]) -> None:
+    """
+    Publie l'historique des révisions de covers (data/covers_changes.json).
     
-    # Retourner premiers 12 caractères (suffisant pour tracking)
-    return hash_full[:12]
+    Un client au compteur S rafraîchit uniquement l'union des changed_ids des
+    entrées de seq > S ; si S est antérieur à la plus ancienne entrée ou si une
+    de ces entrées porte full_refresh, rafraîchissement complet.
+    """
+    dump_json(changes_path, {"revisions": history})
 
 
 def extract_kworb_day(meta_path: Path) -> Optional[str]:
@@ -269,8 +358,7 @@ def extract_kworb_day(meta_path: Path) -> Optional[str]:
     if not meta_path.exists():
         return None
     
-    with open(meta_path, "r", encoding="utf-8") as f:
-        meta = json.load(f)
+    meta = load_json(meta_path)
     
     kworb_utc = meta.get("kworb_last_update_utc")
     if not kworb_utc:
@@ -284,7 +372,12 @@ def extract_kworb_day(meta_path: Path) -> Optional[str]:
         return None
 
 
-def update_meta_with_covers_info(meta_path: Path, covers_revision: str, kworb_day: Optional[str]) -> None:
+def update_meta_with_covers_info(
+    meta_path: Path,
+    covers_revision: str,
+    kworb_day: Optional[str],
+    covers_changes: Optional[Dict] = None
+) -> None:
     """
     Prompt 8.9: Met à jour meta.json avec covers_revision et kworb_day.
     
@@ -292,102 +385,448 @@ def update_meta_with_covers_info(meta_path: Path, covers_revision: str, kworb_da
         meta_path: Chemin vers meta.json
         covers_revision: Hash des covers actuelles
         kworb_day: Date Kworb au format YYYY-MM-DD
+        covers_changes: {seq, base_revision, changed_ids, full_refresh} du dernier changement de covers
     """
     if not meta_path.exists():
         print("⚠️  meta.json introuvable, impossible d'ajouter covers_revision/kworb_day")
         return
     
-    with open(meta_path, "r", encoding="utf-8") as f:
-        meta = json.load(f)
+    meta = load_json(meta_path)
     
     # Ajouter les nouveaux champs
     meta["covers_revision"] = covers_revision
+    if covers_changes:
+        meta["covers_revision_seq"] = covers_changes["seq"]
+        if covers_changes.get("full_refresh") or covers_changes.get("changed_ids"):
+            meta["covers_changes"] = {
+                "seq": covers_changes["seq"],
+                "base_revision": covers_changes.get("base_revision"),
+                "changed_ids": covers_changes["changed_ids"],
+                "full_refresh": covers_changes.get("full_refresh", False)
+            }
     if kworb_day:
         meta["kworb_day"] = kworb_day
     
     # Sauvegarder
-    with open(meta_path, "w", encoding="utf-8") as f:
-        json.dump(meta, f, indent=2, ensure_ascii=False)
+    dump_json(meta_path, meta)
     
     print(f"✅ meta.json mis à jour : covers_revision={covers_revision}, kworb_day={kworb_day}")
 
 
-def main():
-    """Point d'entrée principal."""
-    # Chemins
-    base_path = Path(__file__).parent.parent
-    history_songs = base_path / "data" / "history" / "songs"
-    history_albums = base_path / "data" / "history" / "albums"
-    
-    # Prompt 8.9: Charger les covers depuis songs.json/albums.json EXISTANTS
-    # (qui ont été enrichis par enrich_covers.py)
-    songs_json_path = base_path / "data" / "songs.json"
-    albums_json_path = base_path / "data" / "albums.json"
-    covers_songs = load_covers_cache(songs_json_path)
-    covers_albums = load_covers_cache(albums_json_path)
-    
-    print(f"[Covers] {len(covers_songs)} songs, {len(covers_albums)} albums chargés depuis cache")
-    
-    # Charger meta.json pour obtenir les dates disponibles
-    meta_path = base_path / "data" / "meta.json"
-    if meta_path.exists():
-        with open(meta_path, "r", encoding="utf-8") as f:
-            meta = json.load(f)
-        available_dates = meta.get("history", {}).get("available_dates", [])
-    else:
-        # Fallback : scanner le dossier history/songs
-        available_dates = []
-        if history_songs.exists():
-            for file in sorted(history_songs.glob("*.json"), reverse=True):
-                available_dates.append(file.stem)
+# Index de recherche publié avec songs.json (data/search_index.json)
+SEARCH_INDEX_VERSION = 2
+SEARCH_MIN_LENGTH = 2      # MIN_CHARS de search.js ; en dessous de SEARCH_GRAM_LENGTH : parcours des clés
+SEARCH_GRAM_LENGTH = 3     # Requêtes plus longues : trigrammes
+SEARCH_PUNCTUATION = re.compile(r"[^\w\s]")
+
+
+def search_key(text: str) -> str:
+    """
+    Clé de recherche sur le texte complet (featuring et parenthèses conservés,
+    contrairement à normalize_text) : accents retirés, minuscules, ponctuation
+    retirée, espaces fusionnés. Même règle que StickySearch.searchKey (search.js).
+    """
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    return " ".join(SEARCH_PUNCTUATION.sub("", text).split())
+
+
+def _encode_postings(positions: List[int]) -> List[int]:
+    """Liste croissante encodée en écarts (petits entiers = JSON plus compact)."""
+    previous = 0
+    deltas = []
+    for position in positions:
+        deltas.append(position - previous)
+        previous = position
+    return deltas
+
+
+def _decode_postings(deltas: List[int]) -> List[int]:
+    positions = []
+    total = 0
+    for delta in deltas:
+        total += delta
+        positions.append(total)
+    return positions
+
+
+def build_search_index(songs: List[Dict]) -> Dict:
+    """
+    Index trigrammes des titres et albums (ordre de songs.json = ordre des résultats).
+    
+    Format :
+    - items     : [[id, titre, album], ...]
+    - keys      : clé normalisée par item ("titre album"), pour vérifier les candidats
+    - trigrams  : trigramme → positions (écarts)
+    """
+    items = []
+    keys = []
+    trigrams: Dict[str, List[int]] = {}
+    
+    for position, song in enumerate(songs):
+        album = song.get("album_name") or song.get("album") or ""
+        key = " ".join(part for part in (search_key(song.get("title", "")), search_key(album)) if part)
+        items.append([song.get("id"), song.get("title", ""), album])
+        keys.append(key)
+        
+        for start in range(len(key) - SEARCH_GRAM_LENGTH + 1):
+            trigrams.setdefault(key[start:start + SEARCH_GRAM_LENGTH], []).append(position)
+    
+    return {
+        "version": SEARCH_INDEX_VERSION,
+        "normalization": "search_key",
+        "items": items,
+        "keys": keys,
+        "trigrams": {gram: _encode_postings(sorted(set(p))) for gram, p in trigrams.items()}
+    }
+
+
+def query_search_index(index: Dict, query: str, limit: int = 10) -> List[List]:
+    """
+    Suggestions pour une requête (même algorithme que StickySearch côté navigateur) :
+    sous-chaîne des clés si la requête est plus courte qu'un trigramme, sinon
+    intersection des trigrammes puis vérification de la sous-chaîne sur la clé de l'item.
+    """
+    key = search_key(query)
+    if len(key) < SEARCH_MIN_LENGTH:
+        return []
+    
+    if len(key) < SEARCH_GRAM_LENGTH:
+        matches = [position for position, item_key in enumerate(index["keys"]) if key in item_key]
+        return [index["items"][position] for position in matches[:limit]]
+    
+    grams = {key[start:start + SEARCH_GRAM_LENGTH] for start in range(len(key) - SEARCH_GRAM_LENGTH + 1)}
+    postings = [index["trigrams"].get(gram) for gram in grams]
+    if not all(postings):
+        return []
+    
+    # Liste la plus courte d'abord : intersection en O(taille minimale)
+    postings.sort(key=len)
+    candidates = set(_decode_postings(postings[0]))
+    for deltas in postings[1:]:
+        candidates.intersection_update(_decode_postings(deltas))
+    
+    results = []
+    for position in sorted(candidates):
+        if key in index["keys"][position]:
+            results.append(index["items"][position])
+            if len(results) >= limit:
+                break
+    return results
+
+
+# Vue des caps imminents publiée avec songs/albums (data/caps.json, lue par caps.js)
+CAPS_VERSION = 1
+CAPS_WINDOWS = (7, 14, 30, 60)  # Fenêtres proposées par la page Caps
+CAPS_FIELDS = (
+    "id", "rank", "title", "album_name", "cover_url", "streams_total", "streams_daily",
+    "variation_pct", "next_cap_value", "days_to_next_cap"
+)
+CAPS_TYPES = {"songs": "song", "albums": "album"}
+
+
+def calculate_eta(spotify_data_date: str, days_to_next_cap: float) -> str:
+    """Date prévue du palier (YYYY-MM-DD) : date des données + jours arrondis au supérieur, comme caps.js."""
+    return (date.fromisoformat(spotify_data_date) + timedelta(days=math.ceil(days_to_next_cap))).isoformat()
+
+
+def select_caps_items(view: List[Dict], data_type: str, spotify_data_date: str) -> List[Dict]:
+    """Lignes de la vue atteignant leur palier dans la plus grande fenêtre, réduites aux colonnes de la page Caps."""
+    max_days = CAPS_WINDOWS[-1]
+    items = []
+    
+    for item in view:
+        days = item.get("days_to_next_cap")
+        if not isinstance(days, (int, float)) or days > max_days:
+            continue
+        row = {"type": CAPS_TYPES[data_type]}
+        row.update((field, item.get(field)) for field in CAPS_FIELDS)
+        row["eta"] = calculate_eta(spotify_data_date, days)
+        items.append(row)
+    
+    return items
+
+
+def build_caps_view(spotify_data_date: str, songs: List[Dict], albums: List[Dict]) -> Dict:
+    """
+    Vue caps prête à afficher :
+    - items : songs + albums triés par ETA (jours restants, puis rang)
+    - windows : compteurs songs/albums par fenêtre (les items d'une fenêtre sont un préfixe de la liste)
+    - tiers : positions des items par palier visé (next_cap_value)
+    """
+    items = sorted(songs + albums, key=lambda row: (row["days_to_next_cap"], row["type"] != "song", row["rank"]))
+    
+    windows = {}
+    for window in CAPS_WINDOWS:
+        in_window = [row["type"] for row in items if row["days_to_next_cap"] <= window]
+        windows[str(window)] = {"songs": in_window.count("song"), "albums": in_window.count("album")}
+    
+    tiers: Dict[int, List[int]] = {}
+    for position, row in enumerate(items):
+        tiers.setdefault(row["next_cap_value"], []).append(position)
+    
+    return {
+        "version": CAPS_VERSION,
+        "spotify_data_date": spotify_data_date,
+        "windows": windows,
+        "tiers": [{"cap": cap, "items": positions} for cap, positions in sorted(tiers.items())],
+        "items": items
+    }
+
+
+# Manifeste d'images publié avec les vues (data/images.json, lu par data-renderer.js)
+IMAGES_VERSION = 1
+IMAGE_SIZES = (64, 300, 640)                    # Largeurs des variantes, dans l'ordre des entrées
+IMAGE_FIELDS = ("cover_url_small", "cover_url_medium", "cover_url")
+IMAGE_BASE_URL = "https://i.scdn.co/image/"     # Préfixe commun retiré des URLs
+
+
+def select_item_images(
+    view: List[Dict],
+    covers: Dict[str, CoverRecord],
+    image_map: Optional[Dict[str, List[Optional[str]]]] = None
+) -> Dict[str, List[Optional[str]]]:
+    """
+    Variantes 64/300/640 px des items de la vue ayant une cover :
+    chemins locaux /images/... si la cover est en cache (cache_images.py), sinon URLs Spotify (préfixe commun retiré).
+    """
+    images = {}
+    for item in view:
+        cover = covers.get(item["id"])
+        if not cover or not cover.cover_url:
+            continue
+        entry = local_entry(image_map or {}, cover.cover_url)
+        if entry:
+            images[item["id"]] = entry
+            continue
+        urls = [getattr(cover, field) for field in IMAGE_FIELDS]
+        images[item["id"]] = [
+            url[len(IMAGE_BASE_URL):] if url and url.startswith(IMAGE_BASE_URL) else url
+            for url in urls
+        ]
+    return images
+
+
+def build_image_manifest(*images: Dict[str, List[Optional[str]]]) -> Dict:
+    """
+    Manifeste id → [64 px, 300 px, 640 px] (null si variante inconnue) :
+    le Website affiche la miniature et laisse srcset choisir une taille supérieure.
+    """
+    items = {}
+    for part in images:
+        items.update(part)
+    return {
+        "version": IMAGES_VERSION,
+        "base": IMAGE_BASE_URL,
+        "sizes": list(IMAGE_SIZES),
+        "items": items
+    }
+
+
+# Vues publiées : type → (enregistrement du snapshot, pas du palier)
+VIEW_SPECS = {
+    "songs": (SongRecord, 100_000_000),
+    "albums": (AlbumRecord, 1_000_000_000)
+}
+
+
+class ViewResult(NamedTuple):
+    """
+    Vue calculée, sous forme compacte (renvoyée telle quelle par les workers du pool) :
+    les parties volumineuses sont du JSON déjà encodé (json_io.dumps), pas des dicts à pickler.
+    """
+    artist_id: str
+    data_type: str
+    payload: bytes                  # JSON encodé, écrit tel quel
+    cover_digests: Dict[str, str]   # id → empreinte cover (covers_revision)
+    items: int
+    with_covers: int
+    derived: Optional[Dict[str, bytes]] = None  # Fichiers dérivés de la vue (nom → JSON encodé)
+    data_date: Optional[str] = None  # Date J des snapshots (base des ETA)
+    caps: Optional[bytes] = None    # Lignes candidates de data/caps.json (JSON encodé, fusionnées à la publication)
+    images: Optional[bytes] = None  # Entrées de data/images.json (JSON encodé)
+
+
+def resolve_snapshot_dates(artist_dir: Path, meta: Dict) -> Tuple[Optional[str], Optional[str]]:
+    """Dates J et J-1 : meta.history.available_dates, sinon scan de history/songs."""
+    available_dates = meta.get("history", {}).get("available_dates", [])
     
     if not available_dates:
-        print("Aucun snapshot disponible. Génération impossible.")
-        return
+        history_songs = artist_dir / "history" / "songs"
+        if history_songs.exists():
+            available_dates = [file.stem for file in sorted(history_songs.glob("*.json"), reverse=True)]
     
-    # Utiliser les dates les plus récentes disponibles
     date_j = available_dates[0] if len(available_dates) > 0 else None
     date_j1 = available_dates[1] if len(available_dates) > 1 else None
+    return date_j, date_j1
+
+
+def build_view(base_path: str, artist_id: str, data_type: str, date_j: str, date_j1: Optional[str]) -> ViewResult:
+    """
+    Calcule une vue (artiste × type) depuis ses snapshots et l'index de covers.
+    Worker du pool : reçoit des chemins et des dates, renvoie le JSON déjà encodé
+    au lieu d'une liste de dicts à sérialiser par pickle entre processus.
+    """
+    record_type, cap_step = VIEW_SPECS[data_type]
+    history_path = data_dir(Path(base_path), artist_id) / "history" / data_type
+    
+    current = load_snapshot(history_path / f"{date_j}.json", record_type)
+    previous = load_snapshot(history_path / f"{date_j1}.json", record_type) if date_j1 else []
+    
+    # Covers jointes depuis l'index dédié (écrit par enrich_covers.py),
+    # créé au besoin par le processus principal avant le pool (generate_views)
+    covers = (load_cover_index(default_index_path(Path(base_path), artist_id)) or empty_index())[data_type]
+    
+    # Générer la vue courante avec covers injectées (Prompt 8.9: dataset unifié)
+    view = generate_current_view(current, previous, cap_step, date_j, date_j1, covers)
+    
+    derived = {}
+    if data_type == "songs":
+        derived["search_index.json"] = dumps(build_search_index(view))
+    
+    return ViewResult(
+        artist_id=artist_id,
+        data_type=data_type,
+        payload=dumps(view),
+        cover_digests=collect_cover_digests(view, []),
+        items=len(view),
+        with_covers=sum(1 for item in view if item.get("cover_url")),
+        derived=derived,
+        data_date=date_j,
+        caps=dumps(select_caps_items(view, data_type, date_j)),
+        images=dumps(select_item_images(view, covers, load_image_map(image_map_path(Path(base_path), artist_id))))
+    )
+
+
+def publish_artist_views(base_path: Path, artist_id: str, results: Dict[str, ViewResult]) -> None:
+    """
+    Publie les vues d'un artiste puis met à jour covers_revision et meta.json (une seule écriture).
+    """
+    artist_dir = data_dir(base_path, artist_id)
     
-    if not date_j:
-        print("Aucune date J trouvée")
-        return
+    for data_type, result in results.items():
+        write_atomic(artist_dir / f"{data_type}.json", result.payload)
+        for name, payload in (result.derived or {}).items():
+            write_atomic(artist_dir / name, payload)
     
-    print(f"Utilisation des snapshots : J={date_j}, J-1={date_j1 or 'N/A'}")
+    songs, albums = results["songs"], results["albums"]
+    caps_view = build_caps_view(songs.data_date, loads(songs.caps or b"[]"), loads(albums.caps or b"[]"))
+    write_atomic(artist_dir / "caps.json", dumps(caps_view))
+    images = build_image_manifest(loads(songs.images or b"{}"), loads(albums.images or b"{}"))
+    write_atomic(artist_dir / "images.json", dumps(images))
     
-    # Charger snapshots
-    songs_j = load_snapshot(history_songs / f"{date_j}.json")
-    songs_j1 = load_snapshot(history_songs / f"{date_j1}.json") if date_j1 else []
-    albums_j = load_snapshot(history_albums / f"{date_j}.json")
-    albums_j1 = load_snapshot(history_albums / f"{date_j1}.json") if date_j1 else []
+    print("OK Vues courantes generees avec succes")
+    print(f"   - {results['songs'].items} chansons dans {artist_dir.name}/songs.json ({results['songs'].with_covers} avec cover)")
+    print(f"   - {results['albums'].items} albums dans {artist_dir.name}/albums.json ({results['albums'].with_covers} avec cover)")
+    print(f"   - {len(caps_view['items'])} caps à {CAPS_WINDOWS[-1]} j dans {artist_dir.name}/caps.json")
+    
+    # Prompt 8.9: Calcul covers_revision (incrémental, avec ids modifiés)
+    covers_state_path = artist_dir / "cache" / "covers_revision_state.json"
+    covers_state_path.parent.mkdir(parents=True, exist_ok=True)
+    covers_changes = update_covers_revision_digests(
+        covers_state_path,
+        {**results["songs"].cover_digests, **results["albums"].cover_digests}
+    )
+    covers_revision = covers_changes["revision"]
+    save_covers_changes(artist_dir / "covers_changes.json", covers_changes["history"])
+    if covers_changes["full_refresh"]:
+        print(f"[Covers] Premier calcul → révision {covers_revision} (rafraîchissement complet)")
+    elif covers_changes["changed_ids"]:
+        print(f"[Covers] {len(covers_changes['changed_ids'])} covers modifiées → révision {covers_revision}")
     
-    # Générer vues courantes avec covers injectées (Prompt 8.9: dataset unifié)
-    songs_current = generate_current_view(songs_j, songs_j1, 100_000_000, date_j, date_j1, covers_songs)
-    albums_current = generate_current_view(albums_j, albums_j1, 1_000_000_000, date_j, date_j1, covers_albums)
+    # Prompt 8.9: Extraction kworb_day depuis kworb_last_update_utc
+    meta_path = artist_dir / "meta.json"
+    kworb_day = extract_kworb_day(meta_path)
     
-    # Compter combien ont des covers
-    songs_with_covers = sum(1 for s in songs_current if s.get("cover_url"))
-    albums_with_covers = sum(1 for a in albums_current if a.get("cover_url"))
+    # Mise à jour meta.json avec les nouveaux champs
+    update_meta_with_covers_info(meta_path, covers_revision, kworb_day, covers_changes)
     
-    # Sauvegarder
-    with open(base_path / "data" / "songs.json", "w", encoding="utf-8") as f:
-        json.dump(songs_current, f, indent=2, ensure_ascii=False)
+    # Génération validée (bundle, versions immuables) ; différée sous l'orchestrateur
+    generation = publish_data(artist_dir)
+    if generation:
+        print(f"OK Generation {generation} servie")
+
+
+def plan_view_tasks(base_path: Path, artist_ids: List[str]) -> List[Tuple[str, str, str, str, Optional[str]]]:
+    """Tâches (base_path, artist_id, type, J, J-1) des artistes ayant au moins un snapshot."""
+    tasks = []
+    
+    for artist_id in artist_ids:
+        artist_dir = data_dir(base_path, artist_id)
+        meta_path = artist_dir / "meta.json"
+        meta = load_json(meta_path) if meta_path.exists() else {}
+        
+        date_j, date_j1 = resolve_snapshot_dates(artist_dir, meta)
+        if not date_j:
+            print(f"Aucun snapshot disponible pour {artist_id}. Génération impossible.")
+            continue
+        
+        print(f"[{artist_id}] Utilisation des snapshots : J={date_j}, J-1={date_j1 or 'N/A'}")
+        tasks.extend((str(base_path), artist_id, data_type, date_j, date_j1) for data_type in VIEW_SPECS)
+    
+    return tasks
+
+
+def generate_views(base_path: Path, artist_ids: List[str], workers: int = 1) -> int:
+    """
+    Génère et publie les vues des artistes donnés.
+    workers > 1 : vues calculées en parallèle (pool de processus), publication dans le processus principal.
     
-    with open(base_path / "data" / "albums.json", "w", encoding="utf-8") as f:
-        json.dump(albums_current, f, indent=2, ensure_ascii=False)
+    Returns:
+        Nombre d'artistes publiés
+    """
+    tasks = plan_view_tasks(base_path, artist_ids)
+    if not tasks:
+        return 0
+    
+    # Index de covers créé une seule fois ici : les workers ne font que le lire.
+    # Empreinte prise avant le calcul : un index modifié pendant la génération
+    # laisse les vues marquées périmées (cf. cover_index.views_outdated)
+    fingerprints = {}
+    for artist_id in dict.fromkeys(task[1] for task in tasks):
+        load_or_bootstrap(base_path, artist_id=artist_id)
+        fingerprints[artist_id] = index_fingerprint(default_index_path(base_path, artist_id))
+    
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+            results = list(executor.map(build_view, *zip(*tasks)))
+    else:
+        results = [build_view(*task) for task in tasks]
     
-    print("OK Vues courantes generees avec succes")
-    print(f"   - {len(songs_current)} chansons dans data/songs.json ({songs_with_covers} avec cover)")
-    print(f"   - {len(albums_current)} albums dans data/albums.json ({albums_with_covers} avec cover)")
+    by_artist: Dict[str, Dict[str, ViewResult]] = {}
+    for result in results:
+        by_artist.setdefault(result.artist_id, {})[result.data_type] = result
     
-    # Prompt 8.9: Calcul covers_revision (hash des covers pour tracking changements)
-    covers_revision = calculate_covers_revision(songs_current, albums_current)
+    for artist_id, views in by_artist.items():
+        publish_artist_views(base_path, artist_id, views)
+        save_views_fingerprint(base_path, artist_id, fingerprints[artist_id])
     
-    # Prompt 8.9: Extraction kworb_day depuis kworb_last_update_utc
-    kworb_day = extract_kworb_day(meta_path)
+    return len(by_artist)
+
+
+def main():
+    """Point d'entrée principal."""
+    parser = argparse.ArgumentParser(description="Génération des vues courantes songs/albums")
+    parser.add_argument(
+        "--all-artists",
+        action="store_true",
+        help="Tous les artistes actifs du registre (sinon : artiste courant, ARTIST_ID)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("VIEWS_WORKERS", "1")),
+        help="Processus de calcul des vues (défaut : VIEWS_WORKERS ou 1)"
+    )
+    args = parser.parse_args()
     
-    # Mise à jour meta.json avec les nouveaux champs
-    update_meta_with_covers_info(meta_path, covers_revision, kworb_day)
+    base_path = Path(__file__).parent.parent
+    if args.all_artists:
+        artist_ids = [artist.id for artist in load_artists(base_path)]
+    else:
+        artist_ids = [current_artist_id()]
+    
+    generate_views(base_path, artist_ids, workers=args.workers)
 
 
 if __name__ == "__main__":
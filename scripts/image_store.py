@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Stockage local des covers, adressé par contenu.
+Écrit par cache_images.py, lu par generate_current_views.py (manifeste d'images)
+et servi par dashboard_server.py sous /images/ avec un cache immuable.
+
+Arborescence :
+- data/cache/images/<sha256>.<ext>        : cover d'origine (partagée entre artistes)
+- data/cache/images/<sha256>-<taille>.jpg : miniature carrée générée depuis l'origine
+- data[/<artist_id>]/cache/images_map.json : URL Spotify (640 px) → [64 px, 300 px, origine]
+"""
+
+import hashlib
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from json_io import dump_json, load_json, write_atomic
+from artists import data_dir
+
+
+IMAGES_URL_PREFIX = "/images/"   # Chemin public (dashboard_server.py)
+THUMBNAIL_SIZES = (64, 300)      # Miniatures, dans l'ordre des entrées du manifeste
+IMAGE_NAME_PATTERN = re.compile(r"^[0-9a-f]{64}(-\d+)?\.(jpg|png|webp)$")
+CONTENT_TYPES = {"jpg": "image/jpeg", "png": "image/png", "webp": "image/webp"}
+
+
+def store_dir(base_path: Path) -> Path:
+    """Dossier partagé des images : data/cache/images"""
+    return base_path / "data" / "cache" / "images"
+
+
+def image_map_path(base_path: Path, artist_id: Optional[str] = None) -> Path:
+    """Table URL → images locales d'un artiste : data[/<artist_id>]/cache/images_map.json"""
+    return data_dir(base_path, artist_id) / "cache" / "images_map.json"
+
+
+def load_image_map(map_path: Path) -> Dict[str, List[Optional[str]]]:
+    """Charge la table URL → [64 px, 300 px, origine] (vide si absente ou illisible)."""
+    try:
+        return load_json(map_path)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"WARNING Table des images locales illisible ({e}), covers distantes utilisees")
+        return {}
+
+
+def save_image_map(map_path: Path, image_map: Dict[str, List[Optional[str]]]) -> None:
+    map_path.parent.mkdir(parents=True, exist_ok=True)
+    dump_json(map_path, image_map, profile="publish", sort_keys=True)
+
+
+def image_name(digest: str, ext: str, size: Optional[int] = None) -> str:
+    """Nom d'un fichier du stockage : <sha256>.<ext> ou <sha256>-<taille>.<ext>"""
+    return f"{digest}-{size}.{ext}" if size else f"{digest}.{ext}"
+
+
+def store_image(directory: Path, payload: bytes, ext: str, digest: Optional[str] = None, size: Optional[int] = None) -> str:
+    """
+    Écrit une image dans le stockage (sans réécriture si le fichier existe déjà).
+    digest : empreinte de l'origine pour une miniature, sinon celle du contenu.
+    
+    Returns:
+        Nom du fichier
+    """
+    name = image_name(digest or hashlib.sha256(payload).hexdigest(), ext, size)
+    path = directory / name
+    if not path.exists():
+        directory.mkdir(parents=True, exist_ok=True)
+        write_atomic(path, payload)
+    return name
+
+
+def public_url(name: Optional[str]) -> Optional[str]:
+    """Chemin servi par dashboard_server.py (None reste None)."""
+    return IMAGES_URL_PREFIX + name if name else None
+
+
+def local_entry(image_map: Dict[str, List[Optional[str]]], cover_url: Optional[str]) -> Optional[List[Optional[str]]]:
+    """Entrée du manifeste [64 px, 300 px, origine] en chemins locaux, si l'origine est en cache."""
+    names = image_map.get(cover_url) if cover_url else None
+    if not names or not names[-1]:
+        return None
+    return [public_url(name) for name in names]
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Sérialisation JSON unique du pipeline (lectures et écritures data/).
+Backend le plus rapide disponible : orjson, sinon msgspec, sinon json (stdlib).
+
+Profils d'écriture :
+- "publish" : JSON minifié (défaut, vues publiées et caches)
+- "debug"   : JSON indenté (2 espaces), lisible (défaut des snapshots d'historique)
+Profil par défaut surchargeable via la variable d'environnement JSON_PROFILE.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Iterable, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+PROFILES = ("publish", "debug")
+
+if orjson is not None:
+    BACKEND = "orjson"
+elif msgspec is not None:
+    BACKEND = "msgspec"
+else:
+    BACKEND = "json"
+
+
+def default_profile(fallback: str = "publish") -> str:
+    """Profil actif : JSON_PROFILE (publish|debug), fallback si absent ou invalide."""
+    profile = os.getenv("JSON_PROFILE", fallback).strip().lower()
+    return profile if profile in PROFILES else fallback
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Décode un document JSON (str ou bytes UTF-8)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    if msgspec is not None:
+        try:
+            return msgspec.json.decode(data.encode("utf-8") if isinstance(data, str) else data)
+        except msgspec.DecodeError as e:
+            # Même exception que les autres backends (orjson.JSONDecodeError en hérite)
+            raise json.JSONDecodeError(str(e), data if isinstance(data, str) else "", 0) from e
+    return json.loads(data)
+
+
+def dumps(obj: Any, profile: Optional[str] = None, sort_keys: bool = False) -> bytes:
+    """
+    Encode en JSON UTF-8 (caractères non-ASCII conservés).
+    
+    Args:
+        obj: Objet à sérialiser
+        profile: "publish" (minifié) ou "debug" (indenté), défaut : default_profile()
+        sort_keys: Trier les clés des objets
+    """
+    indent = (profile or default_profile()) == "debug"
+    
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, option=option)
+    
+    if msgspec is not None:
+        encoded = msgspec.json.Encoder(order="sorted" if sort_keys else None).encode(obj)
+        return msgspec.json.format(encoded, indent=2) if indent else encoded
+    
+    if indent:
+        text = json.dumps(obj, indent=2, ensure_ascii=False, sort_keys=sort_keys)
+    else:
+        text = json.dumps(obj, ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys)
+    return text.encode("utf-8")
+
+
+def dumps_records(rows: Iterable[Any], profile: Optional[str] = None) -> bytes:
+    """
+    Encode une liste d'objets ligne par ligne, sans matérialiser la liste de dicts
+    (NamedTuple de records.py convertis via _asdict).
+    
+    Profil par défaut : debug (snapshots d'historique lisibles, octet pour octet
+    comme json.dumps(liste, indent=2, ensure_ascii=False)), JSON_PROFILE le surcharge.
+    """
+    profile = profile or default_profile(fallback="debug")
+    parts = [
+        dumps(row._asdict() if hasattr(row, "_asdict") else row, profile)
+        for row in rows
+    ]
+    if profile != "debug":
+        return b"[" + b",".join(parts) + b"]"
+    if not parts:
+        return b"[]"
+    # Les sauts de ligne dans les chaînes sont échappés : le ré-indentage
+    # par remplacement de "\n" est sûr
+    return b"[\n  " + b",\n  ".join(part.replace(b"\n", b"\n  ") for part in parts) + b"\n]"
+
+
+def load_json(path: Path) -> Any:
+    """Charge un fichier JSON (les exceptions fichier/décodage sont propagées)."""
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def dump_json(path: Path, obj: Any, profile: Optional[str] = None, sort_keys: bool = False) -> None:
+    """
+    Écrit un fichier JSON de manière atomique (fichier temporaire + replace) :
+    un lecteur concurrent (serveur, frontend) ne voit jamais un fichier tronqué.
+    """
+    write_atomic(path, dumps(obj, profile, sort_keys))
+
+
+def write_atomic(path: Path, payload: bytes) -> None:
+    """
+    Écrit des octets déjà encodés (ex: JSON produit par un worker) de manière atomique.
+    Temporaire propre au processus et au thread : plusieurs artistes en parallèle
+    (et les threads d'un même client) écrivent les caches partagés.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+    
+    os.replace(tmp_path, path)
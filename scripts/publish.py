@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+"""
+Publication cohérente des données d'un artiste pour le Website.
+
+Générations (data[/<artist_id>]/generations/<id>/) : les étapes du pipeline écrivent
+les fichiers de travail data[/<artist_id>]/*.json ; la publication en copie le jeu
+complet dans une génération candidate, la valide (validate_data.DataValidator), puis
+bascule atomiquement le lien symbolique data[/<artist_id>]/current vers elle.
+Une génération invalide n'est jamais servie ; la précédente reste disponible pour
+un retour arrière immédiat (python scripts/publish.py --rollback).
+Sous l'orchestrateur (PIPELINE_CYCLE_ID), les étapes ne publient pas : une seule
+génération par cycle, après la mise à jour du statut dans meta.json.
+
+Bundle (bundle.json de la génération) : songs + albums + meta d'un même instant,
+identifiés par une révision commune (empreinte du contenu des trois fichiers).
+Servi par dashboard_server.py sous /api/bundle avec un ETag fort = révision :
+une seule requête, revalidée à coût nul tant que rien n'a changé.
+
+Versions immuables (data[/<artist_id>]/versions/<nom>.<empreinte>.json) : chaque
+fichier publié est recopié sous un nom dérivé de son contenu, jamais réécrit, et
+data[/<artist_id>]/current.json pointe vers les versions courantes. Le navigateur
+met les versions en cache sans limite ; seul le pointeur est relu à chaque synchro.
+Les versions retirées du pointeur sont supprimées après un délai de grâce
+(DATA_VERSIONS_GRACE, en secondes) : un client qui vient de lire l'ancien pointeur
+trouve encore ses fichiers.
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import shutil
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from json_io import dumps, load_json, write_atomic
+from validate_data import DataValidator
+from artists import current_artist_id, data_dir
+
+
+BUNDLE_NAME = "bundle.json"
+BUNDLE_PARTS = ("meta", "songs", "albums")  # Ordre des champs dans le bundle
+REVISION_PREFIX = b'{"revision":"'           # Début de bundle.json (révision lisible sans décodage)
+
+POINTER_NAME = "current.json"
+POINTER_VERSION = 1
+VERSIONS_DIR = "versions"
+VERSIONED_PARTS = ("meta", "songs", "albums", "caps", "images", "search_index")
+VERSIONS_GRACE_SECONDS = 3600  # Conservation d'une version retirée du pointeur (DATA_VERSIONS_GRACE)
+VERSIONED_NAME_PATTERN = re.compile(r"^[a-z_]+\.[0-9a-f]{16}\.json$")
+
+GENERATIONS_DIR = "generations"
+LIVE_LINK = "current"                       # Lien symbolique vers la génération servie
+LIVE_FALLBACK = "current.generation"        # Sans droit de créer un lien (Windows) : id de la génération
+PUBLISHED_FILES = VERSIONED_PARTS           # Fichiers copiés dans une génération (+ bundle.json)
+REQUIRED_FILES = ("meta", "songs", "albums")
+KEEP_GENERATIONS = 2                        # Génération servie + précédente (DATA_GENERATIONS_KEEP)
+
+
+def bundle_revision(parts: Dict[str, bytes]) -> str:
+    """Révision commune : empreinte (64 bits hex) du contenu des fichiers du bundle."""
+    digest = hashlib.sha256()
+    for name in BUNDLE_PARTS:
+        digest.update(parts[name])
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+def publish_bundle(artist_dir: Path) -> Optional[str]:
+    """
+    Écrit bundle.json depuis songs.json, albums.json et meta.json publiés.
+    Les fichiers sont assemblés tels quels (JSON valides), sans décodage.
+    
+    Returns:
+        Révision publiée, ou None si un fichier manque encore
+    """
+    try:
+        parts = {name: (artist_dir / f"{name}.json").read_bytes() for name in BUNDLE_PARTS}
+    except FileNotFoundError:
+        return None
+    
+    revision = bundle_revision(parts)
+    payload = REVISION_PREFIX + revision.encode("ascii") + b'"'
+    for name in BUNDLE_PARTS:
+        payload += b',"' + name.encode("ascii") + b'":' + parts[name].strip()
+    write_atomic(artist_dir / BUNDLE_NAME, payload + b"}")
+    return revision
+
+
+def read_bundle(artist_dir: Path) -> Tuple[str, bytes]:
+    """
+    Lit bundle.json publié (FileNotFoundError si absent).
+    
+    Returns:
+        (révision, contenu)
+    """
+    payload = (artist_dir / BUNDLE_NAME).read_bytes()
+    end = payload.index(b'"', len(REVISION_PREFIX))
+    return payload[len(REVISION_PREFIX):end].decode("ascii"), payload
+
+
+def versioned_name(name: str, payload: bytes) -> str:
+    """Nom immuable d'un fichier publié : <nom>.<empreinte 64 bits hex>.json"""
+    return f"{name}.{hashlib.sha256(payload).hexdigest()[:16]}.json"
+
+
+def load_pointer(artist_dir: Path) -> Dict:
+    """Pointeur current.json publié ({} si absent ou illisible)."""
+    try:
+        return load_json(artist_dir / POINTER_NAME)
+    except Exception:
+        return {}
+
+
+def collect_versions(artist_dir: Path, keep: Set[str], grace_seconds: float) -> int:
+    """
+    Supprime les versions hors du pointeur retirées depuis plus de grace_seconds
+    (date de retrait = mtime, cf. publish_versions).
+    
+    Returns:
+        Nombre de fichiers supprimés
+    """
+    versions_dir = artist_dir / VERSIONS_DIR
+    if not versions_dir.is_dir():
+        return 0
+    
+    deadline = time.time() - grace_seconds
+    removed = 0
+    for path in versions_dir.iterdir():
+        relative = f"{VERSIONS_DIR}/{path.name}"
+        if relative in keep or not VERSIONED_NAME_PATTERN.match(path.name):
+            continue
+        try:
+            if path.stat().st_mtime < deadline:
+                path.unlink()
+                removed += 1
+        except FileNotFoundError:
+            pass
+    return removed
+
+
+def publish_versions(artist_dir: Path, source_dir: Optional[Path] = None, grace_seconds: Optional[float] = None) -> Optional[Dict]:
+    """
+    Copie les fichiers publiés (de source_dir, défaut : artist_dir) sous leur nom
+    immuable puis réécrit current.json.
+    Le pointeur n'est écrit qu'une fois toutes ses versions présentes sur disque.
+    
+    Returns:
+        Pointeur publié, ou None si aucun fichier n'est encore publié
+    """
+    if grace_seconds is None:
+        grace_seconds = float(os.getenv("DATA_VERSIONS_GRACE", VERSIONS_GRACE_SECONDS))
+    
+    files = {}
+    for name in VERSIONED_PARTS:
+        try:
+            payload = ((source_dir or artist_dir) / f"{name}.json").read_bytes()
+        except FileNotFoundError:
+            continue
+        relative = f"{VERSIONS_DIR}/{versioned_name(name, payload)}"
+        if not (artist_dir / relative).exists():
+            (artist_dir / VERSIONS_DIR).mkdir(exist_ok=True)
+            write_atomic(artist_dir / relative, payload)
+        files[name] = relative
+    
+    if not files:
+        return None
+    
+    previous = load_pointer(artist_dir).get("files", {})
+    pointer = {"version": POINTER_VERSION, "files": files}
+    write_atomic(artist_dir / POINTER_NAME, dumps(pointer))
+    
+    # Versions qui viennent de quitter le pointeur : le délai de grâce part de maintenant
+    for relative in set(previous.values()) - set(files.values()):
+        try:
+            os.utime(artist_dir / relative)
+        except FileNotFoundError:
+            pass
+    
+    collect_versions(artist_dir, set(files.values()), grace_seconds)
+    return pointer
+
+
+def list_generations(artist_dir: Path) -> List[str]:
+    """Générations publiées (candidates exclues), de la plus ancienne à la plus récente."""
+    generations_dir = artist_dir / GENERATIONS_DIR
+    if not generations_dir.is_dir():
+        return []
+    return sorted(path.name for path in generations_dir.iterdir() if path.is_dir() and "." not in path.name)
+
+
+def live_generation(artist_dir: Path) -> Optional[str]:
+    """Génération servie (lien current, sinon current.generation), None avant la première publication."""
+    link = artist_dir / LIVE_LINK
+    if link.is_symlink():
+        return Path(os.readlink(link)).name
+    try:
+        return (artist_dir / LIVE_FALLBACK).read_text(encoding="utf-8").strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def published_dir(artist_dir: Path) -> Path:
+    """Dossier des fichiers servis : génération courante, sinon fichiers de travail (avant la première publication)."""
+    generation = live_generation(artist_dir)
+    if generation and (artist_dir / GENERATIONS_DIR / generation).is_dir():
+        return artist_dir / GENERATIONS_DIR / generation
+    return artist_dir
+
+
+def switch_live(artist_dir: Path, generation: str) -> None:
+    """Bascule atomique du lien current (remplacement d'un lien temporaire)."""
+    target = Path(GENERATIONS_DIR) / generation
+    temporary = artist_dir / f".{LIVE_LINK}.tmp"
+    if temporary.is_symlink() or temporary.exists():
+        temporary.unlink()
+    try:
+        os.symlink(target, temporary, target_is_directory=True)
+    except OSError:
+        write_atomic(artist_dir / LIVE_FALLBACK, generation.encode("utf-8"))
+        return
+    os.replace(temporary, artist_dir / LIVE_LINK)
+
+
+def stage_generation(artist_dir: Path, generation: str) -> Optional[Path]:
+    """
+    Construit et valide une génération candidate (generations/<id>.tmp).
+    
+    Returns:
+        Dossier candidat validé, ou None (fichier requis manquant ou validation en échec)
+    """
+    candidate = artist_dir / GENERATIONS_DIR / f"{generation}.tmp"
+    shutil.rmtree(candidate, ignore_errors=True)
+    candidate.mkdir(parents=True)
+    
+    for name in PUBLISHED_FILES:
+        source = artist_dir / f"{name}.json"
+        if source.exists():
+            shutil.copyfile(source, candidate / source.name)
+    
+    missing = [name for name in REQUIRED_FILES if not (candidate / f"{name}.json").exists()]
+    if missing:
+        print(f"WARNING Generation non publiee : {', '.join(missing)} absent(s)")
+        shutil.rmtree(candidate, ignore_errors=True)
+        return None
+    
+    validator = DataValidator(artist_dir, data_path=candidate)
+    if not validator.validate_all():
+        print(f"ERREUR Generation {generation} rejetee, {published_dir(artist_dir).name} reste servie")
+        shutil.rmtree(candidate, ignore_errors=True)
+        return None
+    
+    publish_bundle(candidate)
+    return candidate
+
+
+def same_files(first: Path, second: Path) -> bool:
+    """Deux générations au contenu identique (fichiers publiés et bundle)."""
+    for name in (*PUBLISHED_FILES, "bundle"):
+        paths = (first / f"{name}.json", second / f"{name}.json")
+        if paths[0].exists() != paths[1].exists():
+            return False
+        if paths[0].exists() and paths[0].read_bytes() != paths[1].read_bytes():
+            return False
+    return True
+
+
+def prune_generations(artist_dir: Path) -> None:
+    """Garde la génération servie et les précédentes (KEEP_GENERATIONS au total), supprime le reste."""
+    keep_count = max(1, int(os.getenv("DATA_GENERATIONS_KEEP", KEEP_GENERATIONS)))
+    generations = list_generations(artist_dir)
+    live = live_generation(artist_dir)
+    if live not in generations:
+        return
+    
+    position = generations.index(live)
+    keep = set(generations[max(0, position - keep_count + 1):position + 1])
+    for generation in generations:
+        if generation not in keep:
+            shutil.rmtree(artist_dir / GENERATIONS_DIR / generation, ignore_errors=True)
+
+
+def publish_generation(artist_dir: Path) -> Optional[str]:
+    """
+    Publie une génération validée : candidate → validation → bascule de current → versions.
+    Une génération identique à celle servie n'est pas republiée.
+    
+    Returns:
+        Génération servie, ou None si la candidate est rejetée
+    """
+    generation = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+    candidate = stage_generation(artist_dir, generation)
+    if candidate is None:
+        return None
+    
+    live_dir = published_dir(artist_dir)
+    if live_dir != artist_dir and same_files(live_dir, candidate):
+        shutil.rmtree(candidate, ignore_errors=True)
+        return live_dir.name
+    
+    final = artist_dir / GENERATIONS_DIR / generation
+    candidate.rename(final)
+    switch_live(artist_dir, generation)
+    publish_versions(artist_dir, source_dir=final)
+    prune_generations(artist_dir)
+    return generation
+
+
+def rollback(artist_dir: Path) -> Optional[str]:
+    """
+    Resservir la génération précédant la génération courante.
+    
+    Returns:
+        Génération servie après le retour arrière, ou None s'il n'y en a pas
+    """
+    generations = list_generations(artist_dir)
+    live = live_generation(artist_dir)
+    if live not in generations or generations.index(live) == 0:
+        return None
+    
+    previous = generations[generations.index(live) - 1]
+    switch_live(artist_dir, previous)
+    publish_versions(artist_dir, source_dir=artist_dir / GENERATIONS_DIR / previous)
+    return previous
+
+
+def publish_data(artist_dir: Path, cycle_end: bool = False) -> Optional[str]:
+    """
+    Point d'entrée des étapes : publie une génération, sauf pendant un cycle de
+    l'orchestrateur (PIPELINE_CYCLE_ID) où seule la fin de cycle (cycle_end) publie.
+    
+    Returns:
+        Génération servie, ou None (publication différée ou rejetée)
+    """
+    if os.getenv("PIPELINE_CYCLE_ID") and not cycle_end:
+        return None
+    return publish_generation(artist_dir)
+
+
+def main():
+    """Point d'entrée CLI (artiste courant, ARTIST_ID)."""
+    parser = argparse.ArgumentParser(description="Publication des données (générations validées)")
+    parser.add_argument("--rollback", action="store_true", help="Resservir la génération précédente")
+    args = parser.parse_args()
+    
+    artist_dir = data_dir(Path(__file__).parent.parent, current_artist_id())
+    if args.rollback:
+        generation = rollback(artist_dir)
+        if generation is None:
+            print("ERREUR Aucune generation precedente")
+            sys.exit(1)
+        print(f"OK Retour arriere : generation {generation} servie")
+        return
+    
+    generation = publish_generation(artist_dir)
+    if generation is None:
+        sys.exit(1)
+    print(f"OK Generation {generation} servie")
+
+
+if __name__ == "__main__":
+    main()
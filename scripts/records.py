@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Enregistrements typés et compacts partagés par le pipeline (songs, albums, covers).
+NamedTuple : pas de __dict__ par ligne, construction rapide, immuable
+(une modification passe par _replace au lieu d'une copie {**item, ...}).
+"""
+
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Type, Union
+
+from json_io import load_json
+
+
+class SongRecord(NamedTuple):
+    """Ligne d'un snapshot songs (ordre des champs = ordre JSON)."""
+    id: str
+    rank: int
+    title: str
+    album: str
+    role: str
+    streams_total: int
+    streams_daily: int
+    last_update_kworb: Optional[str] = None
+    spotify_data_date: Optional[str] = None
+
+
+class AlbumRecord(NamedTuple):
+    """Ligne d'un snapshot albums (ordre des champs = ordre JSON)."""
+    id: str
+    rank: int
+    title: str
+    streams_total: int
+    streams_daily: int
+    last_update_kworb: Optional[str] = None
+    spotify_data_date: Optional[str] = None
+
+
+class CoverRecord(NamedTuple):
+    """Entrée de l'index des covers (cf. cover_index.COVER_FIELDS)."""
+    cover_url: Optional[str] = None
+    album_name: Optional[str] = None
+    spotify_album_id: Optional[str] = None
+    album_type: Optional[str] = None
+    cover_url_medium: Optional[str] = None  # 300 px (cover_url = 640 px)
+    cover_url_small: Optional[str] = None   # 64 px (miniatures des tables)
+
+
+Record = Union[SongRecord, AlbumRecord, CoverRecord]
+
+RECORD_TYPES: Dict[str, Type] = {
+    "songs": SongRecord,
+    "albums": AlbumRecord
+}
+
+
+def record_from_dict(record_type: Type, data: Dict) -> Record:
+    """Construit un enregistrement depuis un dict JSON (clés inconnues ignorées)."""
+    defaults = record_type._field_defaults
+    return record_type._make(
+        data[field] if field in data else defaults.get(field)
+        for field in record_type._fields
+    )
+
+
+def load_records(filepath: Path, record_type: Type) -> List[Record]:
+    """Charge un fichier JSON (liste d'objets) en enregistrements ([] si absent)."""
+    if not filepath.exists():
+        return []
+    
+    rows = load_json(filepath)
+    
+    return [record_from_dict(record_type, row) for row in rows]
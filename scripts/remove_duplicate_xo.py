@@ -2,17 +2,17 @@
 Script pour supprimer le doublon "XO / The Host" avec 0 streams quotidiens (rang 310)
 """
 
-import json
 from pathlib import Path
 
+from json_io import dump_json, load_json
+
 def main():
     data_dir = Path(__file__).parent.parent / "data"
     songs_file = data_dir / "songs.json"
     
     # Charger les données
     print("Chargement de songs.json...")
-    with open(songs_file, 'r', encoding='utf-8') as f:
-        songs = json.load(f)
+    songs = load_json(songs_file)
     
     print(f"Nombre total de chansons AVANT: {len(songs)}")
     
@@ -53,8 +53,7 @@ def main():
     
     # Sauvegarder
     print("\nSauvegarde de songs.json...")
-    with open(songs_file, 'w', encoding='utf-8') as f:
-        json.dump(songs, f, indent=2, ensure_ascii=False)
+    dump_json(songs_file, songs)
     
     print("✅ Suppression terminée!")
     print(f"✅ Le fichier contient maintenant {len(songs)} chansons")
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Couche de résilience partagée pour les appels réseau (Kworb, Spotify).
+- Disjoncteur par hôte : après FAILURE_THRESHOLD échecs consécutifs, l'hôte est
+  « ouvert » pendant OPEN_SECONDS et les appels échouent immédiatement (CircuitOpenError)
+- Budget de retries par cycle, partagé entre les étapes de l'orchestrateur
+  (PIPELINE_CYCLE_ID), pour qu'une panne ne consomme pas les timeouts des étapes
+- Semi-ouvert : à l'expiration de la fenêtre, un seul appel de test est autorisé
+État persisté dans data/cache/resilience_state.json (partagé entre processus, modifié
+sous verrou), résumé publié dans meta.json.
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional
+
+from json_io import dump_json, load_json
+from file_lock import file_lock
+
+
+FAILURE_THRESHOLD = 3      # Échecs consécutifs avant ouverture
+OPEN_SECONDS = 240         # Durée d'ouverture (< intervalle de 5 min : le cycle suivant teste l'hôte)
+DEFAULT_RETRY_BUDGET = 20  # Retries autorisés par cycle, tous hôtes confondus
+TRIAL_SECONDS = 30         # Semi-ouvert : durée max de l'appel de test avant qu'un autre puisse tester
+MAX_BUDGETS = 8            # Budgets de cycles conservés dans l'état
+LOCK_TIMEOUT_SECONDS = 5
+
+
+class CircuitOpenError(Exception):
+    """Appel refusé : disjoncteur ouvert pour cet hôte"""
+    
+    def __init__(self, host: str, open_until: float):
+        self.host = host
+        self.open_until = open_until
+        remaining = max(0, int(open_until - time.time()))
+        super().__init__(f"Circuit ouvert pour {host} (reessai dans {remaining}s)")
+
+
+def is_host_failure(error: Exception) -> bool:
+    """Panne de l'hôte (connexion, timeout, 5xx) ; une 4xx est une erreur de la requête"""
+    response = getattr(error, "response", None)
+    return response is None or response.status_code >= 500
+
+
+def default_state_path() -> Path:
+    """Chemin de l'état : data/cache/resilience_state.json"""
+    return Path(__file__).parent.parent / "data" / "cache" / "resilience_state.json"
+
+
+class Resilience:
+    """
+    Disjoncteurs par hôte + budget de retries du cycle courant.
+    L'état est partagé par les étapes lancées en parallèle : chaque modification
+    relit le fichier et l'écrit sous verrou (file_lock.py), et check() relit
+    l'état pour voir un disjoncteur ouvert par un autre processus.
+    """
+    
+    def __init__(self, state_path: Path, cycle_id: Optional[str] = None, retry_budget: Optional[int] = None):
+        self.state_path = state_path
+        self.lock_path = state_path.with_name(state_path.name + ".lock")
+        # Sans orchestrateur, le « cycle » est le processus courant
+        self.cycle_id = cycle_id or f"pid-{os.getpid()}"
+        self.retry_budget = retry_budget if retry_budget is not None else DEFAULT_RETRY_BUDGET
+        self._lock = threading.Lock()
+    
+    def _load(self) -> Dict:
+        """État persisté, avec l'entrée de budget du cycle courant."""
+        try:
+            state = load_json(self.state_path)
+        except Exception:
+            state = {}
+        
+        state.setdefault("hosts", {})
+        budgets = state.setdefault("budgets", {})
+        state.pop("budget", None)  # Ancien format : un seul budget
+        budgets.setdefault(self.cycle_id, {"limit": self.retry_budget, "used": 0, "updated": time.time()})
+        return state
+    
+    def _save(self, state: Dict):
+        # Budgets des derniers cycles seulement (un par processus hors orchestrateur)
+        budgets = state["budgets"]
+        for cycle_id in sorted(budgets, key=lambda c: budgets[c].get("updated", 0))[:-MAX_BUDGETS]:
+            del budgets[cycle_id]
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            dump_json(self.state_path, state)
+        except Exception as e:
+            print(f"WARNING Erreur sauvegarde etat resilience: {e}")
+    
+    @contextmanager
+    def _update(self):
+        """Lecture-modification-écriture de l'état sous verrou (threads et processus)."""
+        with self._lock, file_lock(self.lock_path, LOCK_TIMEOUT_SECONDS, label="resilience"):
+            state = self._load()
+            yield state
+            self._save(state)
+    
+    @staticmethod
+    def _host(state: Dict, host: str) -> Dict:
+        return state["hosts"].setdefault(host, {"failures": 0, "open_until": 0})
+    
+    def check(self, host: str):
+        """
+        Lève CircuitOpenError si l'hôte est ouvert.
+        Fenêtre écoulée (semi-ouvert) : un seul appel de test passe, les autres
+        sont refusés jusqu'à son résultat (ou l'expiration du test, TRIAL_SECONDS).
+        """
+        entry = self._load()["hosts"].get(host)
+        if not entry or not entry.get("open_until"):
+            return
+        
+        now = time.time()
+        if entry["open_until"] > now:
+            raise CircuitOpenError(host, entry["open_until"])
+        
+        with self._update() as state:
+            entry = self._host(state, host)
+            if entry["open_until"] > now:
+                raise CircuitOpenError(host, entry["open_until"])
+            if not entry["open_until"]:
+                return  # Refermé par un autre processus
+            if entry.get("trial_until", 0) > now:
+                raise CircuitOpenError(host, entry["trial_until"])
+            entry["trial_until"] = now + TRIAL_SECONDS
+    
+    def record_success(self, host: str):
+        entry = self._load()["hosts"].get(host)
+        if not entry or not (entry.get("failures") or entry.get("open_until")):
+            return
+        with self._update() as state:
+            self._host(state, host).update(failures=0, open_until=0, trial_until=0, last_error=None)
+    
+    def record_failure(self, host: str, error: Exception):
+        """Compte un échec ; ouvre le disjoncteur au seuil (ou immédiatement si l'hôte était en test)"""
+        with self._update() as state:
+            entry = self._host(state, host)
+            was_tripped = entry["open_until"] > 0
+            entry["failures"] += 1
+            entry["last_error"] = str(error)[:120]
+            entry["trial_until"] = 0
+            if was_tripped or entry["failures"] >= FAILURE_THRESHOLD:
+                entry["open_until"] = time.time() + OPEN_SECONDS
+                print(f"WARNING Disjoncteur ouvert pour {host} ({entry['failures']} echecs)")
+    
+    def trip(self, host: str, seconds: float, reason: str):
+        """Ouvre le disjoncteur pour une durée imposée (ex: Retry-After trop long)"""
+        with self._update() as state:
+            entry = self._host(state, host)
+            entry["open_until"] = time.time() + seconds
+            entry["trial_until"] = 0
+            entry["last_error"] = reason[:120]
+    
+    def allow_retry(self, host: str) -> bool:
+        """Consomme un retry du budget du cycle ; False si épuisé ou hôte ouvert"""
+        with self._update() as state:
+            if self._host(state, host)["open_until"] > time.time():
+                return False
+            
+            budget = state["budgets"][self.cycle_id]
+            if budget["used"] >= budget["limit"]:
+                print(f"WARNING Budget de retries du cycle epuise ({budget['limit']})")
+                return False
+            
+            budget["used"] += 1
+            budget["updated"] = time.time()
+            return True
+    
+    def summary(self) -> Dict:
+        """Résumé lisible pour meta.json"""
+        state = self._load()
+        now = time.time()
+        hosts = {}
+        for host, entry in state["hosts"].items():
+            open_until = entry.get("open_until", 0)
+            if open_until > now:
+                state_name = "open"
+            elif open_until:
+                state_name = "half_open"  # Prochain appel = test de l'hôte
+            else:
+                state_name = "closed"
+            hosts[host] = {
+                "state": state_name,
+                "failures": entry.get("failures", 0),
+                "open_until": datetime.fromtimestamp(open_until, timezone.utc).isoformat() if open_until > now else None,
+                "last_error": entry.get("last_error")
+            }
+        budget = state["budgets"][self.cycle_id]
+        return {"hosts": hosts, "retry_budget": {"cycle": self.cycle_id, "limit": budget["limit"], "used": budget["used"]}}
+
+
+_instance: Optional[Resilience] = None
+_instance_lock = threading.Lock()
+
+
+def get_resilience() -> Resilience:
+    """Instance partagée du processus (cycle : PIPELINE_CYCLE_ID, budget : RETRY_BUDGET)"""
+    global _instance
+    with _instance_lock:
+        if _instance is None:
+            budget = os.getenv("RETRY_BUDGET")
+            _instance = Resilience(
+                default_state_path(),
+                cycle_id=os.getenv("PIPELINE_CYCLE_ID"),
+                retry_budget=int(budget) if budget else None
+            )
+        return _instance
+
+
+def resilience_summary() -> Dict:
+    """Résumé de l'état persisté (lu par l'orchestrateur en fin de cycle)"""
+    return Resilience(default_state_path(), cycle_id=os.getenv("PIPELINE_CYCLE_ID")).summary()
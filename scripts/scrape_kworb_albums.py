@@ -4,13 +4,13 @@ Scraper Kworb pour les albums de The Weeknd.
 Génère un snapshot journalier et régénère data/albums.json avec calculs.
 """
 
-import json
 import re
 import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import List, Optional, Tuple
 import sys
+from urllib.parse import urlparse
 
 try:
     import requests
@@ -20,6 +20,8 @@ except ImportError:
     print("   pip install requests beautifulsoup4")
     sys.exit(1)
 
+from json_io import load_json
+
 # Importer le gestionnaire de dates
 from date_manager import (
     extract_kworb_last_update,
@@ -29,14 +31,19 @@ from date_manager import (
     log_rotation_decision,
     should_rotate
 )
+from resilience import get_resilience, is_host_failure
+from records import AlbumRecord
+from artists import current_artist, data_dir, kworb_url
 
 
 # Configuration
-KWORB_ALBUMS_URL = "https://kworb.net/spotify/artist/1Xyo4u8uXC1ZmMpatF05PJ_albums.html"
+KWORB_ALBUMS_URL = kworb_url("albums")  # Artiste courant (ARTIST_ID)
 USER_AGENT = "The-Weeknd-Dashboard/1.0 (Educational Project; Python Scraper)"
 THROTTLE_SECONDS = 1.0
 MAX_RETRIES = 3
 RETRY_BACKOFF = 2.0
+CONNECT_TIMEOUT = 5  # Hôte injoignable : échec en 5 s au lieu de 30
+READ_TIMEOUT = 30
 
 
 def normalize_text(text: str) -> str:
@@ -95,12 +102,88 @@ def clean_number(text: str) -> int:
         return 0
 
 
-def scrape_kworb_albums(url: str, retries: int = MAX_RETRIES) -> Tuple[List[Dict], datetime]:
+def parse_kworb_albums_html(html: str) -> Tuple[List[AlbumRecord], Optional[datetime]]:
+    """
+    Parse le HTML d'une page Kworb Albums (page live ou archive).
+    
+    Returns:
+        Tuple[List[AlbumRecord], Optional[datetime]]: (albums, timestamp Kworb ou None)
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # Trouver la table des albums (table avec class 'sortable')
+    tables = soup.find_all('table')
+    table = None
+    for t in tables:
+        if 'sortable' in t.get('class', []):
+            table = t
+            break
+    
+    if not table:
+        raise ValueError("Table d'albums non trouvée sur la page")
+    
+    rows = table.find_all('tr')[1:]  # Skip header
+    
+    if not rows:
+        raise ValueError("Aucune ligne de données trouvée dans la table")
+    
+    albums = []
+    seen_ids = {}  # Pour gérer les doublons
+    
+    for i, row in enumerate(rows, start=1):
+        cols = row.find_all('td')
+        
+        # Structure Kworb Albums : [Album Title, Streams Total, Daily]
+        if len(cols) < 3:
+            continue
+        
+        # Extraction des données
+        rank = i
+        title = cols[0].get_text(strip=True)
+        streams_total_text = cols[1].get_text(strip=True)
+        streams_daily_text = cols[2].get_text(strip=True)
+        
+        # Nettoyage et typage
+        streams_total = clean_number(streams_total_text)
+        streams_daily = clean_number(streams_daily_text)
+        
+        # Génération de l'ID stable
+        # Format: kworb:album:<norm_album>
+        base_id = generate_album_id(title)
+        album_id = base_id
+        
+        # Gérer les doublons (ex: différentes éditions d'un même album)
+        if album_id in seen_ids:
+            seen_ids[album_id] += 1
+            # Ajouter suffixe numérique
+            album_id = f"{base_id}-{seen_ids[album_id]}"
+        else:
+            seen_ids[album_id] = 1
+        
+        album = AlbumRecord(
+            id=album_id,
+            rank=rank,
+            title=title,
+            streams_total=streams_total,
+            streams_daily=streams_daily
+        )
+        
+        albums.append(album)
+    
+    print(f"✅ {len(albums)} albums extraits avec succès")
+    
+    # Extraire le timestamp "Last updated" depuis le HTML (None si absent)
+    last_update_kworb = extract_kworb_last_update(html)
+    
+    return albums, last_update_kworb
+
+
+def scrape_kworb_albums(url: str, retries: int = MAX_RETRIES) -> Tuple[List[AlbumRecord], datetime]:
     """
     Scrape la page Kworb Albums et retourne les données brutes.
     
     Returns:
-        Tuple[List[Dict], datetime]: (liste des albums, timestamp de mise à jour)
+        Tuple[List[AlbumRecord], datetime]: (liste des albums, timestamp de mise à jour)
     """
     headers = {
         "User-Agent": USER_AGENT,
@@ -110,12 +193,19 @@ def scrape_kworb_albums(url: str, retries: int = MAX_RETRIES) -> Tuple[List[Dict
         "Connection": "keep-alive"
     }
     
+    # Disjoncteur par hôte + budget de retries du cycle (cf. resilience.py)
+    resilience = get_resilience()
+    host = urlparse(url).hostname
+    
     for attempt in range(retries):
         try:
+            # Hôte en panne aux cycles précédents : échec immédiat (CircuitOpenError)
+            resilience.check(host)
             print(f"🌐 Récupération des données albums depuis Kworb (tentative {attempt + 1}/{retries})...")
             
-            response = requests.get(url, headers=headers, timeout=30)
+            response = requests.get(url, headers=headers, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
             response.raise_for_status()
+            resilience.record_success(host)
             
             # Forcer l'encodage UTF-8 pour éviter les erreurs cp1252 sur Windows
             response.encoding = 'utf-8'
@@ -123,72 +213,7 @@ def scrape_kworb_albums(url: str, retries: int = MAX_RETRIES) -> Tuple[List[Dict
             # Throttle
             time.sleep(THROTTLE_SECONDS)
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Trouver la table des albums (table avec class 'sortable')
-            tables = soup.find_all('table')
-            table = None
-            for t in tables:
-                if 'sortable' in t.get('class', []):
-                    table = t
-                    break
-            
-            if not table:
-                raise ValueError("Table d'albums non trouvée sur la page")
-            
-            rows = table.find_all('tr')[1:]  # Skip header
-            
-            if not rows:
-                raise ValueError("Aucune ligne de données trouvée dans la table")
-            
-            albums = []
-            last_update_kworb = datetime.now(timezone.utc)
-            seen_ids = {}  # Pour gérer les doublons
-            
-            for i, row in enumerate(rows, start=1):
-                cols = row.find_all('td')
-                
-                # Structure Kworb Albums : [Album Title, Streams Total, Daily]
-                if len(cols) < 3:
-                    continue
-                
-                # Extraction des données
-                rank = i
-                title = cols[0].get_text(strip=True)
-                streams_total_text = cols[1].get_text(strip=True)
-                streams_daily_text = cols[2].get_text(strip=True)
-                
-                # Nettoyage et typage
-                streams_total = clean_number(streams_total_text)
-                streams_daily = clean_number(streams_daily_text)
-                
-                # Génération de l'ID stable
-                # Format: kworb:album:<norm_album>
-                base_id = generate_album_id(title)
-                album_id = base_id
-                
-                # Gérer les doublons (ex: différentes éditions d'un même album)
-                if album_id in seen_ids:
-                    seen_ids[album_id] += 1
-                    # Ajouter suffixe numérique
-                    album_id = f"{base_id}-{seen_ids[album_id]}"
-                else:
-                    seen_ids[album_id] = 1
-                
-                album = {
-                    "id": album_id,
-                    "rank": rank,
-                    "title": title,
-                    "streams_total": streams_total,
-                    "streams_daily": streams_daily
-                }
-                
-                albums.append(album)
-            
-            print(f"✅ {len(albums)} albums extraits avec succès")
-            
-            # Extraire le timestamp "Last updated" depuis le HTML
-            last_update_kworb = extract_kworb_last_update(response.text)
+            albums, last_update_kworb = parse_kworb_albums_html(response.text)
             
             # Fallback : si extraction échoue, utiliser datetime.now(UTC)
             if last_update_kworb is None:
@@ -196,10 +221,12 @@ def scrape_kworb_albums(url: str, retries: int = MAX_RETRIES) -> Tuple[List[Dict
                 last_update_kworb = datetime.now(timezone.utc)
             
             return albums, last_update_kworb
-            
+        
         except requests.RequestException as e:
             print(f"❌ Erreur réseau (tentative {attempt + 1}/{retries}): {e}")
-            if attempt < retries - 1:
+            if is_host_failure(e):
+                resilience.record_failure(host, e)
+            if attempt < retries - 1 and resilience.allow_retry(host):
                 wait_time = RETRY_BACKOFF ** attempt
                 print(f"⏳ Nouvelle tentative dans {wait_time}s...")
                 time.sleep(wait_time)
@@ -210,7 +237,7 @@ def scrape_kworb_albums(url: str, retries: int = MAX_RETRIES) -> Tuple[List[Dict
             raise
 
 
-def create_snapshot(albums: List[Dict], last_update_kworb: datetime, base_path: Path) -> str:
+def create_snapshot(albums: List[AlbumRecord], last_update_kworb: datetime, base_path: Path) -> Tuple[str, bool]:
     """
     Crée un snapshot journalier dans data/history/albums/ avec rotation intelligente J/J-1/J-2.
     
@@ -220,16 +247,15 @@ def create_snapshot(albums: List[Dict], last_update_kworb: datetime, base_path:
     - Mettre à jour meta.json
     
     Returns:
-        str: La date spotify_data_date (YYYY-MM-DD)
+        Tuple[str, bool]: (spotify_data_date YYYY-MM-DD, snapshot modifié ?)
     """
     # Calculer spotify_data_date = kworb_day - 1 jour
     spotify_data_date = calculate_spotify_data_date(last_update_kworb)
     
     # Charger meta.json pour vérifier s'il faut rotate
-    meta_path = base_path / "data" / "meta.json"
+    meta_path = data_dir(base_path) / "meta.json"
     if meta_path.exists():
-        with open(meta_path, "r", encoding="utf-8") as f:
-            meta = json.load(f)
+        meta = load_json(meta_path)
     else:
         meta = {"history": {}}
     
@@ -243,42 +269,45 @@ def create_snapshot(albums: List[Dict], last_update_kworb: datetime, base_path:
         print(f"[UPDATE] ALBUMS : Même jour, réécriture J = {spotify_data_date}.json")
     
     # Enrichir chaque album avec les timestamps
-    snapshot_albums = []
-    for album in albums:
-        snapshot_album = {
-            **album,
-            "last_update_kworb": last_update_kworb.isoformat(),
-            "spotify_data_date": spotify_data_date
-        }
-        snapshot_albums.append(snapshot_album)
+    last_update_iso = last_update_kworb.isoformat()
+    snapshot_albums = [
+        album._replace(last_update_kworb=last_update_iso, spotify_data_date=spotify_data_date)
+        for album in albums
+    ]
     
     # Effectuer la rotation atomique (idempotente)
-    success = rotate_snapshots_atomic(
+    result = rotate_snapshots_atomic(
         base_path,
         "albums",
         spotify_data_date,
         snapshot_albums
     )
     
-    if not success:
+    if not result["success"]:
         print("[ERROR] Échec de la rotation des snapshots albums")
     
-    return spotify_data_date
+    return spotify_data_date, result["changed"]
 
 
-def update_meta(spotify_data_date: str, last_update_kworb: datetime, base_path: Path):
+def update_meta(
+    spotify_data_date: str,
+    last_update_kworb: datetime,
+    base_path: Path,
+    snapshot_changed: Optional[bool] = None
+):
     """
     Met à jour data/meta.json avec les nouvelles informations Albums.
     Utilise le date_manager pour gérer history de façon cohérente.
     """
-    meta_path = base_path / "data" / "meta.json"
+    meta_path = data_dir(base_path) / "meta.json"
     
     # Utiliser le gestionnaire pour mettre à jour meta.json
     meta = update_meta_with_rotation(
         meta_path,
         last_update_kworb,
         spotify_data_date,
-        data_type="albums"
+        data_type="albums",
+        snapshot_changed=snapshot_changed
     )
     
     print(f"💾 meta.json mis à jour (albums)")
@@ -314,28 +343,33 @@ def regenerate_current_view(base_path: Path):
 def main():
     """Point d'entrée principal."""
     base_path = Path(__file__).parent.parent
+    artist = current_artist(base_path)
     
     print("="*60)
-    print("💿 Scraper Kworb Albums — The Weeknd Dashboard")
+    print(f"💿 Scraper Kworb Albums — {artist.name}")
     print("="*60)
     
     try:
         # 1. Scraper Kworb Albums
+        data_dir(base_path).mkdir(parents=True, exist_ok=True)
         albums, last_update_kworb = scrape_kworb_albums(KWORB_ALBUMS_URL)
         
         # 2. Créer snapshot J
-        spotify_data_date = create_snapshot(albums, last_update_kworb, base_path)
+        spotify_data_date, snapshot_changed = create_snapshot(albums, last_update_kworb, base_path)
         
         # 3. Mettre à jour meta.json
-        update_meta(spotify_data_date, last_update_kworb, base_path)
+        update_meta(spotify_data_date, last_update_kworb, base_path, snapshot_changed)
         
-        # 4. Régénérer data/albums.json
-        regenerate_current_view(base_path)
+        # 4. Régénérer data/albums.json (inutile si le snapshot J est inchangé)
+        if snapshot_changed or not (data_dir(base_path) / "albums.json").exists():
+            regenerate_current_view(base_path)
+        else:
+            print("⏭️  Snapshot inchangé, vue courante data/albums.json conservée")
         
         print("\n" + "="*60)
         print("✅ Scraping Albums terminé avec succès!")
         print("="*60)
-        
+    
     except Exception as e:
         print("\n" + "="*60)
         print(f"❌ Erreur critique : {e}")
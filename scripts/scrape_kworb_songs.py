@@ -4,13 +4,13 @@ Scraper Kworb pour les chansons de The Weeknd.
 Génère un snapshot journalier et régénère data/songs.json avec calculs.
 """
 
-import json
 import re
 import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 import sys
+from urllib.parse import urlparse
 
 try:
     import requests
@@ -20,6 +20,8 @@ except ImportError:
     print("   pip install requests beautifulsoup4")
     sys.exit(1)
 
+from json_io import dump_json, load_json
+
 # Importer le gestionnaire de dates
 from date_manager import (
     extract_kworb_last_update,
@@ -29,14 +31,19 @@ from date_manager import (
     log_rotation_decision,
     should_rotate
 )
+from resilience import get_resilience, is_host_failure
+from records import SongRecord
+from artists import DEFAULT_ARTIST_NAME, current_artist, data_dir, kworb_url
 
 
 # Configuration
-KWORB_SONGS_URL = "https://kworb.net/spotify/artist/1Xyo4u8uXC1ZmMpatF05PJ_songs.html"
+KWORB_SONGS_URL = kworb_url("songs")  # Artiste courant (ARTIST_ID)
 USER_AGENT = "The-Weeknd-Dashboard/1.0 (Educational Project; Python Scraper)"
 THROTTLE_SECONDS = 1.0
 MAX_RETRIES = 3
 RETRY_BACKOFF = 2.0
+CONNECT_TIMEOUT = 5  # Hôte injoignable : échec en 5 s au lieu de 30
+READ_TIMEOUT = 30
 
 
 def normalize_text(text: str) -> str:
@@ -87,13 +94,13 @@ def generate_song_id(title: str, album: str) -> str:
     return f"kworb:{norm_title}@{norm_album}"
 
 
-def detect_role(title: str) -> str:
+def detect_role(title: str, artist_name: str = DEFAULT_ARTIST_NAME) -> str:
     """
-    Détecte le rôle de The Weeknd sur un titre.
+    Détecte le rôle de l'artiste (The Weeknd par défaut) sur un titre.
     
     Heuristique simple :
-    - Si "The Weeknd" apparaît en premier (ou seul) → "lead"
-    - Si "feat.", "with", "x", "&" avant "The Weeknd" → "feat"
+    - Si l'artiste apparaît en premier (ou seul) → "lead"
+    - Si "feat.", "with", "x", "&" avant l'artiste → "feat"
     """
     title_lower = title.lower()
     
@@ -102,11 +109,11 @@ def detect_role(title: str) -> str:
     
     for pattern in feat_patterns:
         if pattern in title_lower:
-            # Vérifier si The Weeknd est après le pattern
+            # Vérifier si l'artiste est après le pattern
             pattern_pos = title_lower.find(pattern)
-            weeknd_pos = title_lower.find("the weeknd")
+            artist_pos = title_lower.find(artist_name.lower())
             
-            if weeknd_pos > pattern_pos:
+            if artist_pos > pattern_pos:
                 return "feat"
     
     # Par défaut, considérer comme lead
@@ -158,12 +165,153 @@ def parse_kworb_date(date_str: str) -> datetime:
     return datetime.now(timezone.utc)
 
 
-def scrape_kworb_songs(url: str, retries: int = MAX_RETRIES) -> Tuple[List[Dict], datetime, Dict]:
+def parse_kworb_songs_html(html: str, artist_name: str = DEFAULT_ARTIST_NAME) -> Tuple[List[SongRecord], Optional[datetime], Dict]:
+    """
+    Parse le HTML d'une page Kworb Songs (page live ou archive).
+    artist_name : artiste de la page (détection lead/feat).
+    
+    Returns:
+        Tuple[List[SongRecord], Optional[datetime], Dict]: (chansons, timestamp Kworb ou None, stats lead/feat)
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    
+    # Extraire les stats Lead/Feat depuis la table des stats agrégées
+    role_stats = {"lead": {}, "feat": {}}
+    
+    # Trouver toutes les tables
+    tables = soup.find_all('table')
+    
+    # La première table (avant sortable) contient les stats agrégées
+    stats_table = None
+    for t in tables:
+        if 'sortable' not in t.get('class', []):
+            stats_table = t
+            break
+    
+    if stats_table:
+        rows = stats_table.find_all('tr')
+        # rows[0] = header (Total, As lead, Solo, As feature)
+        # rows[1] = Streams
+        # rows[2] = Daily
+        # rows[3] = Tracks
+        
+        if len(rows) >= 4:
+            # Extraire les valeurs des colonnes : col[1]=Total, col[2]=As lead, col[3]=Solo, col[4]=As feature
+            tracks_row = rows[3].find_all('td')
+            streams_row = rows[1].find_all('td')
+            daily_row = rows[2].find_all('td')
+            
+            if len(tracks_row) >= 5 and len(streams_row) >= 5 and len(daily_row) >= 5:
+                # As lead : col[2]
+                role_stats["lead"] = {
+                    "count": int(tracks_row[2].get_text(strip=True).replace(',', '')),
+                    "streams_total": clean_number(streams_row[2].get_text(strip=True)),
+                    "streams_daily": clean_number(daily_row[2].get_text(strip=True))
+                }
+                
+                # As feature : col[4]
+                role_stats["feat"] = {
+                    "count": int(tracks_row[4].get_text(strip=True).replace(',', '')),
+                    "streams_total": clean_number(streams_row[4].get_text(strip=True)),
+                    "streams_daily": clean_number(daily_row[4].get_text(strip=True))
+                }
+                
+                print(f"[Stats] Lead/Feat extraites : Lead={role_stats['lead']['count']} songs, Feat={role_stats['feat']['count']} songs")
+            else:
+                print("[WARN] Impossible d'extraire les stats : colonnes manquantes")
+        else:
+            print("[WARN] Impossible d'extraire les stats : lignes manquantes")
+    else:
+        print("[WARN] Table de stats agrégées non trouvée")
+    
+    # Trouver la table des chansons (la table avec class 'sortable')
+    table = None
+    for t in tables:
+        if 'sortable' in t.get('class', []):
+            table = t
+            break
+    
+    if not table:
+        raise ValueError("Table de chansons non trouvée sur la page")
+    
+    rows = table.find_all('tr')[1:]  # Skip header
+    
+    if not rows:
+        raise ValueError("Aucune ligne de données trouvée dans la table")
+    
+    songs = []
+    seen_ids = {}  # Pour gérer les doublons temporaires
+    
+    for i, row in enumerate(rows, start=1):
+        cols = row.find_all('td')
+        
+        # Structure Kworb : [Title, Streams Total, Daily]
+        if len(cols) < 3:
+            continue
+        
+        # Extraction des données
+        rank = i
+        title = cols[0].get_text(strip=True)
+        streams_total_text = cols[1].get_text(strip=True)
+        streams_daily_text = cols[2].get_text(strip=True)
+        
+        # Pas d'info album sur Kworb Songs, on met "Unknown" par défaut
+        # (sera résolu plus tard via Spotify API)
+        album = "Unknown"
+        
+        # Nettoyage et typage
+        streams_total = clean_number(streams_total_text)
+        streams_daily = clean_number(streams_daily_text)
+        
+        # Détection du rôle
+        role = detect_role(title, artist_name)
+        
+        # Génération de l'ID stable (sans rank!)
+        # Format: kworb:<norm_title>@unknown
+        # Si doublon, ajouter suffixe numérique: @unknown-2, @unknown-3, etc.
+        base_id = generate_song_id(title, album)
+        song_id = base_id
+        
+        # Gérer les doublons temporaires (en attendant données Spotify)
+        if song_id in seen_ids:
+            seen_ids[song_id] += 1
+            # Remplacer @unknown par @unknown-N
+            song_id = song_id.replace("@unknown", f"@unknown-{seen_ids[song_id]}")
+        else:
+            seen_ids[song_id] = 1
+        
+        song = SongRecord(
+            id=song_id,
+            rank=rank,
+            title=title,
+            album=album,
+            role=role,
+            streams_total=streams_total,
+            streams_daily=streams_daily
+        )
+        
+        # Filtrer le doublon "XO / The Host" avec 0 streams quotidiens
+        # (conserve uniquement la version avec des streams actifs)
+        if title == "XO / The Host" and streams_daily == 0:
+            print(f"[FILTER] Exclusion doublon: {title} (rang {rank}, 0 streams quotidiens)")
+            continue
+        
+        songs.append(song)
+    
+    print(f"[OK] {len(songs)} chansons extraites avec succès")
+    
+    # Extraire le timestamp "Last updated" depuis le HTML (None si absent)
+    last_update_kworb = extract_kworb_last_update(html)
+    
+    return songs, last_update_kworb, role_stats
+
+
+def scrape_kworb_songs(url: str, retries: int = MAX_RETRIES, artist_name: str = DEFAULT_ARTIST_NAME) -> Tuple[List[SongRecord], datetime, Dict]:
     """
     Scrape la page Kworb Songs et retourne les données brutes + stats role.
     
     Returns:
-        Tuple[List[Dict], datetime, Dict]: (liste des chansons, timestamp, stats lead/feat)
+        Tuple[List[SongRecord], datetime, Dict]: (liste des chansons, timestamp, stats lead/feat)
     """
     headers = {
         "User-Agent": USER_AGENT,
@@ -173,12 +321,19 @@ def scrape_kworb_songs(url: str, retries: int = MAX_RETRIES) -> Tuple[List[Dict]
         "Connection": "keep-alive"
     }
     
+    # Disjoncteur par hôte + budget de retries du cycle (cf. resilience.py)
+    resilience = get_resilience()
+    host = urlparse(url).hostname
+    
     for attempt in range(retries):
         try:
+            # Hôte en panne aux cycles précédents : échec immédiat (CircuitOpenError)
+            resilience.check(host)
             print(f"[GET] Récupération des données depuis Kworb (tentative {attempt + 1}/{retries})...")
             
-            response = requests.get(url, headers=headers, timeout=30)
+            response = requests.get(url, headers=headers, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
             response.raise_for_status()
+            resilience.record_success(host)
             
             # Forcer l'encodage UTF-8 pour éviter les erreurs cp1252 sur Windows
             response.encoding = 'utf-8'
@@ -186,136 +341,7 @@ def scrape_kworb_songs(url: str, retries: int = MAX_RETRIES) -> Tuple[List[Dict]
             # Throttle
             time.sleep(THROTTLE_SECONDS)
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Extraire les stats Lead/Feat depuis la table des stats agrégées
-            role_stats = {"lead": {}, "feat": {}}
-            
-            # Trouver toutes les tables
-            tables = soup.find_all('table')
-            
-            # La première table (avant sortable) contient les stats agrégées
-            stats_table = None
-            for t in tables:
-                if 'sortable' not in t.get('class', []):
-                    stats_table = t
-                    break
-            
-            if stats_table:
-                rows = stats_table.find_all('tr')
-                # rows[0] = header (Total, As lead, Solo, As feature)
-                # rows[1] = Streams
-                # rows[2] = Daily
-                # rows[3] = Tracks
-                
-                if len(rows) >= 4:
-                    # Extraire les valeurs des colonnes : col[1]=Total, col[2]=As lead, col[3]=Solo, col[4]=As feature
-                    tracks_row = rows[3].find_all('td')
-                    streams_row = rows[1].find_all('td')
-                    daily_row = rows[2].find_all('td')
-                    
-                    if len(tracks_row) >= 5 and len(streams_row) >= 5 and len(daily_row) >= 5:
-                        # As lead : col[2]
-                        role_stats["lead"] = {
-                            "count": int(tracks_row[2].get_text(strip=True).replace(',', '')),
-                            "streams_total": clean_number(streams_row[2].get_text(strip=True)),
-                            "streams_daily": clean_number(daily_row[2].get_text(strip=True))
-                        }
-                        
-                        # As feature : col[4]
-                        role_stats["feat"] = {
-                            "count": int(tracks_row[4].get_text(strip=True).replace(',', '')),
-                            "streams_total": clean_number(streams_row[4].get_text(strip=True)),
-                            "streams_daily": clean_number(daily_row[4].get_text(strip=True))
-                        }
-                        
-                        print(f"[Stats] Lead/Feat extraites : Lead={role_stats['lead']['count']} songs, Feat={role_stats['feat']['count']} songs")
-                    else:
-                        print("[WARN] Impossible d'extraire les stats : colonnes manquantes")
-                else:
-                    print("[WARN] Impossible d'extraire les stats : lignes manquantes")
-            else:
-                print("[WARN] Table de stats agrégées non trouvée")
-            
-            # Trouver la table des chansons (la table avec class 'sortable')
-            table = None
-            for t in tables:
-                if 'sortable' in t.get('class', []):
-                    table = t
-                    break
-            
-            if not table:
-                raise ValueError("Table de chansons non trouvée sur la page")
-            
-            rows = table.find_all('tr')[1:]  # Skip header
-            
-            if not rows:
-                raise ValueError("Aucune ligne de données trouvée dans la table")
-            
-            songs = []
-            last_update_kworb = datetime.now(timezone.utc)  # Par défaut
-            seen_ids = {}  # Pour gérer les doublons temporaires
-            
-            for i, row in enumerate(rows, start=1):
-                cols = row.find_all('td')
-                
-                # Structure Kworb : [Title, Streams Total, Daily]
-                if len(cols) < 3:
-                    continue
-                
-                # Extraction des données
-                rank = i
-                title = cols[0].get_text(strip=True)
-                streams_total_text = cols[1].get_text(strip=True)
-                streams_daily_text = cols[2].get_text(strip=True)
-                
-                # Pas d'info album sur Kworb Songs, on met "Unknown" par défaut
-                # (sera résolu plus tard via Spotify API)
-                album = "Unknown"
-                
-                # Nettoyage et typage
-                streams_total = clean_number(streams_total_text)
-                streams_daily = clean_number(streams_daily_text)
-                
-                # Détection du rôle
-                role = detect_role(title)
-                
-                # Génération de l'ID stable (sans rank!)
-                # Format: kworb:<norm_title>@unknown
-                # Si doublon, ajouter suffixe numérique: @unknown-2, @unknown-3, etc.
-                base_id = generate_song_id(title, album)
-                song_id = base_id
-                
-                # Gérer les doublons temporaires (en attendant données Spotify)
-                if song_id in seen_ids:
-                    seen_ids[song_id] += 1
-                    # Remplacer @unknown par @unknown-N
-                    song_id = song_id.replace("@unknown", f"@unknown-{seen_ids[song_id]}")
-                else:
-                    seen_ids[song_id] = 1
-                
-                song = {
-                    "id": song_id,
-                    "rank": rank,
-                    "title": title,
-                    "album": album,
-                    "role": role,
-                    "streams_total": streams_total,
-                    "streams_daily": streams_daily
-                }
-                
-                # Filtrer le doublon "XO / The Host" avec 0 streams quotidiens
-                # (conserve uniquement la version avec des streams actifs)
-                if title == "XO / The Host" and streams_daily == 0:
-                    print(f"[FILTER] Exclusion doublon: {title} (rang {rank}, 0 streams quotidiens)")
-                    continue
-                
-                songs.append(song)
-            
-            print(f"[OK] {len(songs)} chansons extraites avec succès")
-            
-            # Extraire le timestamp "Last updated" depuis le HTML
-            last_update_kworb = extract_kworb_last_update(response.text)
+            songs, last_update_kworb, role_stats = parse_kworb_songs_html(response.text, artist_name)
             
             # Fallback : si extraction échoue, utiliser datetime.now(UTC)
             if last_update_kworb is None:
@@ -323,10 +349,12 @@ def scrape_kworb_songs(url: str, retries: int = MAX_RETRIES) -> Tuple[List[Dict]
                 last_update_kworb = datetime.now(timezone.utc)
             
             return songs, last_update_kworb, role_stats
-            
+        
         except requests.RequestException as e:
             print(f"[ERROR] Erreur réseau (tentative {attempt + 1}/{retries}): {e}")
-            if attempt < retries - 1:
+            if is_host_failure(e):
+                resilience.record_failure(host, e)
+            if attempt < retries - 1 and resilience.allow_retry(host):
                 wait_time = RETRY_BACKOFF ** attempt
                 print(f"[WAIT] Nouvelle tentative dans {wait_time}s...")
                 time.sleep(wait_time)
@@ -337,7 +365,7 @@ def scrape_kworb_songs(url: str, retries: int = MAX_RETRIES) -> Tuple[List[Dict]
             raise
 
 
-def create_snapshot(songs: List[Dict], last_update_kworb: datetime, base_path: Path) -> str:
+def create_snapshot(songs: List[SongRecord], last_update_kworb: datetime, base_path: Path) -> Tuple[str, bool]:
     """
     Crée un snapshot journalier dans data/history/songs/ avec rotation intelligente J/J-1/J-2.
     
@@ -347,16 +375,15 @@ def create_snapshot(songs: List[Dict], last_update_kworb: datetime, base_path: P
     - Mettre à jour meta.json
     
     Returns:
-        str: La date spotify_data_date (YYYY-MM-DD)
+        Tuple[str, bool]: (spotify_data_date YYYY-MM-DD, snapshot modifié ?)
     """
     # Calculer spotify_data_date = kworb_day - 1 jour
     spotify_data_date = calculate_spotify_data_date(last_update_kworb)
     
     # Charger meta.json pour vérifier s'il faut rotate
-    meta_path = base_path / "data" / "meta.json"
+    meta_path = data_dir(base_path) / "meta.json"
     if meta_path.exists():
-        with open(meta_path, "r", encoding="utf-8") as f:
-            meta = json.load(f)
+        meta = load_json(meta_path)
     else:
         meta = {"history": {}}
     
@@ -367,42 +394,46 @@ def create_snapshot(songs: List[Dict], last_update_kworb: datetime, base_path: P
     log_rotation_decision(last_update_kworb, spotify_data_date, previous_date, rotated)
     
     # Enrichir chaque chanson avec les timestamps
-    snapshot_songs = []
-    for song in songs:
-        snapshot_song = {
-            **song,
-            "last_update_kworb": last_update_kworb.isoformat(),
-            "spotify_data_date": spotify_data_date
-        }
-        snapshot_songs.append(snapshot_song)
+    last_update_iso = last_update_kworb.isoformat()
+    snapshot_songs = [
+        song._replace(last_update_kworb=last_update_iso, spotify_data_date=spotify_data_date)
+        for song in songs
+    ]
     
     # Effectuer la rotation atomique (idempotente)
-    success = rotate_snapshots_atomic(
+    result = rotate_snapshots_atomic(
         base_path,
         "songs",
         spotify_data_date,
         snapshot_songs
     )
     
-    if not success:
+    if not result["success"]:
         print("[ERROR] Échec de la rotation des snapshots")
     
-    return spotify_data_date
+    return spotify_data_date, result["changed"]
 
 
-def update_meta(spotify_data_date: str, last_update_kworb: datetime, role_stats: Dict, base_path: Path):
+def update_meta(
+    spotify_data_date: str,
+    last_update_kworb: datetime,
+    role_stats: Dict,
+    base_path: Path,
+    snapshot_changed: Optional[bool] = None
+):
     """
     Met à jour data/meta.json avec les nouvelles informations + stats Lead/Feat.
     Utilise le date_manager pour gérer history de façon cohérente.
     """
-    meta_path = base_path / "data" / "meta.json"
+    meta_path = data_dir(base_path) / "meta.json"
     
     # Utiliser le gestionnaire pour mettre à jour meta.json
     meta = update_meta_with_rotation(
         meta_path,
         last_update_kworb,
         spotify_data_date,
-        data_type="songs"
+        data_type="songs",
+        snapshot_changed=snapshot_changed
     )
     
     # Ajouter les stats Lead/Feat extraites de Kworb
@@ -411,8 +442,7 @@ def update_meta(spotify_data_date: str, last_update_kworb: datetime, role_stats:
         print(f"[Stats] Lead/Feat ajoutées à meta.json : Lead={role_stats.get('lead', {}).get('count', 'N/A')}, Feat={role_stats.get('feat', {}).get('count', 'N/A')}")
         
         # Sauvegarder à nouveau avec les stats
-        with open(meta_path, "w", encoding="utf-8") as f:
-            json.dump(meta, f, indent=2, ensure_ascii=False)
+        dump_json(meta_path, meta)
     
     print(f"[SAVE] meta.json mis à jour")
     available_dates = meta.get("history", {}).get("available_dates", [])
@@ -448,28 +478,33 @@ def regenerate_current_view(base_path: Path):
 def main():
     """Point d'entrée principal."""
     base_path = Path(__file__).parent.parent
+    artist = current_artist(base_path)
     
     print("="*60)
-    print("[SCRAPER] Kworb Songs - The Weeknd Dashboard")
+    print(f"[SCRAPER] Kworb Songs - {artist.name}")
     print("="*60)
     
     try:
         # 1. Scraper Kworb
-        songs, last_update_kworb, role_stats = scrape_kworb_songs(KWORB_SONGS_URL)
+        data_dir(base_path).mkdir(parents=True, exist_ok=True)
+        songs, last_update_kworb, role_stats = scrape_kworb_songs(KWORB_SONGS_URL, artist_name=artist.name)
         
         # 2. Créer snapshot J
-        spotify_data_date = create_snapshot(songs, last_update_kworb, base_path)
+        spotify_data_date, snapshot_changed = create_snapshot(songs, last_update_kworb, base_path)
         
         # 3. Mettre à jour meta.json avec les stats Lead/Feat
-        update_meta(spotify_data_date, last_update_kworb, role_stats, base_path)
+        update_meta(spotify_data_date, last_update_kworb, role_stats, base_path, snapshot_changed)
         
-        # 4. Régénérer data/songs.json
-        regenerate_current_view(base_path)
+        # 4. Régénérer data/songs.json (inutile si le snapshot J est inchangé)
+        if snapshot_changed or not (data_dir(base_path) / "songs.json").exists():
+            regenerate_current_view(base_path)
+        else:
+            print("[SKIP] Snapshot inchangé, vue courante data/songs.json conservée")
         
         print("\n" + "="*60)
         print("[OK] Scraping terminé avec succès!")
         print("="*60)
-        
+    
     except Exception as e:
         print("\n" + "="*60)
         print(f"[ERROR] Erreur critique : {e}")
@@ -0,0 +1,60 @@
+"""
+Catalogue Spotify local d'un artiste
+Matérialise une fois la discographie (albums + pistes) via quelques appels paginés,
+puis répond aux résolutions de covers par lookup en mémoire (plus de search_track par titre)
+"""
+
+from collections import defaultdict
+from typing import Dict, List
+
+from spotify_client import SpotifyClient
+from cover_resolver import title_index_key
+
+
+class SpotifyCatalog:
+    """Index local titre → pistes (avec album complet) de la discographie d'un artiste"""
+    
+    def __init__(self, client: SpotifyClient, artist_id: str):
+        self.client = client
+        self.artist_id = artist_id
+        self.albums: Dict[str, Dict] = {}
+        self._tracks_by_title: Dict[str, List[Dict]] = defaultdict(list)
+        self.loaded = False
+    
+    def load(self) -> int:
+        """
+        Charge la discographie : liste paginée des albums puis détails par lots de 20
+        (albums?ids= inclut les 50 premières pistes de chaque album)
+        
+        Returns:
+            Nombre de pistes indexées
+        """
+        album_ids = [album["id"] for album in self.client.get_artist_albums(self.artist_id) if album.get("id")]
+        self.albums = self.client.get_albums(album_ids)
+        
+        track_count = 0
+        for album in self.albums.values():
+            tracks_page = album.get("tracks", {})
+            tracks = list(tracks_page.get("items", []))
+            if tracks_page.get("next"):
+                tracks.extend(self.client.get_album_tracks(album["id"], offset=len(tracks)))
+            
+            # Album sans la liste des pistes : même forme que track["album"] d'une recherche
+            album_summary = {key: value for key, value in album.items() if key != "tracks"}
+            
+            for track in tracks:
+                if not track or not track.get("name"):
+                    continue
+                self._tracks_by_title[title_index_key(track["name"])].append({**track, "album": album_summary})
+                track_count += 1
+        
+        self.loaded = True
+        print(f"OK Catalogue artiste: {len(self.albums)} albums, {track_count} pistes indexees")
+        return track_count
+    
+    def find_tracks(self, title: str) -> List[Dict]:
+        """
+        Pistes du catalogue dont le titre normalisé correspond
+        Même forme que les résultats de SpotifyClient.search_track
+        """
+        return list(self._tracks_by_title.get(title_index_key(title), []))
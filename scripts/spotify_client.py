@@ -7,129 +7,368 @@ Client Spotify API avec Client C            try:
 Cache des réponses + gestion rate limiting (429)
 """
 
+import atexit
 import os
 import time
 import json
 import hashlib
+import threading
 import requests
 from pathlib import Path
-from typing import Optional, Dict, List, Any
+from typing import Optional, Dict, List, Any, Set
+
+from file_lock import file_lock
+from json_io import dump_json, load_json
+from token_broker import TokenBroker
+from resilience import CircuitOpenError, Resilience, get_resilience, is_host_failure
+
+
+# Marqueur d'un échec mémorisé dans le cache négatif
+CACHED_FAILURE = object()
+
+
+class CachedFailureError(Exception):
+    """Requête en échec récemment : non réémise avant ERROR_TTL_SECONDS"""
+    
+    def __init__(self, endpoint: str):
+        super().__init__(f"Echec recent en cache pour '{endpoint}'")
+        self.endpoint = endpoint
+
+
+class RateLimitError(Exception):
+    """Rate limit persistant (tentatives ou budget de retries épuisés)"""
+
+
+class RetryPolicy:
+    """
+    Politique de retry des clients Spotify synchrone et asynchrone (seule implémentation) :
+    - disjoncteur vérifié avant chaque tentative
+    - 429 : attente Retry-After, disjoncteur ouvert au-delà de max_retry_after
+    - erreur réseau / HTTP : backoff exponentiel (1, 2, 4 s)
+    - chaque retry consomme le budget du cycle
+    Les clients n'implémentent que la boucle (time.sleep ou asyncio.sleep).
+    """
+    
+    MAX_ATTEMPTS = 3
+    
+    def __init__(self, resilience: Resilience, host: str, max_retry_after: float):
+        self.resilience = resilience
+        self.host = host
+        self.max_retry_after = max_retry_after
+    
+    def attempts(self) -> range:
+        """Numéros des tentatives"""
+        return range(self.MAX_ATTEMPTS)
+    
+    def before_attempt(self):
+        """Lève CircuitOpenError si l'hôte est en panne"""
+        self.resilience.check(self.host)
+    
+    def on_response(self, response: requests.Response) -> Optional[float]:
+        """
+        Délai avant nouvelle tentative (429), ou None si la réponse est exploitable
+        Lève HTTPError (4xx/5xx, à passer à on_error), CircuitOpenError ou RateLimitError
+        """
+        if response.status_code == 429:
+            retry_after = int(response.headers.get("Retry-After", 2))
+            if retry_after > self.max_retry_after:
+                self.resilience.trip(self.host, retry_after, f"Rate limit (Retry-After {retry_after}s)")
+                raise CircuitOpenError(self.host, time.time() + retry_after)
+            if not self.resilience.allow_retry(self.host):
+                raise self.exhausted()
+            print(f"⏳ Rate limit atteint, attente {retry_after}s...")
+            return retry_after
+        
+        response.raise_for_status()
+        self.resilience.record_success(self.host)
+        return None
+    
+    def on_error(self, error: requests.exceptions.RequestException, attempt: int) -> float:
+        """Délai de backoff avant nouvelle tentative ; relève l'erreur sans tentative ni budget restant"""
+        if is_host_failure(error):
+            self.resilience.record_failure(self.host, error)
+        if attempt == self.MAX_ATTEMPTS - 1 or not self.resilience.allow_retry(self.host):
+            raise error
+        print(f"WARNING Tentative {attempt + 1}/{self.MAX_ATTEMPTS} echouee: {error}")
+        return 2 ** attempt  # Backoff exponentiel
+    
+    def exhausted(self) -> Exception:
+        """Erreur finale quand le rate limit persiste"""
+        return RateLimitError(f"Rate limit persistant apres {self.MAX_ATTEMPTS} tentatives")
 
 
 class SpotifyClient:
     """Client Spotify API avec cache et rate limiting"""
     
     BASE_URL = "https://api.spotify.com/v1"
-    AUTH_URL = "https://accounts.spotify.com/api/token"
+    API_HOST = "api.spotify.com"
+    MAX_ALBUMS_PER_REQUEST = 20  # Limite de l'endpoint albums?ids=
+    MAX_RETRY_AFTER_SECONDS = 30  # Au-delà : disjoncteur ouvert plutôt que dormir
+    
+    # Cache négatif : recherches sans résultat / requêtes en échec
+    NEGATIVE_TTL_SECONDS = 24 * 3600  # Aucun résultat : réessayer dans 24h
+    ERROR_TTL_SECONDS = 15 * 60       # Erreur API : réessayer dans 15 min
     
-    def __init__(self, client_id: str, client_secret: str, market: str = "US"):
+    # Sauvegarde groupée des caches (une écriture pour N entrées, pas par requête)
+    SAVE_EVERY_ENTRIES = 50
+    
+    def __init__(self, client_id: str, client_secret: str, market: str = "US",
+                 token_broker: Optional[TokenBroker] = None, cache_dir: Optional[Path] = None):
         self.client_id = client_id
         self.client_secret = client_secret
         self.market = market
         self.access_token: Optional[str] = None
         self.token_expires_at: float = 0
         
-        # Cache directory
-        self.cache_dir = Path(__file__).parent.parent / "data" / "cache"
+        # Cache directory (partagé par tous les artistes)
+        self.cache_dir = cache_dir or Path(__file__).parent.parent / "data" / "cache"
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Token partagé entre processus/cycles (évite un POST auth à chaque run)
+        self.token_broker = token_broker or TokenBroker(
+            client_id, client_secret, self.cache_dir / ".spotify_token.json"
+        )
         self.cache_file = self.cache_dir / "spotify_api_cache.json"
         self.cache: Dict[str, Any] = self._load_cache()
+        self.negative_cache_file = self.cache_dir / "spotify_negative_cache.json"
+        self.negative_cache: Dict[str, Dict] = self._load_negative_cache()
+        # Caches écrits par les enrichissements d'artistes lancés en parallèle :
+        # clés modifiées par ce client depuis la dernière sauvegarde (fusion)
+        self.cache_lock_file = self.cache_dir / "spotify_api_cache.lock"
+        self._new_entries: Set[str] = set()
+        self._new_negative: Set[str] = set()
+        self._resolved: Set[str] = set()
+        # Caches modifiés par les threads du coalescing : mutations et sauvegardes sérialisées
+        self._cache_lock = threading.RLock()
+        atexit.register(self.flush_cache)
+        
+        # Disjoncteurs par hôte + budget de retries du cycle
+        self.resilience = get_resilience()
+        self.retry_policy = RetryPolicy(self.resilience, self.API_HOST, self.MAX_RETRY_AFTER_SECONDS)
+        
+        # Requêtes identiques en cours (coalescing entre threads)
+        self._inflight: Dict[str, "_InflightRequest"] = {}
+        self._inflight_lock = threading.Lock()
     
     def _load_cache(self) -> Dict[str, Any]:
         """Charge le cache depuis le fichier JSON"""
         if self.cache_file.exists():
             try:
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                return load_json(self.cache_file)
             except Exception as e:
                 print(f"WARNING Erreur chargement cache: {e}")
         return {}
     
     def _save_cache(self):
-        """Sauvegarde le cache dans le fichier JSON"""
-        cache_path = Path("data/cache/spotify_api_cache.json")
-        cache_path.parent.mkdir(parents=True, exist_ok=True)
-        
+        """
+        Sauvegarde le cache dans le fichier JSON
+        Fusion sous verrou avec la version disque : seules les entrées ajoutées par
+        ce client sont écrites, celles d'un autre processus (autre artiste) sont conservées
+        """
         try:
-            with open(cache_path, 'w', encoding='utf-8') as f:
-                json.dump(self.cache, f, indent=2)
+            with file_lock(self.cache_lock_file, label="cache Spotify"):
+                merged = self._load_cache()
+                merged.update({key: self.cache[key] for key in self._new_entries})
+                dump_json(self.cache_file, merged)
+            self.cache = merged
+            self._new_entries.clear()
         except Exception as e:
             print(f"WARNING Erreur sauvegarde cache: {e}")
     
-    def _cache_key(self, endpoint: str, params: Dict) -> str:
+    def _load_negative_cache(self) -> Dict[str, Dict]:
+        """Charge le cache négatif en purgeant les entrées expirées"""
+        if not self.negative_cache_file.exists():
+            return {}
+        
+        try:
+            entries = load_json(self.negative_cache_file)
+        except Exception as e:
+            print(f"WARNING Erreur chargement cache negatif: {e}")
+            return {}
+        
+        now = time.time()
+        return {key: entry for key, entry in entries.items() if entry.get("expires_at", 0) > now}
+    
+    def _save_negative_cache(self):
+        """
+        Sauvegarde le cache négatif dans son propre fichier JSON
+        Même fusion sous verrou que _save_cache : entrées ajoutées et entrées
+        résolues depuis (désormais dans le cache positif) par ce client uniquement
+        """
+        try:
+            with file_lock(self.cache_lock_file, label="cache Spotify"):
+                merged = self._load_negative_cache()
+                merged.update({key: self.negative_cache[key] for key in self._new_negative if key in self.negative_cache})
+                for cache_key in self._resolved:
+                    merged.pop(cache_key, None)
+                dump_json(self.negative_cache_file, merged)
+            self.negative_cache = merged
+            self._new_negative.clear()
+            self._resolved.clear()
+        except Exception as e:
+            print(f"WARNING Erreur sauvegarde cache negatif: {e}")
+    
+    def _is_empty_result(self, endpoint: str, data: Dict) -> bool:
+        """Une recherche est vide si aucune de ses sections ne contient d'items"""
+        if endpoint != "search":
+            return False
+        sections = [value for value in data.values() if isinstance(value, dict) and "items" in value]
+        return bool(sections) and not any(section["items"] for section in sections)
+    
+    def cached_response(self, cache_key: str) -> Any:
+        """
+        Réponse en cache (positive, ou recherche vide non expirée), sinon None
+        Échec mémorisé non expiré : CACHED_FAILURE (distinct d'une vraie réponse)
+        """
+        if cache_key in self.cache:
+            return self.cache[cache_key]
+        
+        entry = self.negative_cache.get(cache_key)
+        if entry and entry["expires_at"] > time.time():
+            return entry["data"] if "data" in entry else CACHED_FAILURE
+        
+        return None
+    
+    def store_response(self, endpoint: str, cache_key: str, data: Dict, save: bool = True):
+        """
+        Met en cache une réponse (cache négatif à TTL court si recherche vide)
+        Sauvegarde groupée : toutes les SAVE_EVERY_ENTRIES entrées, sinon flush_cache()
+        """
+        with self._cache_lock:
+            if self._is_empty_result(endpoint, data):
+                self.negative_cache[cache_key] = {
+                    "reason": "empty",
+                    "expires_at": time.time() + self.NEGATIVE_TTL_SECONDS,
+                    "data": data
+                }
+                self._new_negative.add(cache_key)
+            else:
+                self.cache[cache_key] = data
+                self._new_entries.add(cache_key)
+                if self.negative_cache.pop(cache_key, None) is not None:
+                    self._resolved.add(cache_key)
+            
+            if save:
+                self._flush_if_full()
+    
+    def store_failure(self, cache_key: str, error: Exception, save: bool = True):
+        """Mémorise un échec de requête pour ne pas la réémettre avant ERROR_TTL_SECONDS"""
+        with self._cache_lock:
+            self.negative_cache[cache_key] = {
+                "reason": f"error: {str(error)[:100]}",
+                "expires_at": time.time() + self.ERROR_TTL_SECONDS
+            }
+            self._new_negative.add(cache_key)
+            if save:
+                self._flush_if_full()
+    
+    def _flush_if_full(self):
+        """Sauvegarde dès que SAVE_EVERY_ENTRIES entrées sont en attente"""
+        pending = len(self._new_entries) + len(self._new_negative) + len(self._resolved)
+        if pending >= self.SAVE_EVERY_ENTRIES:
+            self.flush_cache()
+    
+    def flush_cache(self):
+        """Sauvegarde les entrées en attente (à appeler en fin de run, aussi enregistré via atexit)"""
+        with self._cache_lock:
+            if self._new_entries:
+                self._save_cache()
+            if self._new_negative or self._resolved:
+                self._save_negative_cache()
+    
+    def cache_key(self, endpoint: str, params: Dict) -> str:
         """Génère une clé de cache MD5 unique"""
         key_str = f"{endpoint}:{json.dumps(params, sort_keys=True)}"
         return hashlib.md5(key_str.encode()).hexdigest()
     
-    def _get_access_token(self) -> str:
-        """Obtient un access token via Client Credentials Flow"""
+    def get_access_token(self) -> str:
+        """Obtient un access token (Client Credentials Flow) via le broker partagé"""
         # Réutiliser le token si encore valide
         if self.access_token and time.time() < self.token_expires_at:
             return self.access_token
         
-        # Requête nouveau token
-        response = requests.post(
-            self.AUTH_URL,
-            data={"grant_type": "client_credentials"},
-            auth=(self.client_id, self.client_secret),
-            timeout=10
-        )
-        response.raise_for_status()
-        
-        data = response.json()
-        self.access_token = data["access_token"]
-        # Expiration avec marge de sécurité (5 min avant)
-        self.token_expires_at = time.time() + data["expires_in"] - 300
+        # Token persisté par un autre processus, ou rafraîchi une seule fois
+        self.access_token, self.token_expires_at = self.token_broker.get_token()
         
         return self.access_token
     
     def _request(self, endpoint: str, params: Optional[Dict] = None, use_cache: bool = True) -> Dict:
-        """Effectue une requête à l'API Spotify avec retry sur 429"""
+        """
+        Effectue une requête à l'API Spotify avec retry sur 429
+        - Cache positif + cache négatif (recherches vides, erreurs)
+        - Requêtes identiques simultanées fusionnées (une seule requête HTTP)
+        """
         params = params or {}
         params["market"] = self.market
         
         # Vérifier le cache
-        cache_key = self._cache_key(endpoint, params)
-        if use_cache and cache_key in self.cache:
-            return self.cache[cache_key]
+        cache_key = self.cache_key(endpoint, params)
+        if use_cache:
+            cached = self.cached_response(cache_key)
+            if cached is CACHED_FAILURE:
+                raise CachedFailureError(endpoint)
+            if cached is not None:
+                return cached
+        
+        # Rejoindre une requête identique déjà en cours
+        with self._inflight_lock:
+            pending = self._inflight.get(cache_key)
+            is_owner = pending is None
+            if is_owner:
+                pending = _InflightRequest()
+                self._inflight[cache_key] = pending
+        
+        if not is_owner:
+            pending.done.wait()
+            if pending.error is not None:
+                raise pending.error
+            return pending.result
         
-        # Requête API avec retry
-        max_retries = 3
-        for attempt in range(max_retries):
+        try:
+            data = self._fetch(endpoint, params)
+            pending.result = data
+            if use_cache:
+                self.store_response(endpoint, cache_key, data)
+            return data
+        except Exception as e:
+            pending.error = e
+            # Disjoncteur ouvert : pas d'appel émis, rien à mémoriser pour cette requête
+            if use_cache and not isinstance(e, CircuitOpenError):
+                self.store_failure(cache_key, e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(cache_key, None)
+            pending.done.set()
+    
+    def request_kwargs(self, endpoint: str, params: Dict, token: str) -> Dict:
+        """Arguments de requests.get pour un endpoint (partagés avec le client async)"""
+        return {
+            "url": f"{self.BASE_URL}/{endpoint}",
+            "headers": {"Authorization": f"Bearer {token}"},
+            "params": params,
+            "timeout": 10
+        }
+    
+    def _fetch(self, endpoint: str, params: Dict) -> Dict:
+        """
+        Requête HTTP brute avec retry (politique RetryPolicy)
+        Échec immédiat si le disjoncteur de l'API est ouvert ; chaque retry consomme le budget du cycle
+        """
+        policy = self.retry_policy
+        for attempt in policy.attempts():
+            policy.before_attempt()
             try:
-                token = self._get_access_token()
-                headers = {"Authorization": f"Bearer {token}"}
-                
-                response = requests.get(
-                    f"{self.BASE_URL}/{endpoint}",
-                    headers=headers,
-                    params=params,
-                    timeout=10
-                )
-                
-                # Gestion rate limiting
-                if response.status_code == 429:
-                    retry_after = int(response.headers.get("Retry-After", 2))
-                    print(f"⏳ Rate limit atteint, attente {retry_after}s...")
-                    time.sleep(retry_after)
-                    continue
-                
-                response.raise_for_status()
-                data = response.json()
-                
-                # Mettre en cache
-                self.cache[cache_key] = data
-                self._save_cache()
-                
-                return data
-                
+                response = requests.get(**self.request_kwargs(endpoint, params, self.get_access_token()))
+                delay = policy.on_response(response)
             except requests.exceptions.RequestException as e:
-                if attempt == max_retries - 1:
-                    raise
-                print(f"WARNING Tentative {attempt + 1}/{max_retries} echouee: {e}")
-                time.sleep(2 ** attempt)  # Backoff exponentiel
+                delay = policy.on_error(e, attempt)
+            
+            if delay is None:
+                return response.json()
+            time.sleep(delay)
         
-        return {}
+        raise policy.exhausted()
     
     def search_track(self, query: str, artist: str = "The Weeknd", limit: int = 10) -> List[Dict]:
         """
@@ -175,6 +414,113 @@ class SpotifyClient:
             print(f"ERREUR recuperation album '{album_id}': {e}")
             return None
     
+    def get_artist_albums(
+        self,
+        artist_id: str,
+        include_groups: str = "album,single,compilation,appears_on"
+    ) -> List[Dict]:
+        """
+        Liste la discographie d'un artiste (pagination par 50)
+        Non mis en cache : les nouvelles sorties doivent apparaître à chaque run
+        
+        Args:
+            artist_id: ID Spotify de l'artiste
+            include_groups: Groupes d'albums à inclure
+        
+        Returns:
+            Liste d'albums simplifiés (sans pistes)
+        """
+        albums = []
+        offset = 0
+        
+        while True:
+            params = {"include_groups": include_groups, "limit": 50, "offset": offset}
+            try:
+                page = self._request(f"artists/{artist_id}/albums", params, use_cache=False)
+            except Exception as e:
+                print(f"ERREUR discographie artiste '{artist_id}' (offset {offset}): {e}")
+                break
+            
+            items = page.get("items", [])
+            albums.extend(items)
+            if not items or not page.get("next"):
+                break
+            offset += len(items)
+        
+        return albums
+    
+    def get_album_tracks(self, album_id: str, offset: int = 0) -> List[Dict]:
+        """
+        Récupère les pistes d'un album à partir d'un offset (albums > 50 pistes)
+        
+        Returns:
+            Liste de pistes simplifiées
+        """
+        tracks = []
+        
+        while True:
+            try:
+                page = self._request(f"albums/{album_id}/tracks", {"limit": 50, "offset": offset})
+            except Exception as e:
+                print(f"ERREUR pistes album '{album_id}' (offset {offset}): {e}")
+                break
+            
+            items = page.get("items", [])
+            tracks.extend(items)
+            if not items or not page.get("next"):
+                break
+            offset += len(items)
+        
+        return tracks
+    
+    def get_albums(self, album_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Récupère plusieurs albums par lots via l'endpoint albums?ids=
+        
+        Chaque album est mis en cache sous la même clé que get_album(),
+        les appels unitaires suivants sont donc servis par le cache.
+        
+        Args:
+            album_ids: IDs Spotify des albums (doublons ignorés)
+        
+        Returns:
+            Dict {album_id: détails de l'album} pour les albums trouvés
+        """
+        albums: Dict[str, Dict] = {}
+        missing = []
+        
+        for album_id in dict.fromkeys(album_ids):
+            cache_key = self.cache_key(f"albums/{album_id}", {"market": self.market})
+            if cache_key in self.cache:
+                albums[album_id] = self.cache[cache_key]
+            else:
+                missing.append(album_id)
+        
+        fetched = 0
+        for start in range(0, len(missing), self.MAX_ALBUMS_PER_REQUEST):
+            batch = missing[start:start + self.MAX_ALBUMS_PER_REQUEST]
+            try:
+                response = self._request("albums", {"ids": ",".join(batch)}, use_cache=False)
+            except Exception as e:
+                print(f"ERREUR recuperation lot de {len(batch)} albums: {e}")
+                continue
+            
+            for album in response.get("albums") or []:
+                # Spotify renvoie null pour un ID inconnu
+                if not album:
+                    continue
+                cache_key = self.cache_key(f"albums/{album['id']}", {"market": self.market})
+                with self._cache_lock:
+                    self.cache[cache_key] = album
+                    self._new_entries.add(cache_key)
+                albums[album["id"]] = album
+                fetched += 1
+        
+        if fetched:
+            self.flush_cache()
+        
+        return albums
+    
     def search_album(self, query: str, artist: str = "The Weeknd", limit: int = 10) -> List[Dict]:
         """
         Recherche un album sur Spotify
@@ -201,3 +547,12 @@ class SpotifyClient:
         except Exception as e:
             print(f"ERREUR recherche album '{query}': {e}")
             return []
+
+
+class _InflightRequest:
+    """Requête en cours partagée entre appelants identiques"""
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Dict = {}
+        self.error: Optional[Exception] = None
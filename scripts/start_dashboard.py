@@ -7,6 +7,7 @@ PIPELINE DE DÉMARRAGE:
    - Le premier cycle démarre immédiatement
    - Affiche un message quand le dashboard est prêt
 2. Lance le serveur HTTP pour visualiser le dashboard
+   (fichiers statiques + API /api/songs, /api/albums : voir dashboard_server.py)
 
 L'orchestrateur gère automatiquement :
 - Scraping Kworb (Songs + Albums)
@@ -21,9 +22,10 @@ import sys
 import os
 import threading
 import time
-import json
 from pathlib import Path
 
+from json_io import load_json
+
 
 def wait_for_first_cycle(base_path: Path, timeout: int = 120):
     """
@@ -37,8 +39,7 @@ def wait_for_first_cycle(base_path: Path, timeout: int = 120):
     while time.time() - start_time < timeout:
         try:
             if meta_path.exists():
-                with open(meta_path, "r", encoding="utf-8") as f:
-                    meta = json.load(f)
+                meta = load_json(meta_path)
                 
                 status = meta.get("last_sync_status")
                 
@@ -164,7 +165,7 @@ def main():
     
     try:
         subprocess.run(
-            [python_exe, "-m", "http.server", str(port)],
+            [python_exe, str(base_path / "scripts" / "dashboard_server.py"), "--port", str(port)],
             cwd=str(server_path),
             check=True
         )
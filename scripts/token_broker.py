@@ -0,0 +1,133 @@
+"""
+Broker de token Spotify partagé entre processus et cycles
+Le token Client Credentials (valide 1h) est persisté dans un fichier local protégé (0600)
+et réutilisé par tous les processus (enrich_covers, orchestrateurs) tant qu'il est valide.
+Rafraîchissement en single-flight : verrou threading dans le processus + fichier verrou entre processus.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, Tuple
+
+import requests
+
+from json_io import dumps, load_json
+from file_lock import file_lock
+from resilience import get_resilience, is_host_failure
+
+
+class TokenBroker:
+    """Fournit un access token Spotify valide, persisté et partagé"""
+    
+    AUTH_URL = "https://accounts.spotify.com/api/token"
+    AUTH_HOST = "accounts.spotify.com"
+    REFRESH_MARGIN_SECONDS = 300  # Expiration avec marge de sécurité (5 min avant)
+    LOCK_TIMEOUT_SECONDS = 15     # Attente max d'un rafraîchissement concurrent
+    LOCK_STALE_SECONDS = 60       # Verrou plus vieux = processus mort
+    
+    def __init__(self, client_id: str, client_secret: str, store_path: Path):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.store_path = store_path
+        self.lock_path = store_path.with_name(store_path.name + ".lock")
+        # Le store ne contient jamais le client_id en clair
+        self.client_key = hashlib.sha256(client_id.encode("utf-8")).hexdigest()[:16]
+        
+        self._token: Optional[str] = None
+        self._expires_at: float = 0
+        self._thread_lock = threading.Lock()
+    
+    def get_token(self) -> Tuple[str, float]:
+        """
+        Retourne (access_token, expires_at) : mémoire, sinon store partagé,
+        sinon un seul rafraîchissement pour tous les appelants concurrents
+        """
+        if self._is_valid(self._expires_at):
+            return self._token, self._expires_at
+        
+        with self._thread_lock:
+            # Un autre thread a pu rafraîchir pendant l'attente du verrou
+            if self._is_valid(self._expires_at) or self._load_store():
+                return self._token, self._expires_at
+            
+            with self._file_lock():
+                # Un autre processus a pu rafraîchir pendant l'attente du verrou
+                if self._load_store():
+                    return self._token, self._expires_at
+                
+                self._refresh()
+                return self._token, self._expires_at
+    
+    def _is_valid(self, expires_at: float) -> bool:
+        return time.time() < expires_at
+    
+    def _load_store(self) -> bool:
+        """Charge le token persisté s'il correspond aux credentials et est encore valide"""
+        try:
+            data = load_json(self.store_path)
+        except Exception:
+            return False
+        
+        if data.get("client_key") != self.client_key or not self._is_valid(data.get("expires_at", 0)):
+            return False
+        
+        self._token = data["access_token"]
+        self._expires_at = data["expires_at"]
+        return True
+    
+    def _refresh(self):
+        """Requête d'un nouveau token (Client Credentials Flow) puis persistance"""
+        resilience = get_resilience()
+        resilience.check(self.AUTH_HOST)
+        try:
+            response = requests.post(
+                self.AUTH_URL,
+                data={"grant_type": "client_credentials"},
+                auth=(self.client_id, self.client_secret),
+                timeout=10
+            )
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            if is_host_failure(e):
+                resilience.record_failure(self.AUTH_HOST, e)
+            raise
+        resilience.record_success(self.AUTH_HOST)
+        
+        data = response.json()
+        self._token = data["access_token"]
+        self._expires_at = time.time() + data["expires_in"] - self.REFRESH_MARGIN_SECONDS
+        
+        try:
+            self._save_store()
+        except Exception as e:
+            # Non bloquant : le token reste utilisable par ce processus
+            print(f"WARNING Erreur sauvegarde token Spotify: {e}")
+    
+    def _save_store(self):
+        """Écriture atomique, fichier lisible par l'utilisateur courant uniquement (0600)"""
+        self.store_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.store_path.with_name(self.store_path.name + ".tmp")
+        
+        payload = dumps({
+            "client_key": self.client_key,
+            "access_token": self._token,
+            "expires_at": self._expires_at
+        })
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        
+        os.replace(tmp_path, self.store_path)
+    
+    @contextmanager
+    def _file_lock(self):
+        """
+        Verrou inter-processus (file_lock.py)
+        Après LOCK_TIMEOUT_SECONDS, on rafraîchit sans verrou plutôt que bloquer le cycle
+        """
+        with file_lock(self.lock_path, self.LOCK_TIMEOUT_SECONDS, self.LOCK_STALE_SECONDS, "token Spotify"):
+            yield
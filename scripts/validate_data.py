@@ -7,15 +7,19 @@ Vérifie les schémas JSON, arrondis, unicité des id, cohérence des dates.
 import json
 import re
 from pathlib import Path
-from typing import Dict, List, Union
+from typing import Dict, List, Optional, Union
 import sys
 
+from json_io import load_json
+
 
 class DataValidator:
     """Validateur de données pour le dashboard The Weeknd."""
     
-    def __init__(self, base_path: Path):
+    def __init__(self, base_path: Path, data_path: Optional[Path] = None):
+        """data_path : dossier des fichiers publiés (défaut : data/ ; génération candidate, cf. publish.py)"""
         self.base_path = base_path
+        self.data_path = data_path or base_path / "data"
         self.errors: List[str] = []
         self.warnings: List[str] = []
     
@@ -24,9 +28,9 @@ class DataValidator:
         print("🔍 Validation des contrats de données...\n")
         
         # Charger les données
-        songs = self._load_json("data/songs.json")
-        albums = self._load_json("data/albums.json")
-        meta = self._load_json("data/meta.json")
+        songs = self._load_json("songs.json")
+        albums = self._load_json("albums.json")
+        meta = self._load_json("meta.json")
         
         if songs is None or albums is None or meta is None:
             print("❌ Impossible de charger les fichiers de données")
@@ -64,15 +68,14 @@ class DataValidator:
         return len(self.errors) == 0
     
     def _load_json(self, relative_path: str) -> Union[Dict, List, None]:
-        """Charge un fichier JSON."""
-        filepath = self.base_path / relative_path
+        """Charge un fichier JSON du dossier de données."""
+        filepath = self.data_path / relative_path
         if not filepath.exists():
             self.errors.append(f"Fichier introuvable: {relative_path}")
             return None
         
         try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                return json.load(f)
+            return load_json(filepath)
         except json.JSONDecodeError as e:
             self.errors.append(f"Erreur JSON dans {relative_path}: {e}")
             return None
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests de l'archive d'historique (backfill_history.py) et de sa lecture par dashboard_server.py.
+
+Tests :
+- T1 : Import de snapshots JSON dans l'archive de l'artiste, servie par /api/archive
+"""
+
+import json
+import shutil
+import sys
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+# Ajouter scripts au path
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
+from backfill_history import archive_dir, backfill, load_archive_index
+from dashboard_server import make_server
+from json_io import dump_json
+
+REPO_HISTORY = Path(__file__).parent / "data" / "history" / "songs"
+OTHER_ARTIST_ID = "06HL4z0CvFAxyc27GXpf02"
+
+
+def test_t1_archive_per_artist_and_api():
+    """T1 : L'archive est écrite sous data/<artist_id>/archive et lue par l'API."""
+    print("\n" + "="*60)
+    print("T1: Archive par artiste servie par /api/archive")
+    print("="*60)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        (root / "data").mkdir()
+        dump_json(root / "data" / "artists.json", {"artists": [{"id": OTHER_ARTIST_ID, "name": "Other"}]})
+        source = root / "source"
+        source.mkdir()
+        snapshots = sorted(REPO_HISTORY.glob("*.json"))[:2]
+        for snapshot in snapshots:
+            shutil.copy(snapshot, source / snapshot.name)
+        
+        result = backfill(source, root, workers=1, artist_id=OTHER_ARTIST_ID)
+        dates = sorted((snapshot.stem for snapshot in snapshots), reverse=True)
+        assert result["imported"] == 2 and result["dates"]["songs"] == dates
+        assert (archive_dir(root, OTHER_ARTIST_ID) / "songs" / f"{dates[0]}.json").exists()
+        assert not (root / "data" / "archive").exists(), "Archive écrite hors du dossier de l'artiste"
+        assert load_archive_index(root, OTHER_ARTIST_ID)["songs"] == dates
+        
+        server = make_server(root, port=0, host="127.0.0.1")
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}/api/archive"
+        
+        try:
+            with urllib.request.urlopen(f"{base_url}?artist={OTHER_ARTIST_ID}", timeout=5) as response:
+                assert json.loads(response.read())["songs"] == dates
+            
+            with urllib.request.urlopen(f"{base_url}/songs/{dates[0]}?artist={OTHER_ARTIST_ID}", timeout=5) as response:
+                items = json.loads(response.read())
+            assert len(items) == len(json.loads((source / f"{dates[0]}.json").read_text(encoding="utf-8")))
+            
+            for path in (f"/songs/1999-01-01?artist={OTHER_ARTIST_ID}", f"/songs/..%2Fartists?artist={OTHER_ARTIST_ID}"):
+                try:
+                    urllib.request.urlopen(base_url + path, timeout=5)
+                    assert False, f"Snapshot inconnu servi : {path}"
+                except urllib.error.HTTPError as e:
+                    assert e.code == 404
+        finally:
+            server.shutdown()
+            server.server_close()
+        print(f"   {len(items)} titres archivés au {dates[0]}")
+    
+    print("✅ T1 PASSED")
+
+
+def run_all_tests():
+    """Exécute tous les tests."""
+    try:
+        test_t1_archive_per_artist_and_api()
+        
+        print("\n✅ TOUS LES TESTS PASSED")
+        return True
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
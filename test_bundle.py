@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Tests du bundle songs + albums + meta (publish.py) et de /api/bundle (dashboard_server).
+
+Tests :
+- T1 : Bundle = contenu exact des trois fichiers, révision stable puis modifiée
+- T2 : Endpoint HTTP /api/bundle (ETag fort, 304 sur If-None-Match, 404 sans bundle)
+"""
+
+import json
+import shutil
+import sys
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+# Ajouter scripts au path
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
+from dashboard_server import make_server
+from json_io import dump_json, load_json
+from publish import BUNDLE_NAME, publish_bundle, read_bundle
+
+REPO_DATA = Path(__file__).parent / "data"
+
+
+def make_data(root: Path) -> Path:
+    """Dossier data/ avec les vues publiées du dépôt."""
+    data = root / "data"
+    data.mkdir()
+    for name in ("songs.json", "albums.json", "meta.json"):
+        shutil.copy(REPO_DATA / name, data / name)
+    return data
+
+
+def test_t1_bundle_contents():
+    """T1 : Le bundle reprend les trois fichiers ; la révision suit leur contenu."""
+    print("\n" + "="*60)
+    print("T1: Contenu et révision du bundle")
+    print("="*60)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        data = make_data(Path(tmp))
+        
+        revision = publish_bundle(data)
+        bundle = load_json(data / BUNDLE_NAME)
+        assert bundle["revision"] == revision and len(revision) == 16
+        for name in ("songs", "albums", "meta"):
+            assert bundle[name] == load_json(data / f"{name}.json"), f"{name} différent dans le bundle"
+        assert read_bundle(data)[0] == revision
+        
+        assert publish_bundle(data) == revision, "Révision instable à contenu identique"
+        
+        meta = load_json(data / "meta.json")
+        meta["last_sync_status"] = "error"
+        dump_json(data / "meta.json", meta)
+        assert publish_bundle(data) != revision, "Révision inchangée après modification de meta.json"
+        
+        (data / "albums.json").unlink()
+        assert publish_bundle(data) is None
+        print(f"   Révision {revision}, {(data / BUNDLE_NAME).stat().st_size} octets")
+    
+    print("✅ T1 PASSED")
+
+
+def fetch(url: str, etag: str = None):
+    """(statut, en-têtes, corps) d'une requête GET, avec If-None-Match optionnel."""
+    request = urllib.request.Request(url, headers={"If-None-Match": etag} if etag else {})
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+def test_t2_http_endpoint():
+    """T2 : /api/bundle revalidé par ETag, suit les republications."""
+    print("\n" + "="*60)
+    print("T2: Endpoint HTTP /api/bundle")
+    print("="*60)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        data = make_data(root)
+        
+        server = make_server(root, port=0, host="127.0.0.1")
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        url = f"http://127.0.0.1:{server.server_address[1]}/api/bundle"
+        
+        try:
+            status, _, body = fetch(url)
+            assert status == 404 and "error" in json.loads(body)
+            
+            revision = publish_bundle(data)
+            status, headers, body = fetch(url)
+            assert status == 200
+            assert headers["ETag"] == f'"{revision}"'
+            assert headers["Cache-Control"] == "no-cache"
+            assert json.loads(body)["revision"] == revision
+            
+            status, headers, body = fetch(url, etag=f'"{revision}"')
+            assert status == 304 and body == b""
+            
+            # Nouveau cycle : nouvelle révision, l'ancien ETag ne correspond plus
+            dump_json(data / "songs.json", load_json(data / "songs.json")[:3])
+            new_revision = publish_bundle(data)
+            status, headers, body = fetch(url, etag=f'"{revision}"')
+            assert status == 200 and headers["ETag"] == f'"{new_revision}"'
+            assert len(json.loads(body)["songs"]) == 3
+        finally:
+            server.shutdown()
+            server.server_close()
+    
+    print("✅ T2 PASSED")
+
+
+def run_all_tests():
+    """Exécute tous les tests."""
+    try:
+        test_t1_bundle_contents()
+        test_t2_http_endpoint()
+        
+        print("\n✅ TOUS LES TESTS PASSED")
+        return True
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Tests de la vue caps précalculée (generate_current_views.build_caps_view).
+
+Tests :
+- T1 : Items, compteurs et paliers identiques au filtrage client de caps.js
+- T2 : Dates ETA (jours arrondis au supérieur, changement de mois)
+"""
+
+import sys
+from pathlib import Path
+
+# Ajouter scripts au path
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
+from generate_current_views import CAPS_WINDOWS, build_caps_view, calculate_eta, select_caps_items
+from json_io import load_json
+
+REPO_DATA = Path(__file__).parent / "data"
+
+
+def test_t1_matches_client_filter():
+    """T1 : Chaque fenêtre = filtrage days_to_next_cap <= fenêtre de caps.js, trié par ETA."""
+    print("\n" + "="*60)
+    print("T1: Vue caps == filtrage client")
+    print("="*60)
+    
+    songs = load_json(REPO_DATA / "songs.json")
+    albums = load_json(REPO_DATA / "albums.json")
+    data_date = load_json(REPO_DATA / "meta.json")["spotify_data_date"]
+    
+    caps = build_caps_view(
+        data_date,
+        select_caps_items(songs, "songs", data_date),
+        select_caps_items(albums, "albums", data_date)
+    )
+    days = [item["days_to_next_cap"] for item in caps["items"]]
+    assert days == sorted(days), "Items non triés par ETA"
+    
+    for window in CAPS_WINDOWS:
+        expected_songs = [s for s in songs if isinstance(s["days_to_next_cap"], (int, float)) and s["days_to_next_cap"] <= window]
+        expected_albums = [a for a in albums if isinstance(a["days_to_next_cap"], (int, float)) and a["days_to_next_cap"] <= window]
+        counts = caps["windows"][str(window)]
+        assert counts == {"songs": len(expected_songs), "albums": len(expected_albums)}, f"Fenêtre {window} j"
+        
+        prefix = caps["items"][:counts["songs"] + counts["albums"]]
+        assert {item["id"] for item in prefix} == {item["id"] for item in expected_songs + expected_albums}
+        print(f"   {window:>2} j : {counts['songs']} titres, {counts['albums']} albums")
+    
+    positions = sorted(p for tier in caps["tiers"] for p in tier["items"])
+    assert positions == list(range(len(caps["items"])))
+    assert all(caps["items"][p]["next_cap_value"] == tier["cap"] for tier in caps["tiers"] for p in tier["items"])
+    
+    print("✅ T1 PASSED")
+
+
+def test_t2_eta_dates():
+    """T2 : ETA = date des données + ceil(jours), comme calculateETA de caps.js."""
+    print("\n" + "="*60)
+    print("T2: Dates ETA")
+    print("="*60)
+    
+    assert calculate_eta("2025-10-04", 2.73) == "2025-10-07"
+    assert calculate_eta("2025-10-04", 3) == "2025-10-07"
+    assert calculate_eta("2025-10-30", 0.1) == "2025-10-31"
+    assert calculate_eta("2025-12-31", 1.5) == "2026-01-02"
+    
+    print("✅ T2 PASSED")
+
+
+def run_all_tests():
+    """Exécute tous les tests."""
+    try:
+        test_t1_matches_client_filter()
+        test_t2_eta_dates()
+        
+        print("\n✅ TOUS LES TESTS PASSED")
+        return True
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
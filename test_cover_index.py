@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Tests de l'index persistant des covers (data/cache/covers_index.json).
+
+Tests :
+- T1 : Migration depuis les vues existantes (songs.json/albums.json)
+- T2 : Mise à jour incrémentale (échec API = entrée conservée)
+- T3 : Aller-retour sauvegarde/chargement
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# Ajouter scripts au path
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
+from records import CoverRecord
+from cover_index import (
+    default_index_path,
+    load_cover_index,
+    load_or_bootstrap,
+    save_cover_index,
+    update_cover_index
+)
+
+
+def _write_json(path: Path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+
+def test_t1_bootstrap_from_views():
+    """T1 : L'index est créé une fois depuis les vues publiées."""
+    print("\n" + "="*60)
+    print("T1: Migration index covers depuis les vues")
+    print("="*60)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        base_path = Path(tmp)
+        _write_json(base_path / "data" / "songs.json", [
+            {"id": "kworb:a@unknown", "cover_url": "https://i.scdn.co/a", "album_name": "A", "spotify_album_id": "1"},
+            {"id": "kworb:b@unknown", "cover_url": None, "album_name": None}
+        ])
+        _write_json(base_path / "data" / "albums.json", [
+            {"id": "kworb:album:a", "cover_url": "https://i.scdn.co/a", "album_name": "A"}
+        ])
+        
+        index = load_or_bootstrap(base_path)
+        
+        assert default_index_path(base_path).exists(), "L'index devrait être écrit"
+        assert list(index["songs"]) == ["kworb:a@unknown"], "Seuls les items avec cover sont indexés"
+        assert index["songs"]["kworb:a@unknown"].spotify_album_id == "1"
+        assert "kworb:album:a" in index["albums"]
+    
+    print("✅ T1 PASSED")
+
+
+def test_t2_incremental_update():
+    """T2 : Un item sans cover ne supprime pas l'entrée existante."""
+    print("\n" + "="*60)
+    print("T2: Mise à jour incrémentale de l'index")
+    print("="*60)
+    
+    index = {"songs": {"kworb:a@unknown": CoverRecord(cover_url="old", album_name="A")},
+             "albums": {}}
+    
+    changed = update_cover_index(index, "songs", [
+        {"id": "kworb:a@unknown", "cover_url": None},
+        {"id": "kworb:b@unknown", "cover_url": "new", "album_name": "B"}
+    ])
+    
+    assert changed == 1, f"1 entrée modifiée attendue, obtenu {changed}"
+    assert index["songs"]["kworb:a@unknown"].cover_url == "old"
+    assert index["songs"]["kworb:b@unknown"].cover_url == "new"
+    
+    print("✅ T2 PASSED")
+
+
+def test_t3_save_load_roundtrip():
+    """T3 : Sauvegarde compacte puis rechargement identique."""
+    print("\n" + "="*60)
+    print("T3: Aller-retour sauvegarde/chargement")
+    print("="*60)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        index_path = Path(tmp) / "covers_index.json"
+        index = {"songs": {"kworb:é@unknown": CoverRecord(cover_url="u")}, "albums": {}}
+        
+        save_cover_index(index_path, index)
+        
+        assert load_cover_index(index_path) == index
+        assert load_cover_index(Path(tmp) / "absent.json") is None
+    
+    print("✅ T3 PASSED")
+
+
+def run_all_tests():
+    """Exécute tous les tests."""
+    try:
+        test_t1_bootstrap_from_views()
+        test_t2_incremental_update()
+        test_t3_save_load_roundtrip()
+        
+        print("\n✅ TOUS LES TESTS PASSED")
+        return True
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Tests de la révision incrémentale des covers (generate_current_views.update_covers_revision_digests).
+
+Tests :
+- T1 : Premier calcul en rafraîchissement complet, compteur monotone même si la racine XOR revient
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Ajouter scripts au path
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
+from generate_current_views import update_covers_revision_digests, update_meta_with_covers_info
+from json_io import dump_json, load_json
+
+DIGEST_A = "0123456789abcdef"
+DIGEST_B = "fedcba9876543210"
+
+
+def test_t1_full_refresh_and_monotonic_seq():
+    """T1 : full_refresh sans ids au premier calcul ; seq croît, la racine XOR peut revenir."""
+    print("\n" + "="*60)
+    print("T1: Rafraîchissement complet initial et compteur monotone")
+    print("="*60)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        state_path = Path(tmp) / "cache" / "covers_revision_state.json"
+        meta_path = Path(tmp) / "meta.json"
+        dump_json(meta_path, {})
+        
+        first = update_covers_revision_digests(state_path, {"a": DIGEST_A})
+        assert first["full_refresh"] and first["changed_ids"] == [] and first["base_revision"] is None
+        assert first["seq"] == 1
+        update_meta_with_covers_info(meta_path, first["revision"], None, first)
+        meta = load_json(meta_path)
+        assert meta["covers_revision_seq"] == 1
+        assert meta["covers_changes"] == {"seq": 1, "base_revision": None, "changed_ids": [], "full_refresh": True}
+        
+        unchanged = update_covers_revision_digests(state_path, {"a": DIGEST_A})
+        assert unchanged["seq"] == 1 and not unchanged["full_refresh"] and len(unchanged["history"]) == 1
+        
+        added = update_covers_revision_digests(state_path, {"a": DIGEST_A, "b": DIGEST_B})
+        assert added["changed_ids"] == ["b"] and added["seq"] == 2
+        assert added["base_revision"] == first["revision"]
+        
+        # Retour à l'état initial : même révision XOR, compteur toujours croissant
+        removed = update_covers_revision_digests(state_path, {"a": DIGEST_A})
+        assert removed["revision"] == first["revision"] and removed["seq"] == 3
+        update_meta_with_covers_info(meta_path, removed["revision"], None, removed)
+        meta = load_json(meta_path)
+        assert meta["covers_revision_seq"] == 3
+        assert meta["covers_changes"]["changed_ids"] == ["b"] and not meta["covers_changes"]["full_refresh"]
+        assert [entry["seq"] for entry in load_json(state_path)["history"]] == [1, 2, 3]
+        print(f"   Révision {removed['revision']} republiée au seq {removed['seq']}")
+    
+    print("✅ T1 PASSED")
+
+
+def run_all_tests():
+    """Exécute tous les tests."""
+    try:
+        test_t1_full_refresh_and_monotonic_seq()
+        
+        print("\n✅ TOUS LES TESTS PASSED")
+        return True
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
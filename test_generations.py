@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Tests de la publication par générations validées (publish.publish_generation).
+
+Tests :
+- T1 : Génération validée servie via current, candidate invalide rejetée
+- T2 : Retour arrière, publication différée sous l'orchestrateur, service par dashboard_server
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import urllib.request
+from pathlib import Path
+
+# Ajouter scripts au path
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
+from dashboard_server import make_server
+from json_io import dump_json, load_json
+from publish import (
+    GENERATIONS_DIR, LIVE_LINK, POINTER_NAME, list_generations, live_generation,
+    publish_data, publish_generation, published_dir, rollback
+)
+
+REPO_DATA = Path(__file__).parent / "data"
+
+
+def make_data(root: Path) -> Path:
+    """Dossier data/ avec les vues publiées du dépôt."""
+    data = root / "data"
+    data.mkdir()
+    for name in ("songs.json", "albums.json", "meta.json"):
+        shutil.copy(REPO_DATA / name, data / name)
+    return data
+
+
+def test_t1_validated_generation():
+    """T1 : Seule une génération qui passe DataValidator remplace la génération servie."""
+    print("\n" + "="*60)
+    print("T1: Génération validée puis candidate rejetée")
+    print("="*60)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        data = make_data(Path(tmp))
+        
+        first = publish_generation(data)
+        assert first is not None, "Données du dépôt rejetées"
+        assert (data / LIVE_LINK).is_symlink() and live_generation(data) == first
+        assert published_dir(data) == data / GENERATIONS_DIR / first
+        assert (published_dir(data) / "bundle.json").exists()
+        assert load_json(data / POINTER_NAME)["files"]["songs"].startswith("versions/")
+        
+        # Rien n'a changé : pas de nouvelle génération
+        assert publish_generation(data) == first
+        assert list_generations(data) == [first]
+        
+        # Scrape défectueux : id dupliqué → rejeté, l'ancienne génération reste servie
+        songs = load_json(data / "songs.json")
+        dump_json(data / "songs.json", songs + songs[:1])
+        assert publish_generation(data) is None
+        assert live_generation(data) == first
+        assert list_generations(data) == [first]
+        assert not any(path.name.endswith(".tmp") for path in (data / GENERATIONS_DIR).iterdir())
+        print(f"   Génération {first} conservée après rejet")
+    
+    print("✅ T1 PASSED")
+
+
+def test_t2_rollback_and_serving():
+    """T2 : Retour arrière instantané ; étapes différées pendant un cycle ; /data servi depuis current."""
+    print("\n" + "="*60)
+    print("T2: Retour arrière et service")
+    print("="*60)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        data = make_data(root)
+        
+        first = publish_generation(data)
+        dump_json(data / "songs.json", load_json(data / "songs.json")[:3])
+        second = publish_generation(data)
+        assert second != first and live_generation(data) == second
+        
+        # Pendant un cycle de l'orchestrateur, seule la fin de cycle publie
+        os.environ["PIPELINE_CYCLE_ID"] = "test-cycle"
+        try:
+            dump_json(data / "songs.json", load_json(data / "songs.json")[:2])
+            assert publish_data(data) is None
+            assert live_generation(data) == second
+        finally:
+            del os.environ["PIPELINE_CYCLE_ID"]
+        
+        server = make_server(root, port=0, host="127.0.0.1")
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        
+        def served_songs() -> int:
+            with urllib.request.urlopen(f"{base_url}/data/songs.json", timeout=5) as response:
+                return len(json.loads(response.read()))
+        
+        try:
+            assert served_songs() == 3, "Fichier de travail servi au lieu de la génération"
+            
+            assert rollback(data) == first
+            assert live_generation(data) == first
+            assert served_songs() == len(load_json(REPO_DATA / "songs.json"))
+            with urllib.request.urlopen(f"{base_url}/api/songs?limit=1", timeout=5) as response:
+                assert json.loads(response.read())["total"] == served_songs()
+            
+            assert rollback(data) is None, "Aucune génération avant la première"
+        finally:
+            server.shutdown()
+            server.server_close()
+        print(f"   {second} → {first}")
+    
+    print("✅ T2 PASSED")
+
+
+def run_all_tests():
+    """Exécute tous les tests."""
+    try:
+        test_t1_validated_generation()
+        test_t2_rollback_and_serving()
+        
+        print("\n✅ TOUS LES TESTS PASSED")
+        return True
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Tests du cache local des covers (cache_images.py) contre un serveur d'images local.
+
+Tests :
+- T1 : Chaque cover distincte téléchargée une fois, fichiers adressés par contenu, manifeste localisé
+- T2 : Images servies par dashboard_server.py avec Cache-Control immutable
+"""
+
+import hashlib
+import io
+import shutil
+import sys
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+# Ajouter scripts au path
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
+pytest.importorskip("requests")  # Téléchargements de cache_images
+
+from artists import DEFAULT_ARTIST_ID
+from cache_images import Image, cache_images
+from cover_index import default_index_path, save_cover_index
+from dashboard_server import IMMUTABLE_CACHE_CONTROL, make_server
+from generate_current_views import generate_views
+from json_io import load_json
+from records import CoverRecord
+
+REPO_DATA = Path(__file__).parent / "data"
+
+
+def make_image(color: str, size: int = 640) -> bytes:
+    """Image carrée (PNG avec Pillow, sinon contenu arbitraire)."""
+    if Image is None:
+        return f"fake-{color}-{size}".encode("utf-8") * 100
+    buffer = io.BytesIO()
+    Image.new("RGB", (size, size), color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+class CountingHandler(SimpleHTTPRequestHandler):
+    """Serveur d'images local : compte les requêtes par chemin."""
+    requests_by_path = {}
+    
+    def do_GET(self):
+        CountingHandler.requests_by_path[self.path] = CountingHandler.requests_by_path.get(self.path, 0) + 1
+        super().do_GET()
+    
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(server):
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def make_base(root: Path, cover_base: str) -> Path:
+    """The Weeknd : snapshots + index de covers pointant vers le serveur local (2 titres, même album)."""
+    shutil.copytree(REPO_DATA / "history", root / "data" / "history")
+    shutil.copy(REPO_DATA / "meta.json", root / "data" / "meta.json")
+    
+    songs = load_json(REPO_DATA / "songs.json")
+    albums = load_json(REPO_DATA / "albums.json")
+    small, medium = f"{cover_base}/red-64.png", f"{cover_base}/red-300.png"
+    save_cover_index(default_index_path(root, DEFAULT_ARTIST_ID), {
+        "songs": {
+            songs[0]["id"]: CoverRecord(f"{cover_base}/red.png", "After Hours", cover_url_medium=medium, cover_url_small=small),
+            songs[1]["id"]: CoverRecord(f"{cover_base}/red.png", "After Hours", cover_url_medium=medium, cover_url_small=small)
+        },
+        "albums": {
+            albums[0]["id"]: CoverRecord(f"{cover_base}/blue.png", "The Highlights")
+        }
+    })
+    return root
+
+
+def test_t1_cache_once():
+    """T1 : Deux passes, une seule requête par cover, manifeste en chemins /images/."""
+    print("\n" + "="*60)
+    print("T1: Cache adressé par contenu")
+    print("="*60)
+    
+    with tempfile.TemporaryDirectory() as images_dir, tempfile.TemporaryDirectory() as tmp:
+        for name, color in (("red", "red"), ("blue", "blue")):
+            (Path(images_dir) / f"{name}.png").write_bytes(make_image(color))
+            (Path(images_dir) / f"{name}-64.png").write_bytes(make_image(color, 64))
+            (Path(images_dir) / f"{name}-300.png").write_bytes(make_image(color, 300))
+        
+        images_server = ThreadingHTTPServer(("127.0.0.1", 0), partial(CountingHandler, directory=images_dir))
+        cover_base = start_server(images_server)
+        try:
+            root = make_base(Path(tmp), cover_base)
+            generate_views(root, [DEFAULT_ARTIST_ID])
+            
+            stats = cache_images(root, DEFAULT_ARTIST_ID, workers=2)
+            assert stats == {"covers": 2, "downloaded": 2, "failed": 0, "localized": 3}, stats
+            assert CountingHandler.requests_by_path["/red.png"] == 1
+            
+            again = cache_images(root, DEFAULT_ARTIST_ID, workers=2)
+            assert again["downloaded"] == 0 and again["localized"] == 3
+            assert CountingHandler.requests_by_path["/red.png"] == 1, "Cover retéléchargée"
+        finally:
+            images_server.shutdown()
+            images_server.server_close()
+        
+        store = root / "data" / "cache" / "images"
+        red_digest = hashlib.sha256((Path(images_dir) / "red.png").read_bytes()).hexdigest()
+        assert (store / f"{red_digest}.png").exists()
+        
+        manifest = load_json(root / "data" / "images.json")
+        song_id = load_json(REPO_DATA / "songs.json")[0]["id"]
+        small, medium, original = manifest["items"][song_id]
+        assert original == f"/images/{red_digest}.png"
+        assert small.startswith("/images/") and medium.startswith("/images/")
+        if Image is not None:
+            assert small == f"/images/{red_digest}-64.jpg"
+            with Image.open(store / small[len("/images/"):]) as thumbnail:
+                assert thumbnail.size == (64, 64)
+        
+        # Régénération des vues : le manifeste reste local
+        generate_views(root, [DEFAULT_ARTIST_ID])
+        assert load_json(root / "data" / "images.json")["items"][song_id][2] == original
+        print(f"   {len(list(store.iterdir()))} fichiers en cache (Pillow : {Image is not None})")
+    
+    print("✅ T1 PASSED")
+
+
+def test_t2_immutable_serving():
+    """T2 : /images/<empreinte> servi avec un cache immuable, noms invalides refusés."""
+    print("\n" + "="*60)
+    print("T2: Service des images en cache")
+    print("="*60)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        payload = make_image("green")
+        digest = hashlib.sha256(payload).hexdigest()
+        store = root / "data" / "cache" / "images"
+        store.mkdir(parents=True)
+        (store / f"{digest}.png").write_bytes(payload)
+        
+        server = make_server(root, port=0, host="127.0.0.1")
+        base_url = start_server(server)
+        try:
+            with urllib.request.urlopen(f"{base_url}/images/{digest}.png", timeout=5) as response:
+                assert response.read() == payload
+                assert response.headers["Cache-Control"] == IMMUTABLE_CACHE_CONTROL
+                assert response.headers["Content-Type"] == "image/png"
+            
+            for name in ("../meta.json", f"{'0' * 64}.png"):
+                try:
+                    urllib.request.urlopen(f"{base_url}/images/{name}", timeout=5)
+                    assert False, f"{name} servi"
+                except urllib.error.HTTPError as e:
+                    assert e.code == 404
+        finally:
+            server.shutdown()
+            server.server_close()
+    
+    print("✅ T2 PASSED")
+
+
+def run_all_tests():
+    """Exécute tous les tests."""
+    try:
+        test_t1_cache_once()
+        test_t2_immutable_serving()
+        
+        print("\n✅ TOUS LES TESTS PASSED")
+        return True
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
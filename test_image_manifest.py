@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tests du manifeste d'images multi-résolution (generate_current_views).
+
+Tests :
+- T1 : Variantes 64/300/640 px de l'index de covers publiées dans data/images.json
+- T2 : Index de covers ancien format (sans variantes) toujours lisible
+"""
+
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+# Ajouter scripts au path
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
+from artists import DEFAULT_ARTIST_ID
+from cover_index import default_index_path, load_cover_index, save_cover_index
+from generate_current_views import IMAGE_BASE_URL, generate_views
+from json_io import dump_json, load_json
+from records import CoverRecord
+
+REPO_DATA = Path(__file__).parent / "data"
+
+
+def make_base(root: Path) -> Path:
+    """Arborescence minimale de The Weeknd (snapshots + meta)."""
+    shutil.copytree(REPO_DATA / "history", root / "data" / "history")
+    shutil.copy(REPO_DATA / "meta.json", root / "data" / "meta.json")
+    return root
+
+
+def test_t1_manifest_sizes():
+    """T1 : Les variantes de l'index sont publiées, préfixe commun retiré."""
+    print("\n" + "="*60)
+    print("T1: Manifeste 64/300/640 px")
+    print("="*60)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        root = make_base(Path(tmp))
+        songs = load_json(REPO_DATA / "songs.json")
+        first, second = songs[0]["id"], songs[1]["id"]
+        
+        save_cover_index(default_index_path(root, DEFAULT_ARTIST_ID), {
+            "songs": {
+                first: CoverRecord(
+                    cover_url=IMAGE_BASE_URL + "large",
+                    album_name="After Hours",
+                    cover_url_medium=IMAGE_BASE_URL + "medium",
+                    cover_url_small=IMAGE_BASE_URL + "small"
+                ),
+                second: CoverRecord(cover_url="https://example.org/cover.jpg", album_name="Starboy")
+            },
+            "albums": {}
+        })
+        generate_views(root, [DEFAULT_ARTIST_ID])
+        
+        manifest = load_json(root / "data" / "images.json")
+        assert manifest["sizes"] == [64, 300, 640]
+        assert manifest["items"][first] == ["small", "medium", "large"]
+        assert manifest["items"][second] == [None, None, "https://example.org/cover.jpg"]
+        assert len(manifest["items"]) == 2
+        
+        published = {song["id"]: song for song in load_json(root / "data" / "songs.json")}
+        assert published[first]["cover_url"] == IMAGE_BASE_URL + "large", "cover_url reste le plein format"
+    
+    print("✅ T1 PASSED")
+
+
+def test_t2_legacy_index():
+    """T2 : Une entrée sans cover_url_medium/small se charge avec des variantes nulles."""
+    print("\n" + "="*60)
+    print("T2: Index de covers ancien format")
+    print("="*60)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        index_path = Path(tmp) / "covers_index.json"
+        dump_json(index_path, {
+            "songs": {"kworb:x": {"cover_url": "u", "album_name": "a", "spotify_album_id": None, "album_type": None}},
+            "albums": {}
+        })
+        entry = load_cover_index(index_path)["songs"]["kworb:x"]
+        assert entry.cover_url == "u"
+        assert entry.cover_url_medium is None and entry.cover_url_small is None
+    
+    print("✅ T2 PASSED")
+
+
+def run_all_tests():
+    """Exécute tous les tests."""
+    try:
+        test_t1_manifest_sizes()
+        test_t2_legacy_index()
+        
+        print("\n✅ TOUS LES TESTS PASSED")
+        return True
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Tests de la génération des vues en pool de processus (generate_current_views.generate_views).
+
+Tests :
+- T1 : Mode parallèle multi-artistes identique au mode séquentiel
+- T2 : Artiste sans snapshot ignoré, les autres publiés
+- T3 : Résultats des workers en JSON encodé, index de covers créé avant le pool
+"""
+
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+# Ajouter scripts au path
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
+from artists import DEFAULT_ARTIST_ID
+from generate_current_views import ViewResult, build_view, generate_views
+
+REPO_DATA = Path(__file__).parent / "data"
+OTHER_ARTIST_ID = "0000000000000000000001"
+
+
+def make_base(root: Path) -> Path:
+    """Arborescence minimale : The Weeknd dans data/, un second artiste dans data/<id>/."""
+    for artist_dir in (root / "data", root / "data" / OTHER_ARTIST_ID):
+        shutil.copytree(REPO_DATA / "history", artist_dir / "history")
+        shutil.copy(REPO_DATA / "meta.json", artist_dir / "meta.json")
+    return root
+
+
+def read_outputs(root: Path) -> dict:
+    """Contenu des fichiers publiés (vues, meta, covers_changes) des deux artistes."""
+    outputs = {}
+    for artist_dir in (root / "data", root / "data" / OTHER_ARTIST_ID):
+        for name in ("songs.json", "albums.json", "meta.json", "covers_changes.json", "caps.json", "images.json"):
+            outputs[f"{artist_dir.name}/{name}"] = (artist_dir / name).read_bytes()
+    return outputs
+
+
+def test_t1_parallel_matches_serial():
+    """T1 : workers=2 et workers=1 publient exactement les mêmes fichiers."""
+    print("\n" + "="*60)
+    print("T1: Pool de processus == séquentiel")
+    print("="*60)
+    
+    artist_ids = [DEFAULT_ARTIST_ID, OTHER_ARTIST_ID]
+    with tempfile.TemporaryDirectory() as serial_dir, tempfile.TemporaryDirectory() as parallel_dir:
+        serial = make_base(Path(serial_dir))
+        parallel = make_base(Path(parallel_dir))
+        
+        assert generate_views(serial, artist_ids, workers=1) == 2
+        assert generate_views(parallel, artist_ids, workers=2) == 2
+        
+        serial_outputs = read_outputs(serial)
+        assert serial_outputs == read_outputs(parallel), "Sorties différentes entre les deux modes"
+        assert serial_outputs["data/songs.json"] == serial_outputs[f"{OTHER_ARTIST_ID}/songs.json"]
+    
+    print("✅ T1 PASSED")
+
+
+def test_t2_artist_without_snapshots():
+    """T2 : Un artiste sans historique n'empêche pas la publication des autres."""
+    print("\n" + "="*60)
+    print("T2: Artiste sans snapshot ignoré")
+    print("="*60)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        root = make_base(Path(tmp))
+        published = generate_views(root, [DEFAULT_ARTIST_ID, "artiste-vide"], workers=2)
+        
+        assert published == 1
+        assert (root / "data" / "songs.json").exists()
+        assert not (root / "data" / "artiste-vide" / "songs.json").exists()
+    
+    print("✅ T2 PASSED")
+
+
+def test_t3_compact_results_and_index_bootstrap():
+    """T3 : Champs optionnels à None (pas de {} / [] partagés), caps/images en bytes."""
+    print("\n" + "="*60)
+    print("T3: Résultats compacts et index de covers")
+    print("="*60)
+    
+    defaults = ViewResult("artiste", "songs", b"[]", {}, 0, 0)
+    assert defaults.derived is None and defaults.caps is None and defaults.images is None
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        root = make_base(Path(tmp))
+        assert generate_views(root, [DEFAULT_ARTIST_ID, OTHER_ARTIST_ID], workers=2) == 2
+        for artist_dir in (root / "data", root / "data" / OTHER_ARTIST_ID):
+            assert (artist_dir / "cache" / "covers_index.json").exists(), "Index non créé avant le pool"
+        
+        date_j, date_j1 = sorted(path.stem for path in (root / "data" / "history" / "songs").glob("*.json"))[-1:-3:-1]
+        result = build_view(str(root), DEFAULT_ARTIST_ID, "songs", date_j, date_j1)
+        assert isinstance(result.caps, bytes) and isinstance(result.images, bytes)
+    
+    print("✅ T3 PASSED")
+
+
+def run_all_tests():
+    """Exécute tous les tests."""
+    try:
+        test_t1_parallel_matches_serial()
+        test_t2_artist_without_snapshots()
+        test_t3_compact_results_and_index_bootstrap()
+        
+        print("\n✅ TOUS LES TESTS PASSED")
+        return True
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
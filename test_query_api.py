@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Tests de l'API de requête du serveur du dashboard (dashboard_server).
+
+Tests :
+- T1 : Tri serveur conforme à table-sort.js (N.D. en dernier, asc/desc, pagination)
+- T2 : Endpoint HTTP /api/songs (filtres, 400 sur paramètre invalide, rechargement par cycle)
+"""
+
+import json
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+# Ajouter scripts au path
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
+from dashboard_server import ViewIndex, make_server
+from json_io import dump_json, load_json
+
+REPO_DATA = Path(__file__).parent / "data"
+
+
+def test_t1_sorted_pages():
+    """T1 : Pages triées, valeurs manquantes en fin de liste dans les deux sens."""
+    print("\n" + "="*60)
+    print("T1: Tri et pagination côté serveur")
+    print("="*60)
+    
+    songs = load_json(REPO_DATA / "songs.json")
+    index = ViewIndex(songs)
+    
+    page = index.query("streams_daily", "desc", offset=0, limit=20)
+    expected = sorted(songs, key=lambda s: s["streams_daily"], reverse=True)
+    assert page["total"] == len(songs)
+    assert [s["streams_daily"] for s in page["items"]] == [s["streams_daily"] for s in expected[:20]]
+    
+    for order in ("asc", "desc"):
+        result = index.query("variation", order, limit=len(songs))
+        values = [s.get("variation_pct") for s in result["items"]]
+        numeric = [v for v in values if isinstance(v, (int, float))]
+        assert values[:len(numeric)] == numeric, "Valeurs N.D. avant les valeurs numériques"
+        assert numeric == sorted(numeric, reverse=(order == "desc"))
+    
+    titles = [s["title"] for s in index.query("title", "asc", limit=len(songs))["items"]]
+    assert titles[0].lstrip("*^ ").lower() <= titles[-1].lstrip("*^ ").lower()
+    
+    second = index.query("rank", "asc", offset=50, limit=50)
+    assert [s["rank"] for s in second["items"]] == sorted(s["rank"] for s in songs)[50:100]
+    print(f"   {len(songs)} songs, page 2 rangs {second['items'][0]['rank']}-{second['items'][-1]['rank']}")
+    
+    print("✅ T1 PASSED")
+
+
+def get_json(url: str):
+    try:
+        with urllib.request.urlopen(url, timeout=5) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_t2_http_endpoint():
+    """T2 : /api/songs filtre, pagine, rejette les paramètres invalides et suit les nouvelles vues."""
+    print("\n" + "="*60)
+    print("T2: Endpoint HTTP /api/songs")
+    print("="*60)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        (root / "data").mkdir()
+        for name in ("songs.json", "albums.json", "meta.json"):
+            shutil.copy(REPO_DATA / name, root / "data" / name)
+        
+        server = make_server(root, port=0, host="127.0.0.1")
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        
+        try:
+            status, body = get_json(f"{base_url}/api/songs?role=feat&sort=streams_total&order=desc&limit=5")
+            assert status == 200
+            assert len(body["items"]) == min(5, body["total"])
+            assert all(s["role"] == "feat" for s in body["items"])
+            
+            status, body = get_json(f"{base_url}/api/songs?q=BLINDING")
+            assert status == 200 and body["total"] >= 1
+            assert all("blinding" in s["title"].lower() for s in body["items"])
+            
+            # Parties après featuring / entre parenthèses
+            for q, fragment in (("remix", "remix"), ("madonna", "madonna"), ("after%20party", "after party")):
+                status, body = get_json(f"{base_url}/api/songs?q={q}&limit=500")
+                assert status == 200 and body["total"] >= 1, f"q={q} sans résultat"
+                assert all(fragment in f"{s['title']} {s.get('album_name') or ''}".lower() for s in body["items"])
+            
+            status, body = get_json(f"{base_url}/api/albums?sort=colonne")
+            assert status == 400 and "error" in body
+            
+            # Nouveau cycle : vue republiée → index reconstruit
+            songs = load_json(root / "data" / "songs.json")[:3]
+            time.sleep(0.01)
+            dump_json(root / "data" / "songs.json", songs)
+            status, body = get_json(f"{base_url}/api/songs")
+            assert status == 200 and body["total"] == 3
+            
+            with urllib.request.urlopen(f"{base_url}/data/meta.json", timeout=5) as response:
+                assert response.status == 200  # Fichiers statiques toujours servis
+        finally:
+            server.shutdown()
+            server.server_close()
+    
+    print("✅ T2 PASSED")
+
+
+def run_all_tests():
+    """Exécute tous les tests."""
+    try:
+        test_t1_sorted_pages()
+        test_t2_http_endpoint()
+        
+        print("\n✅ TOUS LES TESTS PASSED")
+        return True
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
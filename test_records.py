@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Tests des enregistrements typés partagés (scripts/records.py).
+
+Tests :
+- T1 : Aller-retour dict → enregistrement → dict (clés inconnues ignorées)
+- T2 : json_io.dumps_records identique à json.dumps(indent=2) sur un snapshot, minifié en publish
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+# Ajouter scripts au path
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
+from json_io import dumps, dumps_records, loads
+from records import AlbumRecord, SongRecord, record_from_dict
+
+
+def test_t1_roundtrip():
+    """T1 : Les champs sont conservés dans l'ordre JSON, les valeurs par défaut appliquées."""
+    print("\n" + "="*60)
+    print("T1: Aller-retour dict ↔ enregistrement")
+    print("="*60)
+    
+    row = {"id": "kworb:album:x", "rank": 1, "title": "X", "streams_total": 10,
+           "streams_daily": 2, "extra": "ignoré"}
+    record = record_from_dict(AlbumRecord, row)
+    
+    assert record.streams_total == 10
+    assert record.spotify_data_date is None, "Champ absent = valeur par défaut"
+    assert list(record._asdict()) == list(AlbumRecord._fields), "Ordre des champs conservé"
+    
+    print("✅ T1 PASSED")
+
+
+def test_t2_dumps_matches_json():
+    """T2 : Profil debug octet pour octet comme json.dumps ; publish = dumps de la liste de dicts."""
+    print("\n" + "="*60)
+    print("T2: dumps_records == json.dumps(indent=2)")
+    print("="*60)
+    
+    rows = [
+        {"id": "kworb:é@unknown", "rank": 1, "title": "É \"quoted\"\nline", "album": "Unknown",
+         "role": "lead", "streams_total": 5, "streams_daily": 1,
+         "last_update_kworb": "2025-10-05T00:00:00+00:00", "spotify_data_date": "2025-10-04"}
+    ]
+    records = [record_from_dict(SongRecord, row) for row in rows]
+    
+    expected = json.dumps(rows, indent=2, ensure_ascii=False).encode("utf-8")
+    assert dumps_records(records, profile="debug") == expected
+    assert dumps_records([], profile="debug") == b"[]"
+    
+    assert dumps_records(records, profile="publish") == dumps(rows, profile="publish")
+    assert loads(dumps_records([], profile="publish")) == []
+    
+    # Défaut : indenté, sauf JSON_PROFILE explicite
+    previous = os.environ.pop("JSON_PROFILE", None)
+    try:
+        assert dumps_records(records) == expected
+        os.environ["JSON_PROFILE"] = "publish"
+        assert dumps_records(records) == dumps(rows, profile="publish")
+    finally:
+        os.environ.pop("JSON_PROFILE", None)
+        if previous is not None:
+            os.environ["JSON_PROFILE"] = previous
+    
+    print("✅ T2 PASSED")
+
+
+def run_all_tests():
+    """Exécute tous les tests."""
+    try:
+        test_t1_roundtrip()
+        test_t2_dumps_matches_json()
+        
+        print("\n✅ TOUS LES TESTS PASSED")
+        return True
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
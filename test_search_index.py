@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests de l'index de recherche publié (generate_current_views.build_search_index).
+
+Tests :
+- T1 : Résultats de l'index == filtrage linéaire des clés (ordre de songs.json)
+- T2 : Normalisation sur le texte complet (accents, ponctuation)
+- T3 : Titres avec featuring et suffixe entre parenthèses trouvés par toutes leurs parties
+"""
+
+import sys
+from pathlib import Path
+
+# Ajouter scripts au path
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
+from generate_current_views import build_search_index, query_search_index, search_key
+
+SONGS = [
+    {"id": "a", "title": "Blinding Lights", "album": "Unknown", "album_name": "After Hours"},
+    {"id": "b", "title": "Save Your Tears (with Ariana Grande) - Remix", "album": "Unknown"},
+    {"id": "c", "title": "Pray For Me (with Kendrick Lamar)", "album": "Unknown", "album_name": "Black Panther"},
+    {"id": "d", "title": "Après minuit", "album": "Unknown", "album_name": "Démo"},
+    {"id": "e", "title": "The Hills", "album": "Unknown", "album_name": "Beauty Behind The Madness"},
+    {"id": "f", "title": "The Party & The After Party", "album": "Unknown", "album_name": "House Of Balloons"},
+    {"id": "g", "title": "Popular (with Playboi Carti & Madonna)", "album": "Unknown", "album_name": "Popular"},
+    {"id": "h", "title": "Save Your Tears (Remix)", "album": "Unknown", "album_name": "After Hours (Remixes)"}
+]
+
+
+def test_t1_index_matches_linear_scan():
+    """T1 : Pour chaque requête, mêmes items que le filtrage linéaire des clés (sous-chaîne)."""
+    print("\n" + "="*60)
+    print("T1: Index == filtrage linéaire")
+    print("="*60)
+    
+    index = build_search_index(SONGS)
+    
+    for query in ["bli", "after h", "tears", "the", "madness", "zzz", "ap", "bl", "hours", "ll", "rt"]:
+        key = search_key(query)
+        expected = [song["id"] for song, item_key in zip(SONGS, index["keys"]) if key in item_key]
+        
+        found = [item[0] for item in query_search_index(index, query)]
+        assert found == expected, f"{query!r}: {found} != {expected}"
+    
+    assert query_search_index(index, "b") == [], "Requête < MIN_CHARS"
+    assert [item[0] for item in query_search_index(index, "ll")] == ["e", "f"], "Sous-chaîne de 2 caractères"
+    
+    print("✅ T1 PASSED")
+
+
+def test_t2_normalization():
+    """T2 : Accents et ponctuation retirés, texte complet conservé."""
+    print("\n" + "="*60)
+    print("T2: Normalisation search_key")
+    print("="*60)
+    
+    assert search_key("Après Minuit") == "apres minuit"
+    assert search_key("Save Your Tears (with Ariana Grande) - Remix") == "save your tears with ariana grande remix"
+    assert search_key("Pray For Me feat. Kendrick") == "pray for me feat kendrick"
+    assert search_key("*Creepin' (feat. 21 Savage)") == "creepin feat 21 savage"
+    
+    index = build_search_index(SONGS)
+    assert [item[0] for item in query_search_index(index, "apres")] == ["d"]
+    assert [item[0] for item in query_search_index(index, "démo")] == ["d"]
+    assert index["items"][0] == ["a", "Blinding Lights", "After Hours"], "album_name prioritaire"
+    
+    print("✅ T2 PASSED")
+
+
+def test_t3_featuring_and_suffixes():
+    """T3 : Parties après &, with, feat. ou entre parenthèses cherchables."""
+    print("\n" + "="*60)
+    print("T3: Featuring et suffixes entre parenthèses")
+    print("="*60)
+    
+    index = build_search_index(SONGS)
+    assert [item[0] for item in query_search_index(index, "after party")] == ["f"]
+    assert [item[0] for item in query_search_index(index, "madonna")] == ["g"]
+    assert [item[0] for item in query_search_index(index, "Playboi Carti")] == ["g"]
+    assert [item[0] for item in query_search_index(index, "remix")] == ["b", "h"]
+    assert [item[0] for item in query_search_index(index, "kendrick")] == ["c"]
+    assert [item[0] for item in query_search_index(index, "ariana")] == ["b"]
+    
+    print("✅ T3 PASSED")
+
+
+def run_all_tests():
+    """Exécute tous les tests."""
+    try:
+        test_t1_index_matches_linear_scan()
+        test_t2_normalization()
+        test_t3_featuring_and_suffixes()
+        
+        print("\n✅ TOUS LES TESTS PASSED")
+        return True
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Tests de l'écriture conditionnelle des snapshots (skip-if-unchanged).
+
+Tests :
+- T1 : Même jour, mêmes données ⇒ aucune réécriture
+- T2 : Même jour, données modifiées ⇒ réécriture
+- T3 : Listing des snapshots mis en cache
+- T4 : Hash et listing dans cache/snapshot_state.json, pas dans meta.json
+"""
+
+import json
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Ajouter scripts au path
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
+from date_manager import (
+    list_snapshot_dates, load_snapshot_state, rotate_snapshots_atomic, update_meta_with_rotation
+)
+
+
+def _init_meta(base_path: Path, latest_date: str):
+    meta_path = base_path / "data" / "meta.json"
+    meta_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump({"history": {"latest_date": latest_date}}, f)
+
+
+def test_t1_skip_unchanged():
+    """T1 : Un second passage identique ne réécrit pas le fichier J."""
+    print("\n" + "="*60)
+    print("T1: Snapshot inchangé ⇒ pas de réécriture")
+    print("="*60)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        base_path = Path(tmp)
+        _init_meta(base_path, "2025-10-04")
+        data = [{"id": "kworb:a@unknown", "streams_total": 1}]
+        
+        first = rotate_snapshots_atomic(base_path, "songs", "2025-10-04", data)
+        snapshot_path = base_path / "data" / "history" / "songs" / "2025-10-04.json"
+        mtime = snapshot_path.stat().st_mtime_ns
+        
+        second = rotate_snapshots_atomic(base_path, "songs", "2025-10-04", data)
+        
+        assert first["changed"] is True, "Premier passage : snapshot écrit"
+        assert second["changed"] is False, "Second passage : snapshot inchangé"
+        assert snapshot_path.stat().st_mtime_ns == mtime, "Le fichier J ne doit pas être réécrit"
+    
+    print("✅ T1 PASSED")
+
+
+def test_t2_rewrite_changed():
+    """T2 : Des données différentes le même jour réécrivent J."""
+    print("\n" + "="*60)
+    print("T2: Snapshot modifié ⇒ réécriture")
+    print("="*60)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        base_path = Path(tmp)
+        _init_meta(base_path, "2025-10-04")
+        
+        rotate_snapshots_atomic(base_path, "albums", "2025-10-04", [{"id": "x", "streams_total": 1}])
+        result = rotate_snapshots_atomic(base_path, "albums", "2025-10-04", [{"id": "x", "streams_total": 2}])
+        
+        assert result["changed"] is True, "Données modifiées : snapshot réécrit"
+        with open(base_path / "data" / "history" / "albums" / "2025-10-04.json", "r", encoding="utf-8") as f:
+            assert json.load(f)[0]["streams_total"] == 2
+    
+    print("✅ T2 PASSED")
+
+
+def test_t3_cached_listing():
+    """T3 : Le listing en cache est réutilisé tant que les fichiers existent."""
+    print("\n" + "="*60)
+    print("T3: Listing des snapshots en cache")
+    print("="*60)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        history_path = Path(tmp)
+        for date in ("2025-10-02", "2025-10-03"):
+            (history_path / f"{date}.json").write_text("[]", encoding="utf-8")
+        
+        assert list_snapshot_dates(history_path, ["2025-10-02", "2025-10-03"]) == ["2025-10-03", "2025-10-02"]
+        # Cache périmé (fichier supprimé) ⇒ rescan du dossier
+        assert list_snapshot_dates(history_path, ["2025-10-01"]) == ["2025-10-03", "2025-10-02"]
+    
+    print("✅ T3 PASSED")
+
+
+def test_t4_state_outside_meta():
+    """T4 : meta.json (publié) ne contient ni hash ni listing des snapshots."""
+    print("\n" + "="*60)
+    print("T4: État des snapshots hors de meta.json")
+    print("="*60)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        base_path = Path(tmp)
+        _init_meta(base_path, "2025-10-04")
+        meta_path = base_path / "data" / "meta.json"
+        meta_before = meta_path.read_bytes()
+        
+        rotate_snapshots_atomic(base_path, "songs", "2025-10-04", [{"id": "a", "streams_total": 1}])
+        assert meta_path.read_bytes() == meta_before, "meta.json réécrit par la rotation"
+        
+        state = load_snapshot_state(base_path / "data")
+        assert state["files"]["songs"] == ["2025-10-04"]
+        assert len(state["hashes"]["songs"]["2025-10-04"]) == 64
+        assert (base_path / "data" / "cache" / "snapshot_state.json").exists()
+        
+        # Ancien format : clés de cache retirées de meta.json à la mise à jour
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump({"history": {"latest_date": "2025-10-04", "snapshot_hashes": {}, "snapshot_files": {}}}, f)
+        meta = update_meta_with_rotation(meta_path, datetime(2025, 10, 5, 1, tzinfo=timezone.utc), "2025-10-04", "songs")
+        assert "snapshot_hashes" not in meta["history"] and "snapshot_files" not in meta["history"]
+        assert meta["history"]["available_dates"] == ["2025-10-04"]
+    
+    print("✅ T4 PASSED")
+
+
+def run_all_tests():
+    """Exécute tous les tests."""
+    try:
+        test_t1_skip_unchanged()
+        test_t2_rewrite_changed()
+        test_t3_cached_listing()
+        test_t4_state_outside_meta()
+        
+        print("\n✅ TOUS LES TESTS PASSED")
+        return True
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Tests des caches de l'API Spotify partagés entre processus (spotify_client.SpotifyClient).
+
+Tests :
+- T1 : Deux enrichissements concurrents ne s'écrasent pas (fusion sous verrou)
+- T2 : Sauvegardes groupées depuis plusieurs threads, échec en cache distinct d'un résultat
+- T3 : Même politique de retry (429, Retry-After, budget) pour les clients sync et async
+"""
+
+import asyncio
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+# Ajouter scripts au path
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
+pytest.importorskip("requests")  # Requis par spotify_client
+
+import spotify_client
+from async_spotify_client import AsyncSpotifyClient
+from json_io import load_json
+from resilience import CircuitOpenError, Resilience
+from spotify_client import RetryPolicy, SpotifyClient
+
+
+def make_client(cache_dir: Path) -> SpotifyClient:
+    """Client sans réseau sur un dossier de cache temporaire."""
+    return SpotifyClient("client-id", "client-secret", cache_dir=cache_dir)
+
+
+def test_t1_concurrent_clients_merge():
+    """T1 : Les entrées des deux clients (positives et négatives) survivent aux sauvegardes."""
+    print("\n" + "="*60)
+    print("T1: Fusion des caches entre clients concurrents")
+    print("="*60)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = Path(tmp)
+        first = make_client(cache_dir)
+        second = make_client(cache_dir)  # Chargé avant les écritures du premier
+        
+        first.store_response("albums/a", "key-a", {"id": "a"})
+        first.store_failure("key-shared", Exception("timeout"))
+        second.store_response("albums/b", "key-b", {"id": "b"})
+        second.store_failure("key-other", Exception("timeout"))
+        first.flush_cache()
+        second.flush_cache()
+        
+        cache = load_json(cache_dir / "spotify_api_cache.json")
+        assert set(cache) == {"key-a", "key-b"}, f"Entrées écrasées : {sorted(cache)}"
+        assert set(load_json(cache_dir / "spotify_negative_cache.json")) == {"key-shared", "key-other"}
+        
+        # Résolue par le second client : l'échec mémorisé par le premier disparaît
+        second.store_response("albums/c", "key-shared", {"id": "c"})
+        first.store_failure("key-late", Exception("timeout"))
+        second.flush_cache()
+        first.flush_cache()
+        negative = load_json(cache_dir / "spotify_negative_cache.json")
+        assert "key-shared" not in negative and {"key-other", "key-late"} <= set(negative)
+        print(f"   {len(load_json(cache_dir / 'spotify_api_cache.json'))} entrées positives conservées")
+    
+    print("✅ T1 PASSED")
+
+
+def test_t2_batched_saves_and_cached_failure():
+    """T2 : Une écriture par lot de SAVE_EVERY_ENTRIES ; get_album d'un échec en cache → None."""
+    print("\n" + "="*60)
+    print("T2: Sauvegardes groupées et échec en cache")
+    print("="*60)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = Path(tmp)
+        client = make_client(cache_dir)
+        cache_file = cache_dir / "spotify_api_cache.json"
+        
+        client.store_response("albums/a", "key-a", {"id": "a"})
+        assert not cache_file.exists(), "Sauvegarde à chaque entrée"
+        
+        # Threads du coalescing : toutes les entrées arrivent sur disque, sans temporaire résiduel
+        def store(worker: int):
+            for i in range(40):
+                client.store_response("albums/t", f"key-{worker}-{i}", {"id": f"{worker}-{i}"})
+        
+        threads = [threading.Thread(target=store, args=(worker,)) for worker in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert cache_file.exists(), "Aucune sauvegarde après SAVE_EVERY_ENTRIES entrées"
+        client.flush_cache()
+        assert len(load_json(cache_file)) == 161
+        assert not list(cache_dir.glob("*.tmp"))
+        
+        # Échec mémorisé : ni {} ni nouvel appel HTTP
+        client.store_failure(client.cache_key("albums/missing", {"market": client.market}), Exception("timeout"))
+        assert client.get_album("missing") is None
+        print(f"   {len(load_json(cache_file))} entrées sauvegardées")
+    
+    print("✅ T2 PASSED")
+
+
+class FakeResponse:
+    """Réponse HTTP minimale (statut, en-têtes, corps JSON)."""
+    
+    def __init__(self, status_code: int, headers: dict = None, body: dict = None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.body = body or {}
+    
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise spotify_client.requests.exceptions.HTTPError(f"HTTP {self.status_code}", response=self)
+    
+    def json(self):
+        return self.body
+
+
+def test_t3_shared_retry_policy():
+    """T3 : 429 court → attente puis succès ; Retry-After long → disjoncteur, sync comme async."""
+    print("\n" + "="*60)
+    print("T3: Politique de retry partagée sync/async")
+    print("="*60)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        client = make_client(Path(tmp))
+        client.access_token, client.token_expires_at = "token", time.time() + 3600
+        client.resilience = Resilience(Path(tmp) / "resilience_state.json", cycle_id="cycle")
+        client.retry_policy = RetryPolicy(client.resilience, client.API_HOST, client.MAX_RETRY_AFTER_SECONDS)
+        async_client = AsyncSpotifyClient(client)
+        
+        responses = []
+        original_get = spotify_client.requests.get
+        spotify_client.requests.get = lambda **kwargs: responses.pop(0)
+        try:
+            for fetch in (
+                lambda: client._fetch("albums/a", {}),
+                lambda: asyncio.run(async_client._fetch_http("albums/a", {}))
+            ):
+                responses[:] = [FakeResponse(429, {"Retry-After": "0"}), FakeResponse(200, body={"id": "a"})]
+                assert fetch() == {"id": "a"}
+                assert not responses
+            assert client.resilience.summary()["retry_budget"]["used"] == 2
+            
+            responses[:] = [FakeResponse(429, {"Retry-After": "3600"})]
+            try:
+                client._fetch("albums/a", {})
+                assert False, "Retry-After long sans disjoncteur"
+            except CircuitOpenError:
+                pass
+            try:
+                asyncio.run(async_client._fetch_http("albums/a", {}))
+                assert False, "Disjoncteur ignoré par le client async"
+            except CircuitOpenError:
+                pass
+        finally:
+            spotify_client.requests.get = original_get
+    
+    print("✅ T3 PASSED")
+
+
+def run_all_tests():
+    """Exécute tous les tests."""
+    try:
+        test_t1_concurrent_clients_merge()
+        test_t2_batched_saves_and_cached_failure()
+        test_t3_shared_retry_policy()
+        
+        print("\n✅ TOUS LES TESTS PASSED")
+        return True
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Tests des versions immuables et du pointeur current.json (publish.publish_versions).
+
+Tests :
+- T1 : Versions nommées par contenu, pointeur à jour, collecte après le délai de grâce
+- T2 : Versions servies par dashboard_server avec Cache-Control immutable
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+# Ajouter scripts au path
+sys.path.insert(0, str(Path(__file__).parent / "scripts"))
+
+from dashboard_server import IMMUTABLE_CACHE_CONTROL, make_server
+from json_io import dump_json, load_json
+from publish import POINTER_NAME, VERSIONS_DIR, publish_versions
+
+REPO_DATA = Path(__file__).parent / "data"
+
+
+def make_data(root: Path) -> Path:
+    """Dossier data/ avec les vues publiées du dépôt."""
+    data = root / "data"
+    data.mkdir()
+    for name in ("songs.json", "albums.json", "meta.json"):
+        shutil.copy(REPO_DATA / name, data / name)
+    return data
+
+
+def test_t1_versions_and_collection():
+    """T1 : Une version par contenu ; les versions retirées survivent au délai de grâce."""
+    print("\n" + "="*60)
+    print("T1: Versions immuables et collecte")
+    print("="*60)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        data = make_data(Path(tmp))
+        
+        pointer = publish_versions(data, grace_seconds=60)
+        assert pointer == load_json(data / POINTER_NAME)
+        assert set(pointer["files"]) == {"meta", "songs", "albums"}, "Fichiers absents dans le pointeur"
+        for name, relative in pointer["files"].items():
+            assert relative.startswith(f"{VERSIONS_DIR}/{name}.")
+            assert (data / relative).read_bytes() == (data / f"{name}.json").read_bytes()
+        
+        # Contenu identique : mêmes noms, aucune nouvelle version
+        assert publish_versions(data, grace_seconds=60) == pointer
+        assert len(list((data / VERSIONS_DIR).iterdir())) == 3
+        
+        # Nouveau songs.json : nouvelle version, l'ancienne reste pendant le délai de grâce
+        old_songs = data / pointer["files"]["songs"]
+        os.utime(old_songs, (time.time() - 3600, time.time() - 3600))
+        dump_json(data / "songs.json", load_json(data / "songs.json")[:3])
+        updated = publish_versions(data, grace_seconds=60)
+        assert updated["files"]["songs"] != pointer["files"]["songs"]
+        assert updated["files"]["albums"] == pointer["files"]["albums"]
+        assert old_songs.exists(), "Version retirée supprimée avant le délai de grâce"
+        
+        # Délai écoulé : seule l'ancienne version est supprimée
+        os.utime(old_songs, (time.time() - 120, time.time() - 120))
+        publish_versions(data, grace_seconds=60)
+        assert not old_songs.exists()
+        assert all((data / relative).exists() for relative in updated["files"].values())
+        print(f"   {len(list((data / VERSIONS_DIR).iterdir()))} versions conservées")
+    
+    print("✅ T1 PASSED")
+
+
+def test_t2_immutable_serving():
+    """T2 : /data/versions/... en cache immuable, 404 pour une version inconnue."""
+    print("\n" + "="*60)
+    print("T2: Service des versions immuables")
+    print("="*60)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        data = make_data(root)
+        pointer = publish_versions(data)
+        
+        server = make_server(root, port=0, host="127.0.0.1")
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}/data/"
+        
+        try:
+            with urllib.request.urlopen(base_url + pointer["files"]["songs"], timeout=5) as response:
+                assert response.status == 200
+                assert response.headers["Cache-Control"] == IMMUTABLE_CACHE_CONTROL
+                assert response.read() == (data / "songs.json").read_bytes()
+            
+            try:
+                urllib.request.urlopen(base_url + f"{VERSIONS_DIR}/songs.0000000000000000.json", timeout=5)
+                assert False, "Version inconnue servie"
+            except urllib.error.HTTPError as e:
+                assert e.code == 404
+            
+            with urllib.request.urlopen(base_url + POINTER_NAME, timeout=5) as response:
+                assert response.headers["Cache-Control"] != IMMUTABLE_CACHE_CONTROL  # Pointeur toujours relu
+        finally:
+            server.shutdown()
+            server.server_close()
+    
+    print("✅ T2 PASSED")
+
+
+def run_all_tests():
+    """Exécute tous les tests."""
+    try:
+        test_t1_versions_and_collection()
+        test_t2_immutable_serving()
+        
+        print("\n✅ TOUS LES TESTS PASSED")
+        return True
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    success = run_all_tests()
+    sys.exit(0 if success else 1)